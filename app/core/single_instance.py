@@ -0,0 +1,168 @@
+"""Keep a single running instance and let later launches talk to it.
+
+The first instance listens on a Unix domain socket in the user's runtime
+directory (``$XDG_RUNTIME_DIR``, else the temp directory with the user id
+in the file name; ``BLOB_MINI_TOOLS_SOCKET`` overrides the path).  A later
+``main.py`` connects, sends one JSON request, e.g. ``{"action": "show",
+"tab": "calc"}``, and exits as soon as the instance answers: a few
+milliseconds instead of a Python + Tk cold start.
+
+The server socket is non-blocking and meant to be served from Tk's event
+loop (``createfilehandler`` on :meth:`InstanceServer.fileno`), so requests
+are handled on the Tk thread.
+"""
+
+from __future__ import annotations
+
+import errno
+import json
+import os
+import socket
+import stat
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+SOCKET_ENV = "BLOB_MINI_TOOLS_SOCKET"
+MAX_REQUEST_BYTES = 64 * 1024 * 1024  # a note piped in can be large
+
+
+def socket_path() -> Path:
+    """Where the running instance listens."""
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return Path(runtime) / "blob-mini-tools.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(tempfile.gettempdir()) / f"blob-mini-tools-{uid}.sock"
+
+
+def _read_all(conn: socket.socket) -> bytes:
+    chunks, size = [], 0
+    while size <= MAX_REQUEST_BYTES:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks)
+
+
+def _listening(path: Path) -> bool:
+    """Whether something accepts connections on ``path`` (no request sent)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def instance_running(path: Path | None = None) -> bool:
+    """Whether an instance listens on ``path``, whether or not it answers."""
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    return _listening(socket_path() if path is None else Path(path))
+
+
+def send_request(request: dict, path: Path | None = None, timeout: float = 5.0) -> dict | None:
+    """Send ``request`` to the running instance; its reply, or ``None`` if none runs."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path() if path is None else Path(path)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(request).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            reply = _read_all(sock)
+        return json.loads(reply.decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+class InstanceServer:
+    """Listening socket of the running instance.
+
+    Raises :class:`OSError` if Unix sockets are unavailable or another
+    instance is already listening on ``path``.  A socket file left behind
+    by an instance that crashed is replaced.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not available")
+        self.path = socket_path() if path is None else Path(path)
+        self._sock: socket.socket | None = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._bind()
+        except OSError:
+            self._sock.close()
+            self._sock = None
+            raise
+        self._sock.setblocking(False)
+
+    def _bind(self) -> None:
+        # Only the owner may connect (the runtime dir is private already,
+        # the temp dir is not).
+        old_umask = os.umask(0o177)
+        try:
+            try:
+                self._sock.bind(str(self.path))
+            except OSError as e:
+                if e.errno != errno.EADDRINUSE or _listening(self.path):
+                    raise
+                if not stat.S_ISSOCK(self.path.lstat().st_mode):
+                    raise
+                self.path.unlink()  # stale, left by an instance that crashed
+                self._sock.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+        self._sock.listen(8)
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def poll(self, handler: Callable[[dict], dict]) -> int:
+        """Answer every pending request with ``handler(request)``.
+
+        Returns the number of requests handled.
+        """
+        handled = 0
+        while self._sock is not None:
+            try:
+                conn, _ = self._sock.accept()
+            except (BlockingIOError, InterruptedError):
+                break
+            with conn:
+                conn.setblocking(True)
+                conn.settimeout(2.0)
+                try:
+                    request = json.loads(_read_all(conn).decode("utf-8"))
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be an object")
+                except (OSError, ValueError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                else:
+                    try:
+                        reply = handler(request)
+                    except Exception as e:  # the client still gets an answer
+                        reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    handled += 1
+                try:
+                    conn.sendall(json.dumps(reply).encode("utf-8"))
+                except OSError:
+                    pass  # the client gave up waiting
+        return handled
@@ -0,0 +1,65 @@
+"""Startup timing.
+
+:class:`StartupTimer` records how long each startup step took (importing
+the GUI, importing and building each tab) and when milestones were
+reached, counted from the timer's creation, which ``main.py`` does before
+importing anything heavy.  ``python main.py --startup-report`` (or
+``"startup": {"report": true}`` in ``config.json``) prints the report
+once the window first goes idle, plus a line per tab built in the
+background afterwards.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Durations of startup steps and times of milestones, in seconds."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.start = clock()
+        self.steps: list[tuple[str, float]] = []
+        self.milestones: list[tuple[str, float]] = []
+        self.enabled = False  # print the report (see :meth:`print_report`)
+        self._reported = False
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Record how long the ``with`` block takes as step ``name``."""
+        started = self.clock()
+        try:
+            yield
+        finally:
+            seconds = self.clock() - started
+            self.steps.append((name, seconds))
+            if self._reported:
+                self._print(name, seconds, "(after startup)")
+
+    def mark(self, name: str) -> float:
+        """Record that milestone ``name`` is reached; returns its time."""
+        elapsed = self.clock() - self.start
+        self.milestones.append((name, elapsed))
+        return elapsed
+
+    def report(self) -> str:
+        lines = [f"  {name:<28s}{seconds * 1000:9.1f} ms" for name, seconds in self.steps]
+        lines += [
+            f"  {name:<28s}{seconds * 1000:9.1f} ms since start"
+            for name, seconds in self.milestones
+        ]
+        return "startup:\n" + "\n".join(lines)
+
+    def print_report(self) -> None:
+        """Print the report so far (if enabled); later steps print one by one."""
+        if self.enabled and not self._reported:
+            print(self.report(), file=sys.stderr)
+        self._reported = True
+
+    def _print(self, name: str, seconds: float, note: str) -> None:
+        if self.enabled:
+            print(f"  {name:<28s}{seconds * 1000:9.1f} ms {note}", file=sys.stderr)
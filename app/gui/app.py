@@ -1,23 +1,36 @@
+import importlib
 import tkinter as tk
 from tkinter import ttk
 
 from core.config import CONFIG
+from core.startup import StartupTimer
 from core.window_position import load_window_position, save_window_position
 from core.window_mover import MovementManager
 
 from widgets.toolbar import create_toolbar
-from widgets.notes.notes_tab import NotesTab
-from widgets.calc.calc_tab import CalcTab
-from widgets.color.color_tab import ColorTab
+
+# (config section, module, class) of each tab, in notebook order.  A tab's
+# module is only imported, and the tab built, when it is first selected or
+# pre-warmed in idle time after startup.
+TABS = (
+    ('notes', 'widgets.notes.notes_tab', 'NotesTab'),
+    ('calc', 'widgets.calc.calc_tab', 'CalcTab'),
+    ('color', 'widgets.color.color_tab', 'ColorTab'),
+)
 
 class MultitoolApp:
-    def __init__(self, root):
+    def __init__(self, root, startup=None, server=None, resident=False):
         self.root = root
+        self.startup = startup or StartupTimer()
+        # Resident (--daemon): starts hidden, closing the window only hides it
+        self.resident = resident
+        if resident:
+            self.root.withdraw()
         self.root.resizable(False, False)
         self.root.title(CONFIG['window']['title'])
         self.root.geometry(CONFIG['window']['geometry'])
         self.root.minsize(*CONFIG['window']['minsize'])
-        
+
         # Load saved window position
         load_window_position(self.root)
 
@@ -31,31 +44,119 @@ class MultitoolApp:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True)
 
-        # Load notes and build tabs
-        saved_notes = NotesTab.load_notes()
-        self.notes_tab = NotesTab(self.root, saved_notes)
-        self.notebook.add(
-            self.notes_tab.build(self.notebook), text=CONFIG["notes"]["title"]
-        )
+        # Tabs start as empty placeholders (None until built)
+        self.notes_tab = self.calc_tab = self.color_tab = None
+        self._placeholders = {}
+        for key, _, _ in TABS:
+            self._placeholders[key] = ttk.Frame(self.notebook)
+            self.notebook.add(self._placeholders[key], text=CONFIG[key]['title'])
+        self._closing = False
 
-        self.calc_tab = CalcTab(self.root)
-        self.notebook.add(
-            self.calc_tab.build(self.notebook), text=CONFIG["calc"]["title"]
-        )
-
-        self.color_tab = ColorTab(self.root)
-        self.notebook.add(
-            self.color_tab.build(self.notebook), text=CONFIG["color"]["title"]
-        )
+        # The first tab is visible right away
+        self.build_tab(TABS[0][0])
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
 
         # Close handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        # Requests from later launches (see core.single_instance)
+        self.server = server
+        if server is not None:
+            self.root.tk.createfilehandler(
+                server.fileno(), tk.READABLE, lambda *_: server.poll(self.handle_request)
+            )
+
+        self.root.after_idle(self._first_idle)
+
+    def build_tab(self, key):
+        """Import and build tab ``key`` unless it already is."""
+        if self._closing or getattr(self, f'{key}_tab') is not None:
+            return
+        _, module_name, class_name = next(tab for tab in TABS if tab[0] == key)
+        with self.startup.measure(f'import {key}'):
+            module = importlib.import_module(module_name)
+        with self.startup.measure(f'build {key}'):
+            tab = getattr(module, class_name)(self.root)
+            tab.build(self._placeholders[key]).pack(fill='both', expand=True)
+        setattr(self, f'{key}_tab', tab)
+
+    def _on_tab_changed(self, event=None):
+        self.build_tab(TABS[self.notebook.index('current')][0])
+
+    def _first_idle(self):
+        self.startup.mark('first idle')
+        self.startup.print_report()
+        startup_cfg = CONFIG.get('startup', {})
+        if startup_cfg.get('prewarm', True):
+            self.root.after(startup_cfg.get('prewarm_delay_ms', 500), self._prewarm)
+
+    def _prewarm(self):
+        # One tab per idle slot, so input is handled in between
+        for key, _, _ in TABS:
+            if getattr(self, f'{key}_tab') is None:
+                self.build_tab(key)
+                self.root.after(50, lambda: self.root.after_idle(self._prewarm))
+                return
+
+    def summon(self, tab=None, note=None):
+        """Show and focus the window, on ``tab`` or with a new ``note``."""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        if note is not None:
+            tab = 'notes'
+        if tab in self._placeholders:
+            self.notebook.select(self._placeholders[tab])
+            self.build_tab(tab)
+        if note is not None and self.notes_tab is not None:
+            self.notes_tab.add_note(note)
+        self.root.update_idletasks()
+
+    def handle_request(self, request):
+        """Answer a request sent by another launch of the app."""
+        action = request.get('action', 'show')
+        tab, note = request.get('tab'), request.get('note')
+        if not all(isinstance(v, str) or v is None for v in (tab, note)):
+            return {'ok': False, 'error': 'tab and note must be strings'}
+        if action == 'show':
+            self.summon(tab, note)
+        elif action == 'hide':
+            self.root.withdraw()
+        elif action == 'quit':
+            self.root.after_idle(self.quit)
+        elif action != 'ping':
+            return {'ok': False, 'error': f'unknown action {action!r}'}
+        return {'ok': True}
+
+    def quit(self):
+        self.resident = False
+        self.on_close()
+
     def on_close(self):
+        if self.resident:
+            save_window_position(self.root)
+            self.root.withdraw()
+            return
+        self._closing = True
+
         # Save window position
         save_window_position(self.root)
 
-        # Save notes
-        self.notes_tab.save()
+        # Save notes (tabs never built have nothing to save or stop)
+        if self.notes_tab is not None:
+            self.notes_tab.save()
+
+        # Stop a running calculation
+        if self.calc_tab is not None:
+            self.calc_tab.close()
+
+        # Release the screen picker's display connection
+        if self.color_tab is not None:
+            self.color_tab.close()
+
+        # Let the next launch become the running instance
+        if self.server is not None:
+            self.root.tk.deletefilehandler(self.server.fileno())
+            self.server.close()
 
         self.root.destroy()
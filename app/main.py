@@ -1,8 +1,147 @@
-import tkinter as tk
-from gui.app import MultitoolApp
+import argparse
+import sys
+from pathlib import Path
 
-if __name__ == '__main__':
-    root = tk.Tk()
-    app = MultitoolApp(root)
+from core.startup import StartupTimer
+
+# Keys of gui.app.TABS (not imported here: talking to a running instance
+# should not have to load Tk).
+TAB_KEYS = ('notes', 'calc', 'color')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Blob Mini Tools")
+    parser.add_argument(
+        '--export-notes', metavar='DIR', type=Path,
+        help='write every note to DIR as a text file and exit',
+    )
+    parser.add_argument(
+        '--import-notes', metavar='DIR', type=Path,
+        help='update the notes from the text files in DIR and exit',
+    )
+    parser.add_argument(
+        '--startup-report', action='store_true',
+        help='print how long startup took, step by step, to stderr',
+    )
+    parser.add_argument(
+        '--tab', choices=TAB_KEYS,
+        help='show this tab',
+    )
+    parser.add_argument(
+        '--note', nargs='?', const='-', metavar='TEXT',
+        help='add a new note with TEXT (read from stdin if omitted or -)',
+    )
+    parser.add_argument(
+        '--daemon', action='store_true',
+        help='start hidden and stay running when the window is closed; '
+        'later launches just show it',
+    )
+    parser.add_argument(
+        '--quit', action='store_true',
+        help='close the running instance',
+    )
+    return parser.parse_args(argv)
+
+
+def build_request(args) -> dict:
+    """What to ask of the running instance, from the command line."""
+
+    if args.quit:
+        return {'action': 'quit'}
+    if args.daemon:
+        return {'action': 'ping'}  # already running: nothing to do
+    request = {'action': 'show', 'tab': args.tab}
+    if args.note is not None:
+        request['note'] = sys.stdin.read() if args.note == '-' else args.note
+    return request
+
+
+def sync_notes(args) -> int:
+    """Headless import/export; refused while the app is running."""
+
+    from core.config import CONFIG
+    from core.single_instance import instance_running
+
+    # The running app (maybe hidden, see --daemon) writes the same store.
+    if instance_running():
+        print(
+            "error: the app is running; import or export from its Notes tab, "
+            "or quit it first (--quit)",
+            file=sys.stderr,
+        )
+        return 1
+    from widgets.notes.notes_store import NotesStore
+    from widgets.notes.notes_tab import NotesTab
+    from widgets.notes.sync import export_notes, import_notes
+
+    store = NotesStore(
+        NotesTab.notes_file,
+        compact_bytes=CONFIG["notes"].get("autosave", {}).get("compact_bytes", 8 * 1024 * 1024),
+    )
+    store.load()
+    try:
+        if args.import_notes:
+            print(f"import: {import_notes(store, args.import_notes)}")
+        if args.export_notes:
+            print(f"export: {export_notes(store, args.export_notes)}")
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def summon_running(request: dict) -> bool:
+    """Hand ``request`` to an already running instance, if there is one."""
+
+    from core.config import CONFIG
+    from core.single_instance import send_request
+
+    if not CONFIG.get('single_instance', {}).get('enabled', True):
+        return False
+    return send_request(request) is not None
+
+
+def run_gui(args, startup: StartupTimer, request: dict) -> int:
+    import tkinter as tk
+
+    from core.config import CONFIG
+    from core.single_instance import InstanceServer, instance_running, send_request
+
+    server = None
+    if CONFIG.get('single_instance', {}).get('enabled', True):
+        try:
+            server = InstanceServer()
+        except OSError:
+            # Another instance started meanwhile, or no Unix sockets here.
+            if send_request(request) is not None:
+                return 0
+            if instance_running():
+                # Busy or broken: a second instance would autosave the
+                # same notes concurrently.
+                print('error: the running instance does not answer', file=sys.stderr)
+                return 1
+
+    startup.enabled = args.startup_report or CONFIG.get('startup', {}).get('report', False)
+    with startup.measure('import gui'):
+        from gui.app import MultitoolApp
+    with startup.measure('create window'):
+        root = tk.Tk()
+    app = MultitoolApp(root, startup, server=server, resident=args.daemon)
+    if request['action'] == 'show' and (args.tab or 'note' in request):
+        app.summon(args.tab, request.get('note'))
     root.mainloop()
+    return 0
 
+
+if __name__ == '__main__':
+    startup = StartupTimer()
+    args = parse_args()
+    if args.import_notes or args.export_notes:
+        sys.exit(sync_notes(args))
+    request = build_request(args)
+    if summon_running(request):
+        sys.exit(0)
+    if args.quit:
+        print('no running instance', file=sys.stderr)
+        sys.exit(1)
+    sys.exit(run_gui(args, startup, request))
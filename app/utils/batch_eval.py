@@ -0,0 +1,264 @@
+"""Evaluate one compiled expression over many values of a variable.
+
+With NumPy installed the postfix program runs once over whole float64
+arrays.  Without it, the program is turned into a plain Python ``lambda``
+(fully parenthesised, built only from validated tokens) and called in a
+tight loop; expressions too deeply nested for Python's compiler fall back to
+running the program once per value.
+
+Values that cannot be computed (division by zero, overflow, ...) become
+``nan`` instead of aborting the whole batch.  Note that the NumPy path
+computes in float64, so integer results beyond 2**53 are rounded.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import operator
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from utils.safe_eval import CompiledExpression
+
+try:
+    import numpy as np
+except ImportError:  # optional, only used to speed up batches
+    np = None
+
+_SYMBOLS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.floordiv: "//",
+    operator.mod: "%",
+    operator.pow: "**",
+    operator.neg: "-",
+    operator.pos: "+",
+}
+_CHUNK = 65536
+MAX_VALUES = 10_000_000  # longest range the Batch dialog evaluates
+
+
+class TooManyValues(ValueError):
+    """A range holds more than ``MAX_VALUES`` values."""
+
+
+class ValueRange(Sequence):
+    """Inclusive progression ``start, start + step, ...`` up to ``stop``.
+
+    Raises :class:`ValueError` for a zero or non-finite step or bound, and
+    :class:`TooManyValues` beyond ``max_count`` values.
+    """
+
+    def __init__(self, start, stop, step=1, max_count: int = MAX_VALUES) -> None:
+        if not step:
+            raise ValueError("Step must not be zero")
+        if any(isinstance(v, float) and not math.isfinite(v) for v in (start, stop, step)):
+            raise ValueError("Bounds and step must be finite")
+        self.start, self.stop, self.step = start, stop, step
+        try:
+            span = (stop - start) / step
+        except OverflowError:  # ints too large for a float
+            span = math.inf
+        if span > max_count:
+            raise TooManyValues(f"Too many values (at most {max_count:,})")
+        # A little slack so float steps do not drop the last value.
+        self.count = max(math.floor(span + 1e-9) + 1, 0)
+        if self.count > max_count:
+            raise TooManyValues(f"Too many values (at most {max_count:,})")
+
+    @classmethod
+    def parse(cls, start: str, stop: str, step: str = "1") -> ValueRange:
+        """Build a range from user input (ints stay exact, else floats)."""
+        numbers = [float(v) if any(c in v for c in ".eE") else int(v) for v in (start, stop, step)]
+        return cls(*numbers)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.start + self.step * index
+
+    def __iter__(self) -> Iterator:
+        start, step = self.start, self.step
+        for i in range(self.count):
+            yield start + step * i
+
+    def array(self):
+        return self.start + self.step * np.arange(self.count, dtype=float)
+
+
+class Summary:
+    """Count, extremes, mean and standard deviation of a batch."""
+
+    def __init__(self, count: int, valid: int, low, high, mean, stdev) -> None:
+        self.count = count
+        self.valid = valid  # finite results
+        self.min = low
+        self.max = high
+        self.mean = mean
+        self.stdev = stdev
+
+    def __str__(self) -> str:
+        if not self.valid:
+            return f"n={self.count:,}  no valid results"
+        text = (
+            f"n={self.count:,}  min={self.min:.6g}  max={self.max:.6g}\n"
+            f"mean={self.mean:.6g}  stdev={self.stdev:.6g}"
+        )
+        if self.valid < self.count:
+            text += f"  ({self.count - self.valid:,} invalid)"
+        return text
+
+
+# ----------------------------------------------------------------------
+def to_lambda(compiled: CompiledExpression, name: str = "x"):
+    """Build a Python function of ``name`` from the postfix program.
+
+    Returns ``None`` if the expression cannot be expressed that way (other
+    variables, non-finite constants, nesting beyond the compiler's limits).
+    """
+    stack: list[str] = []
+    for arity, value in compiled.program:
+        if arity == 0:
+            if isinstance(value, float) and not math.isfinite(value):
+                return None
+            try:
+                stack.append(repr(value))
+            except ValueError:  # an int beyond sys.get_int_max_str_digits()
+                return None
+        elif arity == CompiledExpression.LOAD:
+            if value != name:
+                return None
+            stack.append(name)
+        elif arity == 1:
+            stack.append(f"({_SYMBOLS[value]}{stack.pop()})")
+        else:
+            right = stack.pop()
+            stack.append(f"({stack.pop()} {_SYMBOLS[value]} {right})")
+    try:
+        return eval(f"lambda {name}: {stack[0]}", {"__builtins__": {}})
+    except (SyntaxError, RecursionError, MemoryError):
+        return None
+
+
+def evaluate(
+    compiled: CompiledExpression, values: Sequence, name: str = "x", use_numpy: bool | None = None
+):
+    """Evaluate ``compiled`` for every value of ``name`` in ``values``.
+
+    Returns a float64 NumPy array when NumPy is used, else a list.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        try:
+            return _evaluate_numpy(compiled, values, name)
+        except (ArithmeticError, ValueError, TypeError):
+            pass  # e.g. an integer constant too large for float64
+
+    # A negative base to a fractional power gives a complex number in
+    # Python; it becomes ``nan`` like on the NumPy path, as does a later
+    # operator that refuses it (``complex // int`` raises TypeError).
+    nan = math.nan
+    results = []
+    append = results.append
+    fn = to_lambda(compiled, name)
+    if fn is None:
+        env = {}
+        for value in values:
+            env[name] = value
+            try:
+                result = compiled(env)
+            except (ArithmeticError, ValueError, TypeError):
+                result = nan
+            append(nan if type(result) is complex else result)
+        return results
+    for value in values:
+        try:
+            result = fn(value)
+        except (ArithmeticError, ValueError, TypeError):
+            result = nan
+        append(nan if type(result) is complex else result)
+    return results
+
+
+def _evaluate_numpy(compiled: CompiledExpression, values: Sequence, name: str):
+    xs = values.array() if isinstance(values, ValueRange) else np.asarray(values, dtype=float)
+    stack = []
+    with np.errstate(all="ignore"):
+        for arity, value in compiled.program:
+            if arity == 0:
+                stack.append(value)
+            elif arity == CompiledExpression.LOAD:
+                if value != name:
+                    raise ValueError(f"Unknown name: {value}")
+                stack.append(xs)
+            elif arity == 1:
+                stack[-1] = value(stack[-1])
+            else:
+                right = stack.pop()
+                stack[-1] = value(stack[-1], right)
+        result = np.broadcast_to(np.asarray(stack[0], dtype=float), xs.shape).copy()
+    # Python raises on 1/0 and float overflow; match the loop's ``nan``.
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def summarize(results) -> Summary:
+    """Summary statistics over the finite results."""
+    if np is not None and isinstance(results, np.ndarray):
+        finite = results[np.isfinite(results)]
+        if not finite.size:
+            return Summary(results.size, 0, None, None, None, None)
+        return Summary(
+            results.size,
+            finite.size,
+            float(finite.min()),
+            float(finite.max()),
+            float(finite.mean()),
+            float(finite.std()),
+        )
+
+    # One pass (Welford) over a list.
+    valid, mean, m2 = 0, 0.0, 0.0
+    low = high = None
+    for value in results:
+        try:
+            value = float(value)
+        except (OverflowError, TypeError):  # huge ints, anything non-real
+            continue
+        if not math.isfinite(value):
+            continue
+        valid += 1
+        delta = value - mean
+        mean += delta / valid
+        m2 += delta * (value - mean)
+        if low is None or value < low:
+            low = value
+        if high is None or value > high:
+            high = value
+    if not valid:
+        return Summary(len(results), 0, None, None, None, None)
+    return Summary(len(results), valid, low, high, mean, math.sqrt(m2 / valid))
+
+
+def write_csv(path: Path, values: Sequence, results, name: str = "x") -> None:
+    """Write ``name,result`` rows chunk by chunk."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([name, "result"])
+        for start in range(0, len(values), _CHUNK):
+            xs = values[start : start + _CHUNK]
+            ys = results[start : start + _CHUNK]
+            if np is not None and isinstance(ys, np.ndarray):
+                ys = ys.tolist()
+            writer.writerows(zip(xs, ys))
@@ -0,0 +1,260 @@
+"""Find the named color closest to a given one.
+
+Palettes (the CSS named colors, X11's ``rgb.txt``, or a palette file of
+our own) are converted to CIELAB once and indexed with a k-d tree, so a
+query visits a few leaves instead of every color: microseconds even for
+palettes of 100k colors.  Distance is plain Euclidean distance in Lab
+(CIE76), which tracks perceived difference far better than RGB.
+
+Palette files may be JSON (``{"name": "#rrggbb", ...}``), GIMP ``.gpl`` or
+``rgb.txt`` style lines (``r g b name``), or ``name #rrggbb`` /
+``#rrggbb name`` lines; blank lines and ``#``/``!`` comments are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from utils.color_space import lab_array, np, rgb_to_lab
+
+# CSS Color Module Level 4 named colors.
+CSS_COLORS = {
+    "aliceblue": 0xF0F8FF, "antiquewhite": 0xFAEBD7, "aqua": 0x00FFFF,
+    "aquamarine": 0x7FFFD4, "azure": 0xF0FFFF, "beige": 0xF5F5DC, "bisque": 0xFFE4C4,
+    "black": 0x000000, "blanchedalmond": 0xFFEBCD, "blue": 0x0000FF,
+    "blueviolet": 0x8A2BE2, "brown": 0xA52A2A, "burlywood": 0xDEB887,
+    "cadetblue": 0x5F9EA0, "chartreuse": 0x7FFF00, "chocolate": 0xD2691E,
+    "coral": 0xFF7F50, "cornflowerblue": 0x6495ED, "cornsilk": 0xFFF8DC,
+    "crimson": 0xDC143C, "cyan": 0x00FFFF, "darkblue": 0x00008B, "darkcyan": 0x008B8B,
+    "darkgoldenrod": 0xB8860B, "darkgray": 0xA9A9A9, "darkgreen": 0x006400,
+    "darkgrey": 0xA9A9A9, "darkkhaki": 0xBDB76B, "darkmagenta": 0x8B008B,
+    "darkolivegreen": 0x556B2F, "darkorange": 0xFF8C00, "darkorchid": 0x9932CC,
+    "darkred": 0x8B0000, "darksalmon": 0xE9967A, "darkseagreen": 0x8FBC8F,
+    "darkslateblue": 0x483D8B, "darkslategray": 0x2F4F4F, "darkslategrey": 0x2F4F4F,
+    "darkturquoise": 0x00CED1, "darkviolet": 0x9400D3, "deeppink": 0xFF1493,
+    "deepskyblue": 0x00BFFF, "dimgray": 0x696969, "dimgrey": 0x696969,
+    "dodgerblue": 0x1E90FF, "firebrick": 0xB22222, "floralwhite": 0xFFFAF0,
+    "forestgreen": 0x228B22, "fuchsia": 0xFF00FF, "gainsboro": 0xDCDCDC,
+    "ghostwhite": 0xF8F8FF, "gold": 0xFFD700, "goldenrod": 0xDAA520, "gray": 0x808080,
+    "green": 0x008000, "greenyellow": 0xADFF2F, "grey": 0x808080, "honeydew": 0xF0FFF0,
+    "hotpink": 0xFF69B4, "indianred": 0xCD5C5C, "indigo": 0x4B0082, "ivory": 0xFFFFF0,
+    "khaki": 0xF0E68C, "lavender": 0xE6E6FA, "lavenderblush": 0xFFF0F5,
+    "lawngreen": 0x7CFC00, "lemonchiffon": 0xFFFACD, "lightblue": 0xADD8E6,
+    "lightcoral": 0xF08080, "lightcyan": 0xE0FFFF, "lightgoldenrodyellow": 0xFAFAD2,
+    "lightgray": 0xD3D3D3, "lightgreen": 0x90EE90, "lightgrey": 0xD3D3D3,
+    "lightpink": 0xFFB6C1, "lightsalmon": 0xFFA07A, "lightseagreen": 0x20B2AA,
+    "lightskyblue": 0x87CEFA, "lightslategray": 0x778899, "lightslategrey": 0x778899,
+    "lightsteelblue": 0xB0C4DE, "lightyellow": 0xFFFFE0, "lime": 0x00FF00,
+    "limegreen": 0x32CD32, "linen": 0xFAF0E6, "magenta": 0xFF00FF, "maroon": 0x800000,
+    "mediumaquamarine": 0x66CDAA, "mediumblue": 0x0000CD, "mediumorchid": 0xBA55D3,
+    "mediumpurple": 0x9370DB, "mediumseagreen": 0x3CB371, "mediumslateblue": 0x7B68EE,
+    "mediumspringgreen": 0x00FA9A, "mediumturquoise": 0x48D1CC,
+    "mediumvioletred": 0xC71585, "midnightblue": 0x191970, "mintcream": 0xF5FFFA,
+    "mistyrose": 0xFFE4E1, "moccasin": 0xFFE4B5, "navajowhite": 0xFFDEAD,
+    "navy": 0x000080, "oldlace": 0xFDF5E6, "olive": 0x808000, "olivedrab": 0x6B8E23,
+    "orange": 0xFFA500, "orangered": 0xFF4500, "orchid": 0xDA70D6,
+    "palegoldenrod": 0xEEE8AA, "palegreen": 0x98FB98, "paleturquoise": 0xAFEEEE,
+    "palevioletred": 0xDB7093, "papayawhip": 0xFFEFD5, "peachpuff": 0xFFDAB9,
+    "peru": 0xCD853F, "pink": 0xFFC0CB, "plum": 0xDDA0DD, "powderblue": 0xB0E0E6,
+    "purple": 0x800080, "rebeccapurple": 0x663399, "red": 0xFF0000,
+    "rosybrown": 0xBC8F8F, "royalblue": 0x4169E1, "saddlebrown": 0x8B4513,
+    "salmon": 0xFA8072, "sandybrown": 0xF4A460, "seagreen": 0x2E8B57,
+    "seashell": 0xFFF5EE, "sienna": 0xA0522D, "silver": 0xC0C0C0, "skyblue": 0x87CEEB,
+    "slateblue": 0x6A5ACD, "slategray": 0x708090, "slategrey": 0x708090,
+    "snow": 0xFFFAFA, "springgreen": 0x00FF7F, "steelblue": 0x4682B4, "tan": 0xD2B48C,
+    "teal": 0x008080, "thistle": 0xD8BFD8, "tomato": 0xFF6347, "turquoise": 0x40E0D0,
+    "violet": 0xEE82EE, "wheat": 0xF5DEB3, "white": 0xFFFFFF, "whitesmoke": 0xF5F5F5,
+    "yellow": 0xFFFF00, "yellowgreen": 0x9ACD32,
+}
+
+RGB_TXT_PATHS = ("/usr/share/X11/rgb.txt", "/etc/X11/rgb.txt", "/usr/lib/X11/rgb.txt")
+
+_HEX_RE = re.compile(r"#?([0-9a-fA-F]{6})\b")
+
+
+class KDTree:
+    """Static k-d tree over 3-D points, for nearest-neighbour queries.
+
+    Nodes live in flat lists.  An inner node splits on one axis at the
+    median; leaves hold up to ``LEAF_SIZE`` point indices.  Both building
+    and querying use explicit stacks.
+    """
+
+    LEAF_SIZE = 8
+
+    def __init__(self, points: Sequence[Sequence[float]]) -> None:
+        self.points = [tuple(map(float, p)) for p in points]
+        self.order = list(range(len(self.points)))
+        # Per node: split axis (-1 for a leaf), split value, and either the
+        # child node ids (inner) or the range of ``order`` (leaf).
+        self._axis: list[int] = []
+        self._split: list[float] = []
+        self._lo: list[int] = []
+        self._hi: list[int] = []
+        if self.points:
+            self._build()
+
+    def _new_node(self) -> int:
+        self._axis.append(-1)
+        self._split.append(0.0)
+        self._lo.append(0)
+        self._hi.append(0)
+        return len(self._axis) - 1
+
+    def _build(self) -> None:
+        points, order = self.points, self.order
+        todo = [(self._new_node(), 0, len(order))]
+        while todo:
+            node, start, end = todo.pop()
+            if end - start <= self.LEAF_SIZE:
+                self._lo[node], self._hi[node] = start, end
+                continue
+            segment = order[start:end]
+            spreads = [
+                max(points[i][axis] for i in segment) - min(points[i][axis] for i in segment)
+                for axis in range(3)
+            ]
+            axis = spreads.index(max(spreads))
+            segment.sort(key=lambda i: points[i][axis])
+            order[start:end] = segment
+            mid = (start + end) // 2
+            left, right = self._new_node(), self._new_node()
+            self._axis[node] = axis
+            self._split[node] = points[order[mid]][axis]
+            self._lo[node], self._hi[node] = left, right
+            todo.append((left, start, mid))
+            todo.append((right, mid, end))
+
+    def nearest(self, query: Sequence[float]) -> tuple[int, float]:
+        """Index of the point closest to ``query`` and its squared distance."""
+        q0, q1, q2 = query
+        points, order = self.points, self.order
+        axes, splits, los, his = self._axis, self._split, self._lo, self._hi
+        best, best_d2 = -1, float("inf")
+        stack = [(0, 0.0)] if points else []
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_d2:
+                continue
+            axis = axes[node]
+            if axis < 0:
+                for i in order[los[node] : his[node]]:
+                    p0, p1, p2 = points[i]
+                    d2 = (p0 - q0) ** 2 + (p1 - q1) ** 2 + (p2 - q2) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = i, d2
+                continue
+            diff = query[axis] - splits[node]
+            near, far = (los[node], his[node]) if diff < 0 else (his[node], los[node])
+            stack.append((far, max(bound, diff * diff)))  # visited last, if useful
+            stack.append((near, bound))
+        return best, best_d2
+
+
+class Palette:
+    """Named colors with a Lab k-d tree for nearest-color queries."""
+
+    # Up to this size, NumPy's brute force beats the tree for batches.
+    BATCH_SCAN_MAX = 2048
+
+    def __init__(self, name: str, entries: Iterable[tuple[str, int]]) -> None:
+        self.name = name
+        self.names: list[str] = []
+        self.colors: list[int] = []
+        seen: set[str] = set()
+        for color_name, rgb in entries:
+            if color_name.lower() not in seen:
+                seen.add(color_name.lower())
+                self.names.append(color_name)
+                self.colors.append(rgb)
+        self._labs = lab_array(self.colors)
+        self._tree = KDTree(self._labs)
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    @classmethod
+    def from_file(cls, path: Path) -> Palette:
+        path = Path(path)
+        return cls(path.stem, load_palette_file(path))
+
+    def nearest(self, rgb: int) -> tuple[str, int, float] | None:
+        """``(name, color, Lab distance)`` of the closest color."""
+        index, d2 = self._tree.nearest(rgb_to_lab(rgb))
+        if index < 0:
+            return None
+        return self.names[index], self.colors[index], d2**0.5
+
+    def nearest_many(self, colors: Sequence[int]) -> list[int]:
+        """Index of the closest palette color for each of ``colors``.
+
+        Small palettes are scanned with NumPy, in chunks; otherwise (or
+        without NumPy) it is one tree query per color.
+        """
+        if not self.colors:
+            return [-1] * len(colors)
+        if np is None or len(self.colors) > self.BATCH_SCAN_MAX:
+            return [self._tree.nearest(rgb_to_lab(c))[0] for c in colors]
+        queries = lab_array(colors)
+        palette = np.asarray(self._labs)
+        # |q - p|^2 = |q|^2 - 2 q.p + |p|^2; |q|^2 does not change the argmin.
+        norms = (palette**2).sum(axis=1)
+        chunk = max(1, 2**22 // len(palette))
+        result = []
+        for start in range(0, len(queries), chunk):
+            d2 = norms - 2 * (queries[start : start + chunk] @ palette.T)
+            result.extend(d2.argmin(axis=1).tolist())
+        return result
+
+
+# ----------------------------------------------------------------------
+def css_palette() -> Palette:
+    return Palette("CSS", CSS_COLORS.items())
+
+
+def x11_palette(path: Path | None = None) -> Palette | None:
+    """X11's ``rgb.txt`` colors (``None`` if the file is not found)."""
+    candidates = [path] if path is not None else RGB_TXT_PATHS
+    for candidate in candidates:
+        try:
+            entries = load_palette_file(Path(candidate))
+        except OSError:
+            continue
+        # rgb.txt lists most colors twice ("alice blue", "AliceBlue").
+        return Palette("X11", ((n, c) for n, c in entries if " " not in n))
+    return None
+
+
+def load_palette_file(path: Path) -> list[tuple[str, int]]:
+    """Read ``(name, color)`` pairs from a palette file (see module doc)."""
+    text = Path(path).read_text(encoding="utf-8", errors="replace")
+    if text.lstrip()[:1] in ("{", "["):
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected a JSON object of name: color")
+        return [
+            (str(name), int(m.group(1), 16))
+            for name, value in data.items()
+            if isinstance(value, str) and (m := _HEX_RE.fullmatch(value.strip()))
+        ]
+
+    entries = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] == "!" or (line[0] == "#" and not _HEX_RE.match(line)):
+            continue
+        parts = line.split()
+        if len(parts) >= 3 and all(p.isdigit() for p in parts[:3]):
+            r, g, b = (min(int(p), 255) for p in parts[:3])
+            name = " ".join(parts[3:]) or f"#{r:02x}{g:02x}{b:02x}"
+            entries.append((name, r << 16 | g << 8 | b))
+            continue
+        m = _HEX_RE.search(line)
+        if m is None:
+            continue  # e.g. "GIMP Palette" / "Name:" headers
+        name = (line[: m.start()] + line[m.end() :]).strip(" \t:=,;") or f"#{m.group(1)}"
+        entries.append((name, int(m.group(1), 16)))
+    return entries
@@ -0,0 +1,429 @@
+"""Color conversions between hex, RGB, HSL, HSV, CIELAB and OKLCH.
+
+Every conversion goes through a packed ``0xRRGGBB`` int.  Values are:
+
+* ``hex``: ``"#rrggbb"``
+* ``rgb``: ``(r, g, b)``, ints 0..255
+* ``hsl`` / ``hsv``: ``(hue in degrees, saturation %, lightness/value %)``
+* ``lab``: CIELAB ``(L, a, b)`` with the D65 white point (CSS ``lab()``
+  uses D50, so its numbers differ slightly)
+* ``oklch``: ``(L 0..1, chroma, hue in degrees)``
+
+Decoding the sRGB transfer curve is a 256-entry lookup table; encoding
+bisects the 255 linear-light values where the 8-bit code changes, which
+rounds exactly like encoding with the curve would, without evaluating it.
+Colors outside sRGB are clipped per channel.
+
+:func:`convert` handles one color; :func:`convert_many` handles a batch,
+vectorized with NumPy when it is installed (arrays of shape ``(n, 3)``,
+lists of strings for hex).  :func:`parse_color` and :func:`format_color`
+read and write CSS-style text such as ``hsl(9 100% 64%)``.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import string
+from bisect import bisect_right
+from collections.abc import Sequence
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # optional, only used to speed up batches
+    np = None
+
+SPACES = ("hex", "rgb", "hsl", "hsv", "lab", "oklch")
+
+
+def _to_linear(c: float) -> float:
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# 8-bit sRGB channel -> linear light, 0..1
+LINEAR = tuple(_to_linear(i / 255) for i in range(256))
+# Linear light where the 8-bit code goes from i to i + 1.
+_BOUNDS = tuple(_to_linear((i + 0.5) / 255) for i in range(255))
+
+
+def _encode(x: float) -> int:
+    """8-bit sRGB code of linear light ``x`` (clipped to 0..255)."""
+    return bisect_right(_BOUNDS, x)
+
+
+def _invert(m):
+    """Inverse of a 3x3 matrix given as nested tuples."""
+    (a, b, c), (d, e, f), (g, h, i) = m
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    return (
+        ((e * i - f * h) / det, (c * h - b * i) / det, (b * f - c * e) / det),
+        ((f * g - d * i) / det, (a * i - c * g) / det, (c * d - a * f) / det),
+        ((d * h - e * g) / det, (b * g - a * h) / det, (a * e - b * d) / det),
+    )
+
+
+def _apply(m, x: float, y: float, z: float) -> tuple[float, float, float]:
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = m
+    return (
+        m00 * x + m01 * y + m02 * z,
+        m10 * x + m11 * y + m12 * z,
+        m20 * x + m21 * y + m22 * z,
+    )
+
+
+# Linear sRGB -> CIE XYZ (D65), rows pre-divided by the D65 white point.
+_XN, _YN, _ZN = 0.95047, 1.0, 1.08883
+_M = (
+    (0.4124564 / _XN, 0.3575761 / _XN, 0.1804375 / _XN),
+    (0.2126729 / _YN, 0.7151522 / _YN, 0.0721750 / _YN),
+    (0.0193339 / _ZN, 0.1191920 / _ZN, 0.9503041 / _ZN),
+)
+_M_INV = _invert(_M)
+_EPSILON = 216 / 24389
+_KAPPA = 24389 / 27
+
+# OKLab (Björn Ottosson): linear sRGB -> LMS, and cube-rooted LMS -> Lab.
+_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_OKLAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_LMS_INV = _invert(_LMS)
+_OKLAB_INV = _invert(_OKLAB)
+
+
+def _f(t: float) -> float:
+    return t ** (1 / 3) if t > _EPSILON else (_KAPPA * t + 16) / 116
+
+
+def _f_inv(t: float) -> float:
+    cube = t * t * t
+    return cube if cube > _EPSILON else (116 * t - 16) / _KAPPA
+
+
+# ----------------------------------------------------------------------
+# Scalar conversions from and to packed RGB
+# ----------------------------------------------------------------------
+def rgb_to_lab(rgb: int) -> tuple[float, float, float]:
+    """CIELAB (D65) coordinates of a packed ``0xRRGGBB`` color."""
+    x, y, z = _apply(_M, LINEAR[rgb >> 16 & 0xFF], LINEAR[rgb >> 8 & 0xFF], LINEAR[rgb & 0xFF])
+    fx, fy, fz = _f(x), _f(y), _f(z)
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def lab_to_rgb(lab: Sequence[float]) -> int:
+    L, a, b = lab
+    fy = (L + 16) / 116
+    r, g, b = _apply(_M_INV, _f_inv(fy + a / 500), _f_inv(fy), _f_inv(fy - b / 200))
+    return _encode(r) << 16 | _encode(g) << 8 | _encode(b)
+
+
+def rgb_to_oklch(rgb: int) -> tuple[float, float, float]:
+    lms = _apply(_LMS, LINEAR[rgb >> 16 & 0xFF], LINEAR[rgb >> 8 & 0xFF], LINEAR[rgb & 0xFF])
+    L, a, b = _apply(_OKLAB, *(c ** (1 / 3) for c in lms))
+    return (L, math.hypot(a, b), math.degrees(math.atan2(b, a)) % 360)
+
+
+def oklch_to_rgb(lch: Sequence[float]) -> int:
+    L, chroma, hue = lch
+    h = math.radians(hue)
+    lms = _apply(_OKLAB_INV, L, chroma * math.cos(h), chroma * math.sin(h))
+    r, g, b = _apply(_LMS_INV, *(c * c * c for c in lms))
+    return _encode(r) << 16 | _encode(g) << 8 | _encode(b)
+
+
+def _hue(r: float, g: float, b: float, high: float, delta: float) -> float:
+    if not delta:
+        return 0.0
+    if high == r:
+        return 60 * ((g - b) / delta % 6)
+    if high == g:
+        return 60 * ((b - r) / delta + 2)
+    return 60 * ((r - g) / delta + 4)
+
+
+def rgb_to_hsl(rgb: int) -> tuple[float, float, float]:
+    r, g, b = (rgb >> 16 & 0xFF) / 255, (rgb >> 8 & 0xFF) / 255, (rgb & 0xFF) / 255
+    high, low = max(r, g, b), min(r, g, b)
+    delta = high - low
+    light = (high + low) / 2
+    sat = delta / (1 - abs(2 * light - 1)) if delta else 0.0
+    return (_hue(r, g, b, high, delta), sat * 100, light * 100)
+
+
+def rgb_to_hsv(rgb: int) -> tuple[float, float, float]:
+    r, g, b = (rgb >> 16 & 0xFF) / 255, (rgb >> 8 & 0xFF) / 255, (rgb & 0xFF) / 255
+    high, low = max(r, g, b), min(r, g, b)
+    delta = high - low
+    return (_hue(r, g, b, high, delta), delta / high * 100 if high else 0.0, high * 100)
+
+
+def _channel(x: float) -> int:
+    return min(max(round(x * 255), 0), 255)
+
+
+def hsl_to_rgb(hsl: Sequence[float]) -> int:
+    hue, sat, light = hsl[0] % 360, hsl[1] / 100, hsl[2] / 100
+    amount = sat * min(light, 1 - light)
+    r, g, b = (
+        light - amount * max(-1, min(k - 3, 9 - k, 1))
+        for k in ((n + hue / 30) % 12 for n in (0, 8, 4))
+    )
+    return _channel(r) << 16 | _channel(g) << 8 | _channel(b)
+
+
+def hsv_to_rgb(hsv: Sequence[float]) -> int:
+    hue, sat, value = hsv[0] % 360, hsv[1] / 100, hsv[2] / 100
+    r, g, b = (
+        value - value * sat * max(0, min(k, 4 - k, 1))
+        for k in ((n + hue / 60) % 6 for n in (5, 3, 1))
+    )
+    return _channel(r) << 16 | _channel(g) << 8 | _channel(b)
+
+
+def _hex_to_rgb(value: str) -> int:
+    digits = value.strip().lstrip("#")
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    if len(digits) != 6 or not all(c in string.hexdigits for c in digits):
+        raise ValueError(f"invalid hex color {value!r}")
+    return int(digits, 16)
+
+
+def _tuple_to_rgb(rgb: Sequence[float]) -> int:
+    r, g, b = (min(max(round(c), 0), 255) for c in rgb)
+    return r << 16 | g << 8 | b
+
+
+_TO_RGB = {
+    "hex": _hex_to_rgb,
+    "rgb": _tuple_to_rgb,
+    "hsl": hsl_to_rgb,
+    "hsv": hsv_to_rgb,
+    "lab": lab_to_rgb,
+    "oklch": oklch_to_rgb,
+}
+_FROM_RGB = {
+    "hex": lambda rgb: f"#{rgb:06x}",
+    "rgb": lambda rgb: (rgb >> 16 & 0xFF, rgb >> 8 & 0xFF, rgb & 0xFF),
+    "hsl": rgb_to_hsl,
+    "hsv": rgb_to_hsv,
+    "lab": rgb_to_lab,
+    "oklch": rgb_to_oklch,
+}
+
+
+def _check(space: str) -> None:
+    if space not in _TO_RGB:
+        raise ValueError(f"unknown color space {space!r}")
+
+
+def to_rgb(value, space: str) -> int:
+    """Packed ``0xRRGGBB`` of ``value`` given in ``space``."""
+    _check(space)
+    return _TO_RGB[space](value)
+
+
+@lru_cache(maxsize=4096)
+def from_rgb(rgb: int, space: str):
+    """``rgb`` (packed ``0xRRGGBB``) expressed in ``space``."""
+    _check(space)
+    return _FROM_RGB[space](rgb)
+
+
+def convert(value, source: str, target: str):
+    """Convert one color from ``source`` to ``target`` (names in ``SPACES``)."""
+    return from_rgb(to_rgb(value, source), target)
+
+
+# ----------------------------------------------------------------------
+# Batches
+# ----------------------------------------------------------------------
+def convert_many(values, source: str, target: str):
+    """Convert a batch of colors.
+
+    With NumPy, numeric spaces are ``(n, 3)`` arrays (ints for ``rgb``) and
+    hex is a list of strings; without it, lists of what :func:`convert`
+    returns.
+    """
+    _check(source)
+    _check(target)
+    if np is None:
+        return [convert(value, source, target) for value in values]
+    return _from_packed(_to_packed(values, source), target)
+
+
+def lab_array(colors: Sequence[int]):
+    """Lab coordinates of many packed colors.
+
+    An ``(n, 3)`` float array with NumPy, else a list of tuples.
+    """
+    if np is None:
+        return [rgb_to_lab(c) for c in colors]
+    return _from_packed(np.asarray(colors, dtype=np.int64), "lab")
+
+
+def _linear_np(packed):
+    lut = np.asarray(LINEAR)
+    return np.stack([lut[packed >> 16 & 0xFF], lut[packed >> 8 & 0xFF], lut[packed & 0xFF]], 1)
+
+
+def _pack_linear_np(linear):
+    codes = np.searchsorted(np.asarray(_BOUNDS), linear, side="right")
+    return codes[:, 0] << 16 | codes[:, 1] << 8 | codes[:, 2]
+
+
+def _pack_unit_np(rgb):
+    codes = np.clip(np.rint(rgb * 255), 0, 255).astype(np.int64)
+    return codes[:, 0] << 16 | codes[:, 1] << 8 | codes[:, 2]
+
+
+def _hue_np(r, g, b, high, delta):
+    safe = np.where(delta == 0, 1, delta)
+    hue = np.where(
+        high == r,
+        (g - b) / safe % 6,
+        np.where(high == g, (b - r) / safe + 2, (r - g) / safe + 4),
+    )
+    return np.where(delta == 0, 0.0, hue * 60)
+
+
+def _from_packed(packed, target: str):
+    if target == "hex":
+        return [f"#{c:06x}" for c in packed.tolist()]
+    if target == "rgb":
+        return np.stack([packed >> 16 & 0xFF, packed >> 8 & 0xFF, packed & 0xFF], 1)
+    if target in ("hsl", "hsv"):
+        rgb = np.stack([packed >> 16 & 0xFF, packed >> 8 & 0xFF, packed & 0xFF], 1) / 255
+        r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+        high, low = rgb.max(axis=1), rgb.min(axis=1)
+        delta = high - low
+        hue = _hue_np(r, g, b, high, delta)
+        if target == "hsv":
+            sat = np.divide(delta, high, out=np.zeros_like(delta), where=high > 0)
+            return np.stack([hue, sat * 100, high * 100], 1)
+        light = (high + low) / 2
+        span = 1 - np.abs(2 * light - 1)
+        sat = np.divide(delta, span, out=np.zeros_like(delta), where=delta > 0)
+        return np.stack([hue, sat * 100, light * 100], 1)
+    linear = _linear_np(packed)
+    if target == "lab":
+        xyz = linear @ np.asarray(_M).T
+        f = np.where(xyz > _EPSILON, np.cbrt(xyz), (_KAPPA * xyz + 16) / 116)
+        return np.stack(
+            [116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], 1
+        )
+    lab = np.cbrt(linear @ np.asarray(_LMS).T) @ np.asarray(_OKLAB).T
+    hue = np.degrees(np.arctan2(lab[:, 2], lab[:, 1])) % 360
+    return np.stack([lab[:, 0], np.hypot(lab[:, 1], lab[:, 2]), hue], 1)
+
+
+def _to_packed(values, source: str):
+    if source == "hex":
+        return np.asarray([_hex_to_rgb(v) for v in values], dtype=np.int64).reshape(-1)
+    values = np.asarray(values, dtype=float).reshape(-1, 3)
+    a, b, c = values[:, 0], values[:, 1], values[:, 2]
+    if source == "rgb":
+        return _pack_unit_np(values / 255)
+    if source == "hsl":
+        hue, sat, light = a % 360, b / 100, c / 100
+        amount = sat * np.minimum(light, 1 - light)
+        k = (np.array([0, 8, 4]) + hue[:, None] / 30) % 12
+        step = np.clip(np.minimum(k - 3, 9 - k), -1, 1)
+        return _pack_unit_np(light[:, None] - amount[:, None] * step)
+    if source == "hsv":
+        hue, sat, value = a % 360, b / 100, c / 100
+        k = (np.array([5, 3, 1]) + hue[:, None] / 60) % 6
+        step = np.clip(np.minimum(k, 4 - k), 0, 1)
+        return _pack_unit_np(value[:, None] * (1 - sat[:, None] * step))
+    if source == "lab":
+        fy = (a + 16) / 116
+        f = np.stack([fy + b / 500, fy, fy - c / 200], 1)
+        xyz = np.where(f**3 > _EPSILON, f**3, (116 * f - 16) / _KAPPA)
+        return _pack_linear_np(xyz @ np.asarray(_M_INV).T)
+    h = np.radians(c)
+    lab = np.stack([a, b * np.cos(h), b * np.sin(h)], 1)
+    lms = (lab @ np.asarray(_OKLAB_INV).T) ** 3
+    return _pack_linear_np(lms @ np.asarray(_LMS_INV).T)
+
+
+# ----------------------------------------------------------------------
+# Text
+# ----------------------------------------------------------------------
+_FUNCTION_RE = re.compile(r"\s*([a-z]+)\(\s*(.*?)\s*\)\s*", re.IGNORECASE)
+_ALIASES = {"rgba": "rgb", "hsla": "hsl", "hsb": "hsv"}
+# What 100% means for each component, per space (None: % not allowed).
+_PERCENT = {
+    "rgb": (255, 255, 255),
+    "hsl": (None, 100, 100),
+    "hsv": (None, 100, 100),
+    "lab": (100, 125, 125),
+    "oklch": (1, 0.4, None),
+}
+
+
+def parse_color(text: str) -> int:
+    """Packed RGB of ``#rgb``/``#rrggbb`` or ``rgb()``, ``hsl()``, ``hsv()``,
+    ``lab()`` or ``oklch()`` text; raises :class:`ValueError` otherwise.
+
+    Components may be separated by spaces or commas; an alpha component
+    (after ``/`` or a fourth one) is ignored.
+    """
+    match = _FUNCTION_RE.fullmatch(text)
+    if match is None:
+        if not re.fullmatch(r"\s*#?([0-9a-f]{3}|[0-9a-f]{6})\s*", text, re.IGNORECASE):
+            raise ValueError(f"not a color: {text!r}")
+        return _hex_to_rgb(text)
+    name = match.group(1).lower()
+    space = _ALIASES.get(name, name)
+    if space not in _PERCENT:
+        raise ValueError(f"unknown color function {name!r}")
+    parts = re.split(r"\s*[,/\s]\s*", match.group(2))
+    if len(parts) not in (3, 4):
+        raise ValueError(f"expected 3 components in {text!r}")
+    values = []
+    for part, full in zip(parts, _PERCENT[space]):
+        part = part.lower().removesuffix("deg")
+        if part.endswith("%"):
+            if full is None:
+                raise ValueError(f"percentage not allowed here: {part!r}")
+            values.append(float(part[:-1]) * full / 100)
+        else:
+            values.append(float(part))
+    if not all(map(math.isfinite, values)):
+        raise ValueError(f"not a color: {text!r}")
+    try:
+        return to_rgb(values, space)
+    except (OverflowError, ValueError):  # e.g. hsl(0 1e300 1e300): inf or nan
+        raise ValueError(f"not a color: {text!r}") from None
+
+
+def _number(x: float, digits: int) -> str:
+    text = f"{x:.{digits}f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def format_color(rgb: int, space: str) -> str:
+    """CSS-style text for ``rgb`` in ``space``.
+
+    :func:`parse_color` reads it back as the same color, except that a
+    channel close to 0 may come back one step off from ``oklch()`` text.
+    """
+    value = from_rgb(rgb, space)
+    if space == "hex":
+        return value
+    if space == "rgb":
+        return "rgb({} {} {})".format(*value)
+    if space in ("hsl", "hsv"):
+        hue, sat, third = value
+        return f"{space}({_number(hue, 1)} {_number(sat, 1)}% {_number(third, 1)}%)"
+    if space == "lab":
+        return "lab({})".format(" ".join(_number(c, 2) for c in value))
+    L, chroma, hue = value
+    return f"oklch({_number(L, 4)} {_number(chroma, 4)} {_number(hue, 2)})"
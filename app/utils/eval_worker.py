@@ -0,0 +1,113 @@
+"""Evaluate expressions in a separate process that can be stopped.
+
+A thread cannot interrupt a long big-integer operation, so expensive
+calculations run in a child process instead.  The process is started on
+first use and kept around for later jobs; cancelling a job or exceeding the
+timeout kills it, and the next job starts a fresh one.
+
+:class:`EvalWorker` never blocks: :meth:`EvalWorker.poll` is meant to be
+called from a Tk ``after`` loop.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import time
+from multiprocessing.connection import Connection
+
+from utils.safe_eval import SafeEvaluator
+
+
+def _serve(conn: Connection) -> None:
+    """Child process: evaluate every expression received on ``conn``."""
+
+    evaluator = SafeEvaluator()
+    while True:
+        try:
+            expr, env, mode, precision = conn.recv()
+        except EOFError:
+            return
+        try:
+            evaluator.set_mode(mode, precision)
+            conn.send(("ok", evaluator.eval(expr, env)))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class EvalWorker:
+    """One background evaluation at a time, with a wall-clock timeout."""
+
+    def __init__(self, timeout: float = 5.0) -> None:
+        self.timeout = timeout
+        # forkserver: children are forked from a clean helper process, not
+        # from the threaded Tk process.
+        self._ctx = mp.get_context("forkserver")
+        self._process: mp.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._started = 0.0
+        self.busy = False
+
+    def submit(
+        self, expr: str, env: dict | None = None, mode: str = "float", precision: int = 28
+    ) -> None:
+        """Start evaluating ``expr``; a running job is cancelled first.
+
+        ``mode`` and ``precision`` select the numeric mode (see
+        :class:`utils.safe_eval.NumericMode`).
+        """
+
+        if self.busy:
+            self.cancel()
+        if self._process is None or not self._process.is_alive():
+            parent, child = self._ctx.Pipe()
+            self._process = self._ctx.Process(
+                target=_serve, args=(child,), name="calc-eval", daemon=True
+            )
+            self._process.start()
+            child.close()
+            self._conn = parent
+        assert self._conn is not None
+        self._conn.send((expr, env, mode, precision))
+        self._started = time.monotonic()
+        self.busy = True
+
+    def poll(self) -> tuple[str, object] | None:
+        """Return the outcome once available, else ``None``.
+
+        Outcomes are ``("ok", value)``, ``("error", message)`` and
+        ``("timeout", None)``.
+        """
+
+        if not self.busy:
+            return None
+        assert self._conn is not None
+        try:
+            if self._conn.poll():
+                self.busy = False
+                return self._conn.recv()
+        except (EOFError, OSError):
+            self._stop()
+            return ("error", "evaluation process died")
+        if time.monotonic() - self._started > self.timeout:
+            self._stop()
+            return ("timeout", None)
+        return None
+
+    def cancel(self) -> None:
+        """Abandon the running job (kills the process)."""
+
+        if self.busy:
+            self._stop()
+
+    def close(self) -> None:
+        self._stop()
+
+    def _stop(self) -> None:
+        self.busy = False
+        if self._process is not None:
+            self._process.kill()
+            self._process.join(1)
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,114 @@
+"""Preview of the calculator input's value while it is being typed.
+
+Most keystrokes leave the input incomplete (``2 * (3 +``), so checking it
+must be cheap and must not raise: the input is compiled with
+:meth:`SafeEvaluator.try_compile`, and incomplete input simply has no
+preview.  Outcomes are memoized by the normalized expression plus the
+values of the names it uses, and the parse of each raw input (valid or
+not) is remembered too, so retyping an expression costs two dictionary
+lookups.
+
+Expressions whose estimated cost exceeds the inline budget are handed back
+to the caller to evaluate off the Tk thread.  If an inline evaluation still
+takes longer than ``budget_ms``, the budget is lowered to that
+expression's size so similar ones go off-thread from then on.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from utils.safe_eval import SafeEvaluator, estimate_bits, normalize, split_binding
+
+# The inline budget never drops below this: float arithmetic is always fast.
+_MIN_INLINE_BITS = 1024.0
+
+
+class LivePreview:
+    """Memoized, non-raising evaluation of (possibly partial) input."""
+
+    def __init__(
+        self,
+        evaluator: SafeEvaluator,
+        budget_ms: float = 10.0,
+        inline_bits: float = 8192,
+        max_bits: float = 32 * 1024 * 1024,
+        cache_size: int = 512,
+        formatter: Callable[[object], str] = str,
+    ) -> None:
+        self.evaluator = evaluator
+        self.budget = budget_ms / 1000.0
+        self.inline_bits = inline_bits
+        self.max_bits = max_bits
+        self.cache_size = cache_size
+        self.formatter = formatter
+        # (normalized expr, values of its names) -> (status, text)
+        self._memo: OrderedDict[tuple, tuple[str, str | None]] = OrderedDict()
+        # raw expr -> compiled normalized expr, None if invalid
+        self._parsed: OrderedDict[str, object] = OrderedDict()
+        self.evaluations = 0
+
+    # ------------------------------------------------------------------
+    def lookup(self, source: str, env: dict) -> tuple[str, object]:
+        """Preview ``source`` with the names in ``env``.
+
+        Returns ``("ok", text)``, ``("none", None)`` for input without a
+        value (incomplete, unknown names, errors), ``("too large", None)``,
+        or ``("slow", key)``: evaluate ``key[0]`` off-thread, then pass the
+        outcome to :meth:`store`.
+        """
+        compiled = self._compile(split_binding(source)[1])
+        if compiled is None or not compiled.names <= env.keys():
+            return ("none", None)
+
+        key = (compiled.source, tuple(env[n] for n in sorted(compiled.names)))
+        outcome = self._memo.get(key)
+        if outcome is not None:
+            self._memo.move_to_end(key)
+            return outcome
+
+        bits = estimate_bits(compiled, env)
+        if bits > self.max_bits:
+            return self._remember(key, ("too large", None))
+        if bits > self.inline_bits:
+            return ("slow", key)
+
+        self.evaluations += 1
+        started = time.perf_counter()
+        try:
+            outcome = ("ok", self.formatter(compiled(env)))
+        except Exception:
+            outcome = ("none", None)
+        if time.perf_counter() - started > self.budget and bits < self.inline_bits:
+            self.inline_bits = max(bits, _MIN_INLINE_BITS)
+        return self._remember(key, outcome)
+
+    def store(self, key: tuple, status: str, value=None) -> tuple[str, object]:
+        """Record the result of a ``"slow"`` evaluation; return the outcome."""
+        if status == "ok":
+            return self._remember(key, ("ok", self.formatter(value)))
+        return self._remember(key, ("none", None))
+
+    def clear(self) -> None:
+        self._memo.clear()
+        self._parsed.clear()
+
+    # ------------------------------------------------------------------
+    def _compile(self, expr: str):
+        if expr in self._parsed:
+            self._parsed.move_to_end(expr)
+            return self._parsed[expr]
+        text = normalize(expr)
+        compiled = self.evaluator.try_compile(text) if text else None
+        self._parsed[expr] = compiled
+        if len(self._parsed) > self.cache_size:
+            self._parsed.popitem(last=False)
+        return compiled
+
+    def _remember(self, key: tuple, outcome: tuple) -> tuple:
+        self._memo[key] = outcome
+        if len(self._memo) > self.cache_size:
+            self._memo.popitem(last=False)
+        return outcome
@@ -0,0 +1,198 @@
+"""Dominant colors of an image (palette extraction).
+
+The pixels are sampled down to at most ``max_samples`` (every n-th pixel)
+and counted into a histogram with 5 bits per channel: at most 32768 bins,
+each remembering the exact mean color of its pixels.  Median cut then
+splits the bins into ``count`` boxes, each time cutting the box with the
+largest population x channel range at its weighted median along that
+channel.  The ``"kmeans"`` method refines the boxes' colors with a few
+rounds of weighted k-means (Lloyd) over the bins.
+
+With NumPy the sampling, the histogram and the k-means assignments are
+vectorized; without it the histogram is filled from strided byte slices
+into ``array`` buffers, and k-means only uses the most common bins.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional, only used to speed up extraction
+    np = None
+
+METHODS = ("median-cut", "kmeans")
+
+BITS = 5
+_SHIFT = 8 - BITS
+_BINS = 1 << 3 * BITS
+
+KMEANS_ROUNDS = 10
+# Without NumPy, k-means assigns only this many of the most common bins.
+KMEANS_PURE_BINS = 2048
+
+
+def extract_palette(
+    data: bytes,
+    channels: int = 3,
+    count: int = 8,
+    method: str = "median-cut",
+    max_samples: int = 65536,
+) -> list[tuple[int, float]]:
+    """The ``count`` dominant colors of ``data``, most common first.
+
+    ``data`` holds ``channels`` bytes per pixel, red first (RGB, or RGBA
+    with alpha ignored).  Returns ``(0xRRGGBB, share of pixels)`` pairs.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}")
+    if channels < 3:
+        raise ValueError("need at least 3 channels (RGB)")
+    colors, weights = _histogram(data, channels, max(max_samples, 1))
+    if not weights:
+        return []
+
+    boxes = _median_cut(colors, weights, max(count, 1))
+    centres = [_mean(colors, weights, box) for box in boxes]
+    populations = [sum(weights[i] for i in box) for box in boxes]
+    if method == "kmeans":
+        centres, populations = _kmeans(colors, weights, centres)
+
+    total = sum(weights)
+    ranked = sorted(zip(populations, centres), key=lambda pc: -pc[0])
+    return [(_pack(centre), population / total) for population, centre in ranked if population]
+
+
+def _pack(color) -> int:
+    r, g, b = (min(max(round(c), 0), 255) for c in color)
+    return r << 16 | g << 8 | b
+
+
+# ----------------------------------------------------------------------
+def _histogram(data: bytes, channels: int, max_samples: int):
+    """Mean colors and pixel counts of the non-empty bins."""
+    pixels = len(data) // channels
+    step = -(-pixels // max_samples) if pixels else 1  # ceil
+    if np is not None:
+        return _histogram_numpy(data, channels, pixels, step)
+
+    stride = step * channels
+    data = memoryview(data)[: pixels * channels]
+    counts = array("I", bytes(4 * _BINS))
+    sums = [array("Q", bytes(8 * _BINS)) for _ in range(3)]
+    sum_r, sum_g, sum_b = sums
+    for r, g, b in zip(data[0::stride], data[1::stride], data[2::stride]):
+        key = (r >> _SHIFT) << 2 * BITS | (g >> _SHIFT) << BITS | b >> _SHIFT
+        counts[key] += 1
+        sum_r[key] += r
+        sum_g[key] += g
+        sum_b[key] += b
+    used = [key for key, n in enumerate(counts) if n]
+    colors = [(sum_r[k] / counts[k], sum_g[k] / counts[k], sum_b[k] / counts[k]) for k in used]
+    return colors, [counts[k] for k in used]
+
+
+def _histogram_numpy(data: bytes, channels: int, pixels: int, step: int):
+    samples = np.frombuffer(data, dtype=np.uint8, count=pixels * channels)
+    samples = samples.reshape(pixels, channels)[::step, :3].astype(np.intp)
+    r, g, b = samples[:, 0], samples[:, 1], samples[:, 2]
+    keys = (r >> _SHIFT) << 2 * BITS | (g >> _SHIFT) << BITS | b >> _SHIFT
+    counts = np.bincount(keys, minlength=_BINS)
+    used = counts.nonzero()[0]
+    means = np.stack(
+        [np.bincount(keys, weights=channel, minlength=_BINS)[used] for channel in (r, g, b)], 1
+    ) / counts[used, None]
+    return means.tolist(), counts[used].tolist()
+
+
+# ----------------------------------------------------------------------
+def _box(colors, weights, indices: list[int]) -> tuple[float, int, list[int]]:
+    """``(split priority, widest channel, indices)`` of a box of bins."""
+    ranges = [
+        max(colors[i][c] for i in indices) - min(colors[i][c] for i in indices)
+        for c in range(3)
+    ]
+    axis = ranges.index(max(ranges))
+    population = sum(weights[i] for i in indices)
+    return population * ranges[axis], axis, indices
+
+
+def _median_cut(colors, weights, count: int) -> list[list[int]]:
+    boxes = [_box(colors, weights, list(range(len(colors))))]
+    while len(boxes) < count:
+        widest = max(range(len(boxes)), key=lambda b: boxes[b][0])
+        if boxes[widest][0] <= 0:
+            break  # every box is a single color
+        _, axis, indices = boxes.pop(widest)
+        indices.sort(key=lambda i: colors[i][axis])
+        half = sum(weights[i] for i in indices) / 2
+        seen = 0
+        for cut, i in enumerate(indices):
+            seen += weights[i]
+            if seen >= half:
+                break
+        cut = min(max(cut, 1), len(indices) - 1)
+        boxes.append(_box(colors, weights, indices[:cut]))
+        boxes.append(_box(colors, weights, indices[cut:]))
+    return [indices for _, _, indices in boxes]
+
+
+def _mean(colors, weights, indices: list[int]) -> tuple[float, float, float]:
+    total = sum(weights[i] for i in indices)
+    return tuple(sum(colors[i][c] * weights[i] for i in indices) / total for c in range(3))
+
+
+# ----------------------------------------------------------------------
+def _kmeans(colors, weights, centres):
+    """Refined centres and their populations, starting from ``centres``."""
+    if np is not None:
+        return _kmeans_numpy(colors, weights, centres)
+
+    k = len(centres)
+    common = sorted(range(len(colors)), key=lambda i: -weights[i])[:KMEANS_PURE_BINS]
+    points = [(colors[i], weights[i]) for i in common]
+    for _ in range(KMEANS_ROUNDS):
+        sums = [[0.0, 0.0, 0.0, 0] for _ in range(k)]
+        for (r, g, b), w in points:
+            best, best_d2 = 0, float("inf")
+            for j, (cr, cg, cb) in enumerate(centres):
+                d2 = (r - cr) ** 2 + (g - cg) ** 2 + (b - cb) ** 2
+                if d2 < best_d2:
+                    best, best_d2 = j, d2
+            acc = sums[best]
+            acc[0] += r * w
+            acc[1] += g * w
+            acc[2] += b * w
+            acc[3] += w
+        updated = [
+            (s[0] / s[3], s[1] / s[3], s[2] / s[3]) if s[3] else centre
+            for s, centre in zip(sums, centres)
+        ]
+        populations = [s[3] for s in sums]
+        if updated == centres:
+            break
+        centres = updated
+    # Shares are of all pixels, so scale up for the bins left out.
+    scale = sum(weights) / max(sum(populations), 1)
+    return centres, [p * scale for p in populations]
+
+
+def _kmeans_numpy(colors, weights, centres):
+    points = np.asarray(colors)
+    w = np.asarray(weights, dtype=float)
+    centres = np.asarray(centres)
+    k = len(centres)
+    for _ in range(KMEANS_ROUNDS):
+        labels = ((points[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        populations = np.bincount(labels, weights=w, minlength=k)
+        sums = np.stack(
+            [np.bincount(labels, weights=w * points[:, c], minlength=k) for c in range(3)], 1
+        )
+        filled = populations > 0
+        updated = centres.copy()
+        updated[filled] = sums[filled] / populations[filled, None]
+        if np.allclose(updated, centres):
+            break
+        centres = updated
+    return centres.tolist(), populations.tolist()
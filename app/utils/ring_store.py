@@ -0,0 +1,117 @@
+"""Fixed-capacity ring buffer of short text records in a single file.
+
+The file is a small header followed by ``capacity`` slots of ``slot_size``
+bytes each.  Appending writes one slot in place and updates the header, so
+it costs the same no matter how many records are stored; once full, the
+oldest record is overwritten.  Records longer than a slot are truncated
+and end with :data:`TRUNCATED`.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+
+# magic, slot size, capacity, next slot to write, number of records
+_HEADER = struct.Struct("<4sIIQQ")
+_MAGIC = b"RNG1"
+_LENGTH = struct.Struct("<H")
+TRUNCATED = "\u2026"  # ends a record cut to fit its slot
+_MARKER = TRUNCATED.encode("utf-8")
+
+
+class RingStore:
+    """Persistent ring buffer; see the module docstring for the layout."""
+
+    def __init__(self, path: Path, capacity: int, slot_size: int = 256) -> None:
+        self.path = Path(path)
+        self.capacity = max(capacity, 1)
+        self.slot_size = min(max(slot_size, _LENGTH.size + len(_MARKER) + 1), 0xFFFF)
+        self._head = 0
+        self._count = 0
+        self._file = None
+
+    # ------------------------------------------------------------------
+    def load(self) -> list[str]:
+        """Open the store and return its records, oldest first.
+
+        A file written with another capacity or slot size is rewritten in
+        the current layout, keeping the newest records.
+        """
+        records, layout_ok = self._read()
+        if not layout_ok:
+            records = records[-self.capacity :]
+            self._rewrite(records)
+        self._file = open(self.path, "r+b")
+        return records
+
+    def append(self, text: str) -> None:
+        if self._file is None:
+            self.load()
+        self._file.seek(_HEADER.size + self._head * self.slot_size)
+        self._file.write(self._slot(text))
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._write_header()
+        self._file.flush()
+
+    @property
+    def record_bytes(self) -> int:
+        """Longest record (UTF-8 bytes) stored without truncation."""
+        return self.slot_size - _LENGTH.size
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ------------------------------------------------------------------
+    def _read(self) -> tuple[list[str], bool]:
+        """Return the records on disk and whether the layout matches."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            magic, slot_size, capacity, head, count = _HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return [], False
+        if magic != _MAGIC or not slot_size or not capacity:
+            return [], False
+
+        records = []
+        count = min(count, capacity)
+        for n in range(count):
+            index = (head - count + n) % capacity
+            offset = _HEADER.size + index * slot_size
+            slot = data[offset : offset + slot_size]
+            if len(slot) < _LENGTH.size:
+                continue  # torn or missing slot
+            (length,) = _LENGTH.unpack_from(slot)
+            records.append(slot[_LENGTH.size : _LENGTH.size + length].decode("utf-8", "replace"))
+        if slot_size == self.slot_size and capacity == self.capacity:
+            self._head, self._count = head, count
+            return records, True
+        return records, False
+
+    def _rewrite(self, records: list[str]) -> None:
+        self._head = len(records) % self.capacity
+        self._count = len(records)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(self._header() + b"".join(map(self._slot, records)))
+        os.replace(tmp, self.path)
+
+    def _slot(self, text: str) -> bytes:
+        data = text.encode("utf-8")
+        if len(data) > self.record_bytes:
+            data = data[: self.record_bytes - len(_MARKER)]
+            data = data.decode("utf-8", "ignore").encode("utf-8") + _MARKER  # no split chars
+        return (_LENGTH.pack(len(data)) + data).ljust(self.slot_size, b"\0")
+
+    def _header(self) -> bytes:
+        return _HEADER.pack(_MAGIC, self.slot_size, self.capacity, self._head, self._count)
+
+    def _write_header(self) -> None:
+        self._file.seek(0)
+        self._file.write(self._header())
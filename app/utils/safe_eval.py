@@ -1,40 +1,397 @@
-import ast
+import decimal
+import functools
+import math
 import operator
+import re
+from collections import OrderedDict
+from decimal import Decimal
+from fractions import Fraction
 
-class SafeEvaluator:
-    def __init__(self):
-        self.allowed_ops = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.FloorDiv: operator.floordiv,
-            ast.Mod: operator.mod,
-            ast.Pow: operator.pow,
-            ast.USub: operator.neg,
-            ast.UAdd: operator.pos,
+# Floats overflow (and raise) long before they get expensive.
+_FLOAT_BITS = 1024.0
+
+
+class CompiledExpression:
+    """A validated expression flattened into a postfix (RPN) program.
+
+    Each instruction is ``(arity, value)``: arity 0 pushes ``value``, arity 1
+    and 2 apply the operator function ``value`` to the top of the stack and
+    ``LOAD`` pushes the variable named ``value``.  ``kinds`` maps the
+    operator functions of the program's numeric mode to their symbols.
+    """
+
+    __slots__ = ("source", "program", "names", "kinds")
+
+    LOAD = 3
+
+    def __init__(self, source: str, program: tuple, kinds: dict | None = None) -> None:
+        self.source = source
+        self.program = program
+        self.names = frozenset(value for arity, value in program if arity == self.LOAD)
+        self.kinds = _KINDS if kinds is None else kinds
+
+    def __call__(self, env=None):
+        """Evaluate with the variables in ``env`` (a mapping)."""
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for arity, value in self.program:
+            if arity == 0:
+                push(value)
+            elif arity == 2:
+                right = pop()
+                stack[-1] = value(stack[-1], right)
+            elif arity == 1:
+                stack[-1] = value(stack[-1])
+            else:
+                try:
+                    push(env[value])
+                except (KeyError, TypeError):
+                    raise ValueError(f"Unknown name: {value}") from None
+        return stack[0]
+
+
+def _log2(value) -> float:
+    try:
+        return math.log2(abs(value)) if value else 0.0
+    except (OverflowError, ValueError):
+        return _FLOAT_BITS
+
+
+def estimate_bits(compiled: CompiledExpression, env=None) -> float:
+    """Upper bound of the size, in bits, of the largest integer computed.
+
+    Only integer arithmetic can grow without limit (``9**9**9``), and its
+    cost grows with the size of the numbers involved, so this is a cheap
+    static stand-in for the cost of evaluating ``compiled``.  Variables are
+    taken from ``env``; unknown ones count as 64-bit integers.
+    """
+    worst = 0.0
+    # One (log2 upper bound, is_float) pair per value on the stack.
+    stack = []
+    for arity, value in compiled.program:
+        if arity == CompiledExpression.LOAD:
+            value = env.get(value, 2**64) if env is not None else 2**64
+            arity = 0
+        if arity == 0:
+            # Decimals are rounded to the context precision, like floats.
+            stack.append((_log2(value), isinstance(value, (float, Decimal))))
+            continue
+        if arity == 1:
+            continue  # neg / pos keep the magnitude
+        b, b_float = stack.pop()
+        a, a_float = stack.pop()
+        is_float = a_float or b_float
+        kind = compiled.kinds.get(value, "**")
+        if kind == "+" or kind == "-":
+            bits = max(a, b) + 1
+        elif kind == "*" or kind == "exact/":  # a fraction's parts multiply
+            bits = a + b
+        elif kind == "/":
+            bits, is_float = a, True
+        elif kind == "//":
+            bits = a
+        elif kind == "%":
+            bits = b
+        else:  # pow: |x| ** e <= 2 ** (log2|x| * 2 ** log2 e)
+            bits = a * 2.0 ** min(b, _FLOAT_BITS) if a else 0.0
+        if is_float:
+            bits = min(bits, _FLOAT_BITS)
+        else:
+            worst = max(worst, bits)
+        stack.append((bits, is_float))
+    if stack and not stack[0][1]:
+        worst = max(worst, stack[0][0])
+    return worst
+
+
+# Python number literals (underscores, 0x/0o/0b prefixes) and operators.
+_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<num>0[xXoObB][0-9a-fA-F_]+"
+    r"|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?)"
+    r"|(?P<name>[A-Za-z_]\w*)|(?P<op>\*\*|//|[-+*/%()])|(?P<bad>\S))"
+)
+
+BINARY_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": operator.pow,
+}
+UNARY_OPS = {"-": operator.neg, "+": operator.pos}
+
+# Operator function -> symbol of the float mode (see estimate_bits).
+_KINDS = {fn: symbol for symbol, fn in BINARY_OPS.items()}
+
+# Python's precedences: unary minus binds tighter than ``*`` but looser than
+# a ``**`` on its right (``-2**2 == -4``), while ``**`` takes a unary
+# operand on its right (``2**-1``) and groups right to left.
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "//": 2, "%": 2, "**": 4}
+_UNARY_PRECEDENCE = 3
+
+
+_BINDING_RE = re.compile(r"\s*([A-Za-z_]\w*)\s*=(?!=)(.*)$", re.DOTALL)
+
+
+def split_binding(text: str) -> tuple:
+    """Split ``"name = expr"`` into ``(name, expr)``; else ``(None, text)``."""
+    m = _BINDING_RE.match(text)
+    if m is None:
+        return None, text
+    return m.group(1), m.group(2)
+
+
+def normalize(expr: str) -> str:
+    """``expr`` with canonical spacing: one space between tokens."""
+    return " ".join(tok for groups in _TOKEN_RE.findall(expr) for tok in groups if tok)
+
+
+def _number(token: str):
+    """The value of a number token, or ``None`` if it is malformed."""
+    try:
+        if token[:2].lower() in ("0x", "0o", "0b") or token.replace("_", "").isdigit():
+            return int(token, 0)
+        return float(token)
+    except ValueError:
+        return None
+
+
+def _exact_div(a, b):
+    return Fraction(a) / b
+
+
+def _exact_pow(a, b):
+    if b < 0 and type(a) is int:
+        a = Fraction(a)  # int ** -n would be a float
+    return a ** b
+
+
+class NumericMode:
+    """How one kind of arithmetic reads numbers and applies operators.
+
+    The operator tables are chosen once per mode and baked into compiled
+    programs, so evaluation never checks types:
+
+    * ``float``: Python ints and floats,
+    * ``decimal``: every number is a :class:`~decimal.Decimal`, operators
+      are methods of a context with ``precision`` significant digits (``//``
+      and ``%`` truncate towards zero, as Decimal does),
+    * ``fraction``: exact rationals; ints stay ints until ``/`` or a
+      negative power needs a :class:`~fractions.Fraction`.
+    """
+
+    __slots__ = ("name", "precision", "number", "binary_ops", "unary_ops", "convert", "kinds")
+
+    def __init__(
+        self, name, precision, number, binary_ops, unary_ops, convert, kinds=None
+    ) -> None:
+        self.name = name
+        self.precision = precision
+        self.number = number  # token -> value, None if malformed
+        self.binary_ops = binary_ops
+        self.unary_ops = unary_ops
+        self.convert = convert  # any number -> this mode's kind
+        # Operator function -> symbol, for estimate_bits
+        self.kinds = kinds if kinds is not None else {
+            fn: symbol for symbol, fn in binary_ops.items()
         }
 
-    def eval(self, expr: str):
-        """Safely evaluate a mathematical expression string."""
-        def eval_node(node):
-            if isinstance(node, ast.Constant):
-                if isinstance(node.value, (int, float)):
-                    return node.value
-                raise ValueError("Unsupported constant")
-            elif isinstance(node, ast.BinOp):
-                op_type = type(node.op)
-                if op_type in self.allowed_ops:
-                    return self.allowed_ops[op_type](eval_node(node.left), eval_node(node.right))
-                raise ValueError("Unsupported binary operator")
-            elif isinstance(node, ast.UnaryOp):
-                op_type = type(node.op)
-                if op_type in self.allowed_ops:
-                    return self.allowed_ops[op_type](eval_node(node.operand))
-                raise ValueError("Unsupported unary operator")
-            elif isinstance(node, ast.Expression):
-                return eval_node(node.body)
-            raise ValueError("Invalid expression")
-
-        parsed = ast.parse(expr, mode='eval')
-        return eval_node(parsed.body)
+
+MODES = ("float", "decimal", "fraction")
+
+
+def numeric_mode(name: str, precision: int = 28) -> NumericMode:
+    """The (shared) :class:`NumericMode` called ``name``.
+
+    ``precision`` (significant digits) only matters for ``decimal``.
+    """
+    return _numeric_mode(name, precision if name == "decimal" else None)
+
+
+@functools.lru_cache(maxsize=None)
+def _numeric_mode(name: str, precision: int | None) -> NumericMode:
+    if name == "float":
+
+        def convert(value):
+            return value if type(value) is int else float(value)
+
+        return NumericMode(name, None, _number, BINARY_OPS, UNARY_OPS, convert)
+    if name == "fraction":
+        binary_ops = dict(BINARY_OPS, **{"/": _exact_div, "**": _exact_pow})
+        kinds = {**_KINDS, _exact_div: "exact/", _exact_pow: "**"}
+
+        def number(token):
+            value = _number(token)
+            if value is None or type(value) is int:
+                return value
+            return Fraction(token.replace("_", ""))
+
+        def convert(value):
+            if type(value) is int:
+                return value
+            return Fraction(repr(value) if isinstance(value, float) else value)
+
+        return NumericMode(name, None, number, binary_ops, UNARY_OPS, convert, kinds)
+    if name == "decimal":
+        ctx = decimal.Context(prec=precision)
+        binary_ops = {
+            "+": ctx.add,
+            "-": ctx.subtract,
+            "*": ctx.multiply,
+            "/": ctx.divide,
+            "//": ctx.divide_int,
+            "%": ctx.remainder,
+            "**": ctx.power,
+        }
+
+        def number(token):
+            value = _number(token)
+            if value is None or type(value) is int:
+                return None if value is None else Decimal(value)
+            return Decimal(token.replace("_", ""))  # the literal, not the float
+
+        def convert(value):
+            if isinstance(value, Fraction):
+                return ctx.divide(Decimal(value.numerator), Decimal(value.denominator))
+            return Decimal(repr(value) if isinstance(value, float) else value)
+
+        unary_ops = {"-": ctx.minus, "+": ctx.plus}
+        return NumericMode(name, precision, number, binary_ops, unary_ops, convert)
+    raise ValueError(f"Unknown numeric mode: {name}")
+
+
+class SafeEvaluator:
+    def __init__(self, cache_size: int = 256, mode: str = "float", precision: int = 28):
+        self.precision = precision
+        self.numeric = numeric_mode(mode, precision)
+        # Compiled expressions by (mode, source), least recently used first.
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple, CompiledExpression] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def mode(self) -> str:
+        return self.numeric.name
+
+    def set_mode(self, mode: str, precision: int | None = None) -> None:
+        """Switch arithmetic; compiled expressions of every mode stay cached."""
+        if precision is not None:
+            self.precision = precision
+        self.numeric = numeric_mode(mode, self.precision)
+
+    def eval(self, expr: str, env=None):
+        """Safely evaluate a mathematical expression string.
+
+        ``env`` maps variable names (such as ``x``) to their values.
+        """
+        return self.compile(expr)(env)
+
+    def compile(self, expr: str, mode: str | None = None) -> CompiledExpression:
+        """Return the compiled form of ``expr``, reusing a cached one.
+
+        ``mode`` overrides the evaluator's numeric mode for this call.
+        """
+        compiled = self._compile(expr, mode)
+        if isinstance(compiled, str):
+            raise ValueError(compiled)
+        return compiled
+
+    def try_compile(self, expr: str, mode: str | None = None) -> CompiledExpression | None:
+        """Like :meth:`compile`, but return ``None`` for invalid input.
+
+        Meant for checking partial input on every keystroke, where raising
+        and catching an exception per check would cost more than the check.
+        """
+        compiled = self._compile(expr, mode)
+        return None if isinstance(compiled, str) else compiled
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def _compile(self, expr: str, mode: str | None) -> CompiledExpression | str:
+        numeric = self.numeric
+        if mode is not None and mode != numeric.name:
+            numeric = numeric_mode(mode, self.precision)
+        key = (numeric, expr)
+        compiled = self._cache.get(key)
+        if compiled is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return compiled
+
+        self.misses += 1
+        program = self._parse(expr, numeric)
+        if isinstance(program, str):
+            return program  # error message; not cached
+        compiled = CompiledExpression(expr, program, numeric.kinds)
+        self._cache[key] = compiled
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def _parse(self, expr: str, numeric: NumericMode) -> tuple | str:
+        """Tokenize and convert ``expr`` to postfix (shunting-yard).
+
+        Runs in one pass with explicit stacks, so time and memory grow
+        linearly with the expression and nesting depth is unlimited.
+        Returns the program, or an error message if ``expr`` is invalid.
+        """
+        number = numeric.number
+        binary_ops = numeric.binary_ops
+        unary_ops = numeric.unary_ops
+        program = []
+        emit = program.append
+        # Pending operators as (precedence, instruction); None marks "(".
+        pending = []
+        expect_operand = True
+        for num, name, op, bad in _TOKEN_RE.findall(expr):
+            if bad:
+                return "Invalid expression"
+            if expect_operand:
+                if num:
+                    value = number(num)
+                    if value is None:
+                        return f"Invalid number: {num}"
+                    emit((0, value))
+                    expect_operand = False
+                elif name:
+                    emit((CompiledExpression.LOAD, name))
+                    expect_operand = False
+                elif op == "(":
+                    pending.append(None)
+                elif op in unary_ops:
+                    pending.append((_UNARY_PRECEDENCE, (1, unary_ops[op])))
+                else:
+                    return "Invalid expression"
+            elif op == ")":
+                while pending and pending[-1] is not None:
+                    emit(pending.pop()[1])
+                if not pending:
+                    return "Unbalanced parentheses"
+                pending.pop()
+            elif op in binary_ops:
+                prec = _PRECEDENCE[op]
+                if op == "**":
+                    while pending and pending[-1] is not None and pending[-1][0] > prec:
+                        emit(pending.pop()[1])
+                else:
+                    while pending and pending[-1] is not None and pending[-1][0] >= prec:
+                        emit(pending.pop()[1])
+                pending.append((prec, (2, binary_ops[op])))
+                expect_operand = True
+            else:
+                return "Invalid expression"
+
+        if expect_operand:
+            return "Invalid expression"
+        while pending:
+            item = pending.pop()
+            if item is None:
+                return "Unbalanced parentheses"
+            emit(item[1])
+        return tuple(program)
@@ -0,0 +1,188 @@
+"""Calculator worksheet: one cell per line, with named bindings.
+
+A line is either a binding (``rate = 0.07``), an expression
+(``base * (1 + rate)``), or blank/``#`` comment.  The sheet keeps a
+dependency graph from each name to the cells that use it, so changing a
+line only re-evaluates that cell and the cells downstream of it, in
+topological order.  Expressions are compiled through the evaluator's cache.
+"""
+
+from __future__ import annotations
+
+from utils.safe_eval import SafeEvaluator, estimate_bits, split_binding
+
+
+class Cell:
+    __slots__ = ("source", "name", "compiled", "deps", "value", "error")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.name: str | None = None
+        self.compiled = None
+        self.deps: frozenset[str] = frozenset()
+        self.value = None
+        self.error: str | None = None
+
+    @property
+    def blank(self) -> bool:
+        stripped = self.source.strip()
+        return not stripped or stripped.startswith("#")
+
+
+class Worksheet:
+    """Cells evaluated incrementally along their dependencies."""
+
+    def __init__(self, evaluator: SafeEvaluator | None = None, max_bits: float = 65536) -> None:
+        self.evaluator = evaluator or SafeEvaluator()
+        self.max_bits = max_bits
+        self.cells: list[Cell] = []
+        # name -> cells defining it (more than one is an error)
+        self._defs: dict[str, list[Cell]] = {}
+        # name -> cells whose expression uses it
+        self._users: dict[str, set[Cell]] = {}
+        self.evaluations = 0
+
+    # ------------------------------------------------------------------
+    def set_lines(self, lines: list[str]) -> list[int]:
+        """Replace the sheet's lines; return the indices whose result changed.
+
+        Only the lines between the unchanged head and tail are re-parsed.
+        """
+        old = self.cells
+        head = 0
+        while head < min(len(old), len(lines)) and old[head].source == lines[head]:
+            head += 1
+        tail = 0
+        while (
+            tail < min(len(old), len(lines)) - head
+            and old[len(old) - 1 - tail].source == lines[len(lines) - 1 - tail]
+        ):
+            tail += 1
+
+        removed = old[head : len(old) - tail]
+        added = [Cell(source) for source in lines[head : len(lines) - tail]]
+        self.cells = old[:head] + added + old[len(old) - tail :]
+
+        touched_names: set[str] = set()
+        for cell in removed:
+            touched_names.update(self._unlink(cell))
+        for cell in added:
+            touched_names.update(self._link(cell))
+
+        affected = self._recompute(set(added), touched_names)
+        return [i for i, cell in enumerate(self.cells) if cell in affected]
+
+    def env(self) -> dict:
+        """Current value of every (valid) name."""
+        return {
+            name: cells[0].value
+            for name, cells in self._defs.items()
+            if len(cells) == 1 and cells[0].error is None
+        }
+
+    # ------------------------------------------------------------------
+    def _link(self, cell: Cell) -> set[str]:
+        """Parse ``cell`` and add it to the graph; return names it defines."""
+        if cell.blank:
+            return set()
+        name, expr = split_binding(cell.source)
+        cell.name = name
+        try:
+            cell.compiled = self.evaluator.compile(expr)
+            cell.deps = cell.compiled.names
+        except ValueError as exc:
+            cell.error = str(exc)
+        for dep in cell.deps:
+            self._users.setdefault(dep, set()).add(cell)
+        if name is None:
+            return set()
+        self._defs.setdefault(name, []).append(cell)
+        return {name}
+
+    def _unlink(self, cell: Cell) -> set[str]:
+        for dep in cell.deps:
+            users = self._users.get(dep)
+            if users is not None:
+                users.discard(cell)
+                if not users:
+                    del self._users[dep]
+        if cell.name is None:
+            return set()
+        defs = self._defs[cell.name]
+        defs.remove(cell)
+        if not defs:
+            del self._defs[cell.name]
+        return {cell.name}
+
+    def _recompute(self, cells: set[Cell], names: set[str]) -> set[Cell]:
+        """Re-evaluate ``cells`` and everything downstream of ``names``."""
+        affected = set(cells)
+        todo = list(names) + [cell.name for cell in cells if cell.name]
+        seen_names = set()
+        while todo:
+            name = todo.pop()
+            if name in seen_names:
+                continue
+            seen_names.add(name)
+            for cell in self._defs.get(name, ()):
+                affected.add(cell)  # duplicates appear or disappear
+            for user in self._users.get(name, ()):
+                affected.add(user)
+                if user.name:
+                    todo.append(user.name)
+
+        # Kahn's algorithm over the affected cells only.
+        waiting: dict[Cell, int] = {}
+        dependents: dict[Cell, list[Cell]] = {}
+        for cell in affected:
+            count = 0
+            for dep in cell.deps:
+                for provider in self._defs.get(dep, ()):
+                    if provider in affected and provider is not cell:
+                        dependents.setdefault(provider, []).append(cell)
+                        count += 1
+            waiting[cell] = count
+        ready = [cell for cell, count in waiting.items() if count == 0]
+        while ready:
+            cell = ready.pop()
+            del waiting[cell]
+            self._evaluate(cell)
+            for dependent in dependents.get(cell, ()):
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        for cell in waiting:  # left over: part of a cycle
+            cell.value, cell.error = None, "Circular reference"
+        return affected
+
+    def _evaluate(self, cell: Cell) -> None:
+        cell.value = None
+        if cell.compiled is None:
+            if not cell.blank and cell.error is None:
+                cell.error = "Invalid expression"
+            return
+        cell.error = None
+        if cell.name is not None and len(self._defs[cell.name]) > 1:
+            cell.error = f"Duplicate name: {cell.name}"
+            return
+        env = {}
+        for dep in cell.deps:
+            providers = self._defs.get(dep)
+            if not providers:
+                cell.error = f"Unknown name: {dep}"
+                return
+            if providers[0] is cell:
+                cell.error = "Circular reference"
+                return
+            if len(providers) > 1 or providers[0].error is not None:
+                cell.error = f"Error in {dep}"
+                return
+            env[dep] = providers[0].value
+        if estimate_bits(cell.compiled, env) > self.max_bits:
+            cell.error = "Too large"
+            return
+        self.evaluations += 1
+        try:
+            cell.value = cell.compiled(env)
+        except Exception as exc:
+            cell.error = type(exc).__name__
@@ -1,8 +1,19 @@
+import math
+import os
+from fractions import Fraction
+import threading
 import tkinter as tk
-from tkinter import ttk, Listbox
-from utils.safe_eval import SafeEvaluator
+from pathlib import Path
+from tkinter import ttk, filedialog
+from utils.batch_eval import TooManyValues, ValueRange, evaluate, summarize, write_csv
+from utils.eval_worker import EvalWorker
+from utils.live_preview import LivePreview
+from utils.safe_eval import MODES, SafeEvaluator, estimate_bits, split_binding
+from utils.ring_store import TRUNCATED, RingStore
+from utils.worksheet import Worksheet
 from utils.tooltip import ToolTip
 from core.config import CONFIG
+from widgets.calc.history_view import HistoryView
 
 
 class CalcTab:
@@ -10,14 +21,62 @@ class CalcTab:
 
     def __init__(self, root: tk.Misc) -> None:
         self.root = root
-        self.evaluator = SafeEvaluator()
+        numeric_cfg = CONFIG["calc"].get("numeric", {})
+        self.evaluator = SafeEvaluator(
+            mode=numeric_cfg.get("mode", "float"), precision=numeric_cfg.get("precision", 28)
+        )
+
+        # Cheap expressions are evaluated right away; expensive ones in a
+        # worker process that can be cancelled, hopeless ones not at all.
+        eval_cfg = CONFIG["calc"].get("eval", {})
+        self._inline_bits: float = eval_cfg.get("inline_bits", 65536)
+        self._max_bits: float = eval_cfg.get("max_bits", 32 * 1024 * 1024)
+        self.worker = EvalWorker(timeout=eval_cfg.get("timeout", 5.0))
+        self._pending_expr: str | None = None
+        self._pending_name: str | None = None
+
+        # ``name = expr`` in the input binds a name for later expressions;
+        # the worksheet has its own cells and names.
+        self.bindings: dict = {}
+        self.sheet = Worksheet(self.evaluator, max_bits=self._inline_bits)
+        # Redraw callbacks of the open Worksheet dialogs.
+        self._sheet_views: list = []
+
+        # History is kept on disk in a fixed-size ring buffer.
+        calc_cfg = CONFIG["calc"]
+        capacity = calc_cfg.get("max_history", 10000)
+        self.history_store = RingStore(
+            Path(__file__).resolve().parent / calc_cfg.get("history_file", "calc_history.bin"),
+            capacity,
+            calc_cfg.get("history_slot_bytes", 256),
+        )
+        self.history = HistoryView(capacity, on_pick=self._rerun)
+
+        # Live preview of the input; slow previews use their own worker so
+        # they never cancel a real calculation.
+        preview_cfg = calc_cfg.get("preview", {})
+        self._preview_enabled: bool = preview_cfg.get("enabled", True)
+        self._preview_delay: int = preview_cfg.get("delay_ms", 120)
+        self.preview = LivePreview(
+            self.evaluator,
+            budget_ms=preview_cfg.get("budget_ms", 10),
+            inline_bits=preview_cfg.get("inline_bits", 8192),
+            max_bits=self._max_bits,
+            cache_size=preview_cfg.get("cache_size", 512),
+            formatter=self._format,
+        )
+        self.preview_worker = EvalWorker(timeout=preview_cfg.get("timeout", 1.0))
+        self._preview_job: str | None = None
+        self._preview_key: tuple | None = None
 
         # Widgets initialized in build()
         self.outer_frame: ttk.Frame | None = None
         self.result_var = tk.StringVar(value="")
+        self.input_var = tk.StringVar(value="")
         self.result_entry: ttk.Entry | None = None
         self.input_entry: ttk.Entry | None = None
-        self.history_list: Listbox | None = None
+        self.cancel_btn: ttk.Button | None = None
+        self.mode_btn: ttk.Button | None = None
 
     def build(self, parent_notebook: ttk.Notebook) -> ttk.Frame:
         """Build the calculator UI and return the top-level frame."""
@@ -34,12 +93,15 @@ class CalcTab:
         self.result_entry.pack(fill="x")
         ToolTip(self.result_entry, "Calculation result (read-only)")
 
-        self.input_entry = ttk.Entry(top_frame)
+        self.input_entry = ttk.Entry(top_frame, textvariable=self.input_var)
         self.input_entry.pack(fill="x", pady=(4, 0))
-        ToolTip(self.input_entry, "Enter expression (e.g., 3 + 4 * 2)")
+        ToolTip(self.input_entry, "Enter expression (e.g., 3 + 4 * 2, or rate = 0.07)")
         self.input_entry.bind("<Return>", lambda e: self._calculate())
         self.input_entry.bind("<KP_Enter>", lambda e: self._calculate())
+        self.input_entry.bind("<Escape>", lambda e: self._cancel())
         self.input_entry.bind("<Button-1>", lambda e: self.input_entry.focus_set())
+        if self._preview_enabled:
+            self.input_var.trace_add("write", lambda *_: self._schedule_preview())
 
         # --- Middle: Button Grid ---
         btn_frame = ttk.Frame(self.outer_frame)
@@ -50,7 +112,8 @@ class CalcTab:
             ("4", 1, 0), ("5", 1, 1), ("6", 1, 2), ("*", 1, 3),
             ("1", 2, 0), ("2", 2, 1), ("3", 2, 2), ("-", 2, 3),
             ("0", 3, 0), (".", 3, 1), ("C", 3, 2), ("+", 3, 3),
-            ("(", 4, 0), (")", 4, 1), ("=", 4, 2),
+            ("(", 4, 0), (")", 4, 1), ("=", 4, 2), ("Stop", 4, 3),
+            ("x", 5, 0), ("Batch", 5, 1), ("Sheet", 5, 2), ("Mode", 5, 3),
         ]
 
         for (text, row, col) in buttons:
@@ -62,6 +125,21 @@ class CalcTab:
             elif text == "=":
                 btn.configure(command=self._calculate)
                 tip = "Calculate"
+            elif text == "Stop":
+                btn.configure(command=self._cancel, state="disabled")
+                tip = "Cancel a long calculation (Esc)"
+                self.cancel_btn = btn
+            elif text == "Batch":
+                btn.configure(command=self._open_batch)
+                tip = "Evaluate f(x) over a range of x"
+            elif text == "Sheet":
+                btn.configure(command=self._open_sheet)
+                tip = "Worksheet: one calculation per line, with names"
+            elif text == "Mode":
+                label = self._MODE_LABELS[self.evaluator.mode]
+                btn.configure(command=self._next_mode, text=label)
+                tip = "Arithmetic: Float, Dec(imal) or Frac(tion)"
+                self.mode_btn = btn
             else:
                 btn.configure(command=lambda t=text: self._insert(t))
                 tip = f"Insert '{text}'"
@@ -69,23 +147,48 @@ class CalcTab:
 
         for i in range(4):
             btn_frame.columnconfigure(i, weight=1)
-        for i in range(5):
+        for i in range(6):
             btn_frame.rowconfigure(i, weight=1)
 
         # --- Bottom: History ---
         history_frame = ttk.LabelFrame(self.outer_frame, text="History")
         history_frame.pack(fill="both", expand=False, padx=10, pady=(0, 8))
 
-        scrollbar = ttk.Scrollbar(history_frame, orient="vertical")
-        scrollbar.pack(side="right", fill="y")
-
-        self.history_list = Listbox(history_frame, height=6, yscrollcommand=scrollbar.set)
-        self.history_list.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=self.history_list.yview)
+        self.history.build(history_frame)
+        try:
+            self.history.set_entries(self.history_store.load())
+        except OSError:
+            pass  # start with an empty history
 
         return self.outer_frame
 
     # ------------------------------------------------------------------
+    _MODE_LABELS = {"float": "Float", "decimal": "Dec", "fraction": "Frac"}
+
+    def _next_mode(self) -> None:
+        mode = MODES[(MODES.index(self.evaluator.mode) + 1) % len(MODES)]
+        self.evaluator.set_mode(mode)
+        if self.mode_btn is not None:
+            self.mode_btn.configure(text=self._MODE_LABELS[mode])
+
+        # Names keep their values, in the new kind of number.
+        convert = self.evaluator.numeric.convert
+        bindings = {}
+        for name, value in self.bindings.items():
+            try:
+                bindings[name] = convert(value)
+            except (ArithmeticError, ValueError):
+                pass  # e.g. an infinite float has no exact value
+        self.bindings = bindings
+        lines = [cell.source for cell in self.sheet.cells]
+        self.sheet = Worksheet(self.evaluator, max_bits=self._inline_bits)
+        self.sheet.set_lines(lines)
+        for redraw in list(self._sheet_views):
+            redraw()
+        self.preview.clear()
+        if self._preview_enabled:
+            self._schedule_preview()
+
     def _insert(self, text: str) -> None:
         if self.input_entry is not None:
             self.input_entry.insert(tk.END, text)
@@ -98,16 +201,354 @@ class CalcTab:
     def _calculate(self) -> None:
         if self.input_entry is None:
             return
-        expr = self.input_entry.get().strip()
-        if not expr:
+        source = self.input_entry.get().strip()
+        if not source:
+            return
+        name, expr = split_binding(source)
+        try:
+            compiled = self.evaluator.compile(expr)
+        except Exception:
+            self.result_var.set("Error")
+            return
+
+        bits = estimate_bits(compiled, self.bindings)
+        if bits > self._max_bits:
+            self.result_var.set("Too large")
+            return
+        if bits > self._inline_bits:
+            self._start_background(source, name, expr)
             return
         try:
-            result = self.evaluator.eval(expr)
-            self.result_var.set(str(result))
-            if self.history_list is not None:
-                self.history_list.insert(tk.END, f"{expr} = {result}")
-                if self.history_list.size() > CONFIG["calc"]["max_history"]:
-                    self.history_list.delete(0)
-                self.history_list.yview_moveto(1.0)
+            result = compiled(self.bindings)
         except Exception:
             self.result_var.set("Error")
+            return
+        self._show_result(source, result, name)
+
+    def _show_result(self, expr: str, result, name: str | None = None) -> None:
+        if name is not None:
+            self.bindings[name] = result
+        text = self._format(result)
+        self.result_var.set(text)
+        entry = f"{expr} = {text}"
+        self.history.append(entry)
+        # Shorten a long result rather than let the store cut the
+        # expression, so the entry can still be re-run after a restart.
+        room = self.history_store.record_bytes - len(f"{expr} = ...".encode("utf-8"))
+        if len(entry.encode("utf-8")) > self.history_store.record_bytes and room > 0:
+            entry = f"{expr} = {text.encode('utf-8')[:room].decode('utf-8', 'ignore')}..."
+        try:
+            self.history_store.append(entry)
+        except OSError:
+            pass  # the in-memory history still has it
+
+    def _rerun(self, entry: str) -> None:
+        """Calculate a history entry's expression again."""
+        if self.input_entry is None:
+            return
+        if entry.endswith(TRUNCATED):
+            # Cut by the history store: the expression may be incomplete.
+            self.result_var.set("Truncated, cannot re-run")
+            return
+        self.input_entry.delete(0, tk.END)
+        self.input_entry.insert(0, entry.rsplit(" = ", 1)[0])
+        self._calculate()
+
+    @staticmethod
+    def _format(result) -> str:
+        # Python refuses to print ints of more than ~4300 digits.
+        if isinstance(result, int) and result.bit_length() > 14000:
+            exponent = math.log10(abs(result))
+            sign = "-" if result < 0 else ""
+            return f"{sign}{10 ** (exponent % 1):.6f}e+{int(exponent)}"
+        if isinstance(result, Fraction) and max(
+            result.numerator.bit_length(), result.denominator.bit_length()
+        ) > 14000:
+            exponent = math.log10(abs(result.numerator)) - math.log10(result.denominator)
+            sign = "-" if result < 0 else ""
+            return f"≈{sign}{10 ** (exponent % 1):.6f}e{math.floor(exponent):+d}"
+        return str(result)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Stop the evaluation processes (called when the app closes)."""
+        self.worker.close()
+        self.preview_worker.close()
+        self.history_store.close()
+
+    def _start_background(self, source: str, name: str | None, expr: str) -> None:
+        self.worker.submit(
+            expr, dict(self.bindings), self.evaluator.mode, self.evaluator.precision
+        )
+        self._pending_expr = source
+        self._pending_name = name
+        self.result_var.set("computing…")
+        if self.cancel_btn is not None:
+            self.cancel_btn.configure(state="normal")
+        self.root.after(20, self._poll_worker)
+
+    def _poll_worker(self) -> None:
+        """Pick up the background result on the Tk thread."""
+        if self._pending_expr is None:
+            return  # cancelled
+        outcome = self.worker.poll()
+        if outcome is None:
+            self.root.after(20, self._poll_worker)
+            return
+
+        expr, self._pending_expr = self._pending_expr, None
+        if self.cancel_btn is not None:
+            self.cancel_btn.configure(state="disabled")
+        status, value = outcome
+        if status == "ok":
+            self._show_result(expr, value, self._pending_name)
+        elif status == "timeout":
+            self.result_var.set("Timed out")
+        else:
+            self.result_var.set("Error")
+
+    def _cancel(self) -> None:
+        if self._pending_expr is None:
+            return
+        self.worker.cancel()
+        self._pending_expr = None
+        self.result_var.set("Cancelled")
+        if self.cancel_btn is not None:
+            self.cancel_btn.configure(state="disabled")
+
+    # ------------------------------------------------------------------
+    def _schedule_preview(self) -> None:
+        """Debounce: preview once typing pauses for ``preview.delay_ms``."""
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self._preview_job = self.root.after(self._preview_delay, self._preview)
+
+    def _preview(self) -> None:
+        self._preview_job = None
+        if self._pending_expr is not None:
+            return  # the result field shows a running calculation
+        self.preview_worker.cancel()
+        self._preview_key = None
+        status, value = self.preview.lookup(self.input_var.get(), self.bindings)
+        if status == "slow":
+            self._preview_key = value
+            self.preview_worker.submit(
+                value[0], dict(self.bindings), self.evaluator.mode, self.evaluator.precision
+            )
+            self.root.after(20, self._poll_preview)
+            return
+        self._show_preview(status, value)
+
+    def _poll_preview(self) -> None:
+        if self._preview_key is None:
+            return  # superseded by newer input
+        outcome = self.preview_worker.poll()
+        if outcome is None:
+            self.root.after(20, self._poll_preview)
+            return
+        key, self._preview_key = self._preview_key, None
+        if self._pending_expr is None:
+            self._show_preview(*self.preview.store(key, *outcome))
+
+    def _show_preview(self, status: str, value) -> None:
+        if status == "ok":
+            self.result_var.set(value)
+        elif status == "too large":
+            self.result_var.set("Too large")
+        else:
+            self.result_var.set("")
+
+    # ------------------------------------------------------------------
+    def _in_background(self, work, done) -> None:
+        """Run ``work()`` on a thread and ``done(result, error)`` on Tk's."""
+        outcome: list = []
+
+        def _run() -> None:
+            try:
+                outcome.append((work(), None))
+            except Exception as exc:
+                outcome.append((None, exc))
+
+        def _poll() -> None:
+            if outcome:
+                done(*outcome[0])
+            else:
+                self.root.after(50, _poll)
+
+        threading.Thread(target=_run, name="calc-batch", daemon=True).start()
+        self.root.after(50, _poll)
+
+    def _open_batch(self) -> None:
+        """Dialog evaluating ``f(x)`` over a range of ``x``.
+
+        Only summary statistics are shown; the full table goes to a CSV file.
+        """
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Batch")
+        dialog.transient(self.root)
+        frame = ttk.Frame(dialog, padding=8)
+        frame.pack(fill="both", expand=True)
+
+        expr_var = tk.StringVar(value=self.input_entry.get() if self.input_entry else "")
+        range_vars = [tk.StringVar(value=v) for v in ("1", "100", "1")]
+        summary_var = tk.StringVar(value="")
+        batch: dict = {}
+
+        ttk.Label(frame, text="f(x) =").grid(row=0, column=0, sticky="w")
+        expr_entry = ttk.Entry(frame, textvariable=expr_var)
+        expr_entry.grid(row=0, column=1, columnspan=5, sticky="ew", pady=(0, 4))
+        for col, (label, var) in enumerate(zip(("x from", "to", "step"), range_vars)):
+            ttk.Label(frame, text=label).grid(row=1, column=col * 2, sticky="w")
+            ttk.Entry(frame, textvariable=var, width=8).grid(row=1, column=col * 2 + 1, padx=2)
+
+        run_btn = ttk.Button(frame, text="Run")
+        run_btn.grid(row=2, column=0, columnspan=3, sticky="ew", pady=4)
+        csv_btn = ttk.Button(frame, text="Save CSV...", state="disabled")
+        csv_btn.grid(row=2, column=3, columnspan=3, sticky="ew", pady=4)
+        ToolTip(csv_btn, "Write every x and f(x) to a CSV file")
+        ttk.Label(frame, textvariable=summary_var, justify="left").grid(
+            row=3, column=0, columnspan=6, sticky="w"
+        )
+        frame.columnconfigure(1, weight=1)
+
+        def _finished(result, error) -> None:
+            if not dialog.winfo_exists():
+                return
+            run_btn.configure(state="normal")
+            if error is not None:
+                summary_var.set("Error")
+                return
+            values, results, summary = result
+            batch.update(values=values, results=results, summary=str(summary))
+            summary_var.set(str(summary))
+            csv_btn.configure(state="normal")
+
+        def _run() -> None:
+            try:
+                compiled = self.evaluator.compile(expr_var.get().strip(), mode="float")
+            except ValueError:
+                summary_var.set("Bad expression")
+                return
+            try:
+                values = ValueRange.parse(*(var.get().strip() for var in range_vars))
+            except TooManyValues as exc:
+                summary_var.set(str(exc))
+                return
+            except ValueError:
+                summary_var.set("Bad range")
+                return
+            if not len(values):
+                summary_var.set("Empty range")
+                return
+            biggest = max(abs(values[0]), abs(values[-1]))
+            if estimate_bits(compiled, {"x": biggest}) > self._inline_bits:
+                summary_var.set("Too large")
+                return
+
+            def _work():
+                results = evaluate(compiled, values)
+                return values, results, summarize(results)
+
+            batch.clear()
+            csv_btn.configure(state="disabled")
+            run_btn.configure(state="disabled")
+            summary_var.set("computing…")
+            self._in_background(_work, _finished)
+
+        def _save() -> None:
+            path = filedialog.asksaveasfilename(
+                parent=dialog, defaultextension=".csv", filetypes=[("CSV", "*.csv")]
+            )
+            if not path or not batch:
+                return
+
+            def _saved(result, error) -> None:
+                if dialog.winfo_exists():
+                    csv_btn.configure(state="normal")
+                    note = "Save failed" if error else f"Saved {os.path.basename(path)}"
+                    summary_var.set(f"{batch['summary']}\n{note}")
+
+            csv_btn.configure(state="disabled")
+            self._in_background(
+                lambda: write_csv(path, batch["values"], batch["results"]), _saved
+            )
+
+        run_btn.configure(command=_run)
+        csv_btn.configure(command=_save)
+        expr_entry.bind("<Return>", lambda e: _run())
+        expr_entry.focus_set()
+
+    # ------------------------------------------------------------------
+    def _open_sheet(self) -> None:
+        """Worksheet dialog: cells on the left, their results on the right.
+
+        Only the cells affected by an edit are re-evaluated and redrawn.
+        """
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Worksheet")
+        dialog.transient(self.root)
+
+        scrollbar = ttk.Scrollbar(dialog, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        results = tk.Text(dialog, width=16, height=16, wrap="none", takefocus=0)
+        cells = tk.Text(dialog, width=26, height=16, wrap="none", undo=True)
+        cells.pack(side="left", fill="both", expand=True)
+        results.pack(side="left", fill="y")
+        ToolTip(cells, "One calculation per line; name = expr defines a name")
+
+        def _scroll(*args) -> None:
+            cells.yview(*args)
+            results.yview(*args)
+
+        def _cells_scrolled(first: str, last: str) -> None:
+            scrollbar.set(first, last)
+            results.yview_moveto(first)
+
+        scrollbar.configure(command=_scroll)
+        cells.configure(yscrollcommand=_cells_scrolled)
+
+        def _display(index: int) -> str:
+            cell = self.sheet.cells[index]
+            if cell.error is not None:
+                return cell.error
+            return "" if cell.value is None else self._format(cell.value)
+
+        def _refresh(full: bool = False) -> None:
+            if not dialog.winfo_exists():
+                if _redraw in self._sheet_views:
+                    self._sheet_views.remove(_redraw)
+                return
+            changed = self.sheet.set_lines(cells.get("1.0", "end - 1 chars").split("\n"))
+            results.configure(state="normal")
+            lines_shown = int(results.index("end - 1 chars").split(".")[0])
+            if full or lines_shown != len(self.sheet.cells):
+                lines = (_display(i) for i in range(len(self.sheet.cells)))
+                results.delete("1.0", tk.END)
+                results.insert("1.0", "\n".join(lines))
+            else:
+                for i in changed:
+                    results.delete(f"{i + 1}.0", f"{i + 1}.end")
+                    results.insert(f"{i + 1}.0", _display(i))
+            results.configure(state="disabled")
+            results.yview_moveto(cells.yview()[0])
+
+        def _redraw() -> None:
+            # Every result, e.g. after the numeric mode changed.
+            _refresh(full=True)
+
+        self._sheet_views.append(_redraw)
+        pending: list[str] = []
+
+        def _on_modified(event: tk.Event) -> None:
+            if not cells.edit_modified():
+                return
+            cells.edit_modified(False)
+            if pending:
+                self.root.after_cancel(pending.pop())
+            pending.append(self.root.after(150, lambda: (pending.clear(), _refresh())))
+
+        cells.insert("1.0", "\n".join(cell.source for cell in self.sheet.cells))
+        cells.edit_modified(False)
+        cells.bind("<<Modified>>", _on_modified)
+        _refresh()
+        cells.focus_set()
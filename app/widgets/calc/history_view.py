@@ -0,0 +1,163 @@
+"""Calculator history list: virtualized and filtered by prefix.
+
+The Listbox only ever holds the handful of rows that are on screen; the
+scrollbar is driven by hand from the position in the (possibly filtered)
+history, so a history of 100k entries costs as much to show as one of ten.
+
+Typing in the filter narrows the previous matches when the prefix grows and
+rescans otherwise.  Matches are kept as absolute entry numbers, so entries
+dropping off the front of a full history do not invalidate them.
+"""
+
+from __future__ import annotations
+
+import bisect
+import tkinter as tk
+from collections.abc import Callable
+from tkinter import ttk
+
+from utils.tooltip import ToolTip
+
+
+class HistoryView:
+    """Filter entry plus a virtualized list of ``expr = result`` entries."""
+
+    def __init__(
+        self, capacity: int, rows: int = 4, on_pick: Callable[[str], None] | None = None
+    ) -> None:
+        self.capacity = max(capacity, 1)
+        self.rows = rows
+        self.on_pick = on_pick
+
+        # Entry number n lives at self._entries[n - self._base]; numbers
+        # below self._first have been pushed out by newer entries.
+        self._entries: list[str] = []
+        self._base = 0
+        self._first = 0
+        self._query = ""
+        self._matches: list[int] | None = None  # None: no filter
+        self._top = 0
+
+        # Widgets initialized in build()
+        self.filter_var: tk.StringVar | None = None
+        self.listbox: tk.Listbox | None = None
+        self.scrollbar: ttk.Scrollbar | None = None
+
+    def build(self, parent: tk.Misc) -> None:
+        self.filter_var = tk.StringVar(value=self._query)
+        filter_entry = ttk.Entry(parent, textvariable=self.filter_var)
+        filter_entry.pack(side="top", fill="x", pady=(0, 2))
+        ToolTip(filter_entry, "Filter history by prefix")
+        self.filter_var.trace_add("write", lambda *_: self.set_filter(self.filter_var.get()))
+
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(parent, height=self.rows, activestyle="none")
+        self.listbox.pack(side="left", fill="both", expand=True)
+        ToolTip(self.listbox, "Click an entry to calculate it again")
+
+        self.listbox.bind("<ButtonRelease-1>", self._on_click)
+        self.listbox.bind("<MouseWheel>", lambda e: self._wheel(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self._wheel(-1))
+        self.listbox.bind("<Button-5>", lambda e: self._wheel(1))
+        self._render()
+
+    # ------------------------------------------------------------------
+    def set_entries(self, entries: list[str]) -> None:
+        """Replace the whole history (used once, after loading it)."""
+        self._entries = list(entries[-self.capacity :])
+        self._base = self._first = 0
+        self._matches = None
+        self.set_filter(self._query, force=True)
+
+    def append(self, entry: str) -> None:
+        at_bottom = self._top >= self._max_top()
+        number = self._base + len(self._entries)
+        self._entries.append(entry)
+        if number - self._first >= self.capacity:
+            self._evict()
+        if self._matches is not None and entry.startswith(self._query):
+            self._matches.append(number)
+        if at_bottom:
+            self._top = self._max_top()
+        self._render()
+
+    def entries(self) -> list[str]:
+        return self._entries[self._first - self._base :]
+
+    def set_filter(self, query: str, force: bool = False) -> None:
+        query = query.strip()
+        if query == self._query and not force:
+            return
+        if not query:
+            self._matches = None
+        elif self._matches is not None and query.startswith(self._query) and not force:
+            # The prefix grew: only the previous matches can still match.
+            entries, base = self._entries, self._base
+            self._matches = [n for n in self._matches if entries[n - base].startswith(query)]
+        else:
+            offset = self._first - self._base
+            self._matches = [
+                self._first + i
+                for i, entry in enumerate(self._entries[offset:])
+                if entry.startswith(query)
+            ]
+        self._query = query
+        self._top = self._max_top()
+        self._render()
+
+    # ------------------------------------------------------------------
+    def _evict(self) -> None:
+        self._first += 1
+        if self._matches and self._matches[0] < self._first:
+            del self._matches[: bisect.bisect_left(self._matches, self._first)]
+        # Drop the hidden entries in bulk rather than one per append.
+        if self._first - self._base >= self.capacity:
+            del self._entries[: self._first - self._base]
+            self._base = self._first
+
+    def _size(self) -> int:
+        if self._matches is not None:
+            return len(self._matches)
+        return self._base + len(self._entries) - self._first
+
+    def _entry(self, index: int) -> str:
+        number = self._matches[index] if self._matches is not None else self._first + index
+        return self._entries[number - self._base]
+
+    def _max_top(self) -> int:
+        return max(self._size() - self.rows, 0)
+
+    def _render(self) -> None:
+        if self.listbox is None:
+            return
+        size = self._size()
+        self._top = min(max(self._top, 0), self._max_top())
+        end = min(self._top + self.rows, size)
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *(self._entry(i) for i in range(self._top, end)))
+        if size:
+            self.scrollbar.set(self._top / size, end / size)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            self._top = round(float(amount) * self._size())
+        else:
+            step = self.rows if unit == "pages" else 1
+            self._top += int(amount) * step
+        self._render()
+
+    def _wheel(self, direction: int) -> str:
+        self._top += direction
+        self._render()
+        return "break"
+
+    def _on_click(self, event: tk.Event) -> None:
+        if self.listbox is None or not self._size():
+            return
+        row = self.listbox.nearest(event.y)
+        index = self._top + row
+        if self.on_pick is not None and 0 <= row and index < self._size():
+            self.on_pick(self._entry(index))
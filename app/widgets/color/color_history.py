@@ -0,0 +1,164 @@
+"""History of picked colors: a compact store and a virtualized swatch list.
+
+:class:`ColorHistory` keeps colors as packed ``0xRRGGBB`` ints in an
+``array('I')`` (4 bytes each), most recent last.  Picking a color that is
+already there moves it to the end instead of adding a duplicate, and the
+oldest colors drop out beyond ``capacity``.  On disk it is the same array,
+little-endian, written atomically after every change.
+
+:class:`SwatchList` draws the history on a canvas with a fixed pool of
+row items, enough to fill the visible height; scrolling re-colors and
+re-labels those rows instead of creating widgets per entry.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+import tkinter as tk
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+from tkinter import ttk
+
+from widgets.notes.notes_store import atomic_write_bytes
+
+
+class ColorHistory:
+    """Deduplicated, LRU-capped list of colors, persisted to ``path``."""
+
+    def __init__(self, path: Path | None, capacity: int = 1000) -> None:
+        self.path = Path(path) if path is not None else None
+        self.capacity = max(capacity, 1)
+        self.colors = array("I")
+        self._known: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def recent(self, index: int) -> int:
+        """The ``index``-th most recent color."""
+        return self.colors[-1 - index]
+
+    def load(self) -> None:
+        colors = array("I")
+        if self.path is not None:
+            try:
+                data = self.path.read_bytes()
+            except OSError:
+                data = b""
+            colors.frombytes(data[: len(data) // colors.itemsize * colors.itemsize])
+            if sys.byteorder != "little":
+                colors.byteswap()
+        # Keep the newest occurrence of each valid color.
+        kept: list[int] = []
+        seen: set[int] = set()
+        for color in reversed(colors):
+            if color <= 0xFFFFFF and color not in seen:
+                seen.add(color)
+                kept.append(color)
+        self.colors = array("I", reversed(kept[: self.capacity]))
+        self._known = set(self.colors)
+
+    def add(self, color: int) -> None:
+        """Make ``color`` the most recent one and save."""
+        if self.colors and self.colors[-1] == color:
+            return
+        if color in self._known:
+            self.colors.remove(color)
+        else:
+            self._known.add(color)
+            if len(self.colors) >= self.capacity:
+                self._known.discard(self.colors.pop(0))
+        self.colors.append(color)
+        self.save()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        colors = self.colors
+        if sys.byteorder != "little":
+            colors = array("I", colors)
+            colors.byteswap()
+        try:
+            atomic_write_bytes(self.path, colors.tobytes())
+        except OSError:
+            pass  # history is a convenience; keep working without it
+
+
+class SwatchList:
+    """Canvas list of a :class:`ColorHistory`, newest first."""
+
+    ROW = 20
+
+    def __init__(self, history: ColorHistory, on_pick: Callable[[str], None]) -> None:
+        self.history = history
+        self.on_pick = on_pick
+        self._top = 0
+        self._rows: list[tuple[int, int]] = []  # (swatch, label) item ids
+
+        # Widgets initialized in build()
+        self.canvas: tk.Canvas | None = None
+        self.scrollbar: ttk.Scrollbar | None = None
+
+    def build(self, parent: tk.Misc) -> None:
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas = tk.Canvas(parent, height=self.ROW * 4, highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<ButtonRelease-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._wheel(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._wheel(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._wheel(1))
+
+    # ------------------------------------------------------------------
+    def refresh(self) -> None:
+        """Redraw the visible rows (after a resize, scroll or new color)."""
+        if self.canvas is None:
+            return
+        height = max(self.canvas.winfo_height(), self.ROW)
+        visible = math.ceil(height / self.ROW)  # rows at least partly shown
+        full = height // self.ROW
+        while len(self._rows) < visible:
+            y = len(self._rows) * self.ROW
+            swatch = self.canvas.create_rectangle(
+                4, y + 3, 40, y + self.ROW - 3, outline="#808080"
+            )
+            label = self.canvas.create_text(48, y + self.ROW // 2, anchor="w", font="TkFixedFont")
+            self._rows.append((swatch, label))
+
+        count = len(self.history)
+        self._top = min(max(self._top, 0), max(count - full, 0))
+        for slot, (swatch, label) in enumerate(self._rows):
+            index = self._top + slot
+            if index < count:
+                hex_color = f"#{self.history.recent(index):06x}"
+                self.canvas.itemconfigure(swatch, fill=hex_color, state="normal")
+                self.canvas.itemconfigure(label, text=hex_color, state="normal")
+            else:
+                self.canvas.itemconfigure(swatch, state="hidden")
+                self.canvas.itemconfigure(label, state="hidden")
+        if count:
+            end = min(self._top + full, count)
+            self.scrollbar.set(self._top / count, end / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            self._top = round(float(amount) * len(self.history))
+        else:
+            step = self.canvas.winfo_height() // self.ROW if unit == "pages" else 1
+            self._top += int(amount) * max(step, 1)
+        self.refresh()
+
+    def _wheel(self, direction: int) -> str:
+        self._top += direction
+        self.refresh()
+        return "break"
+
+    def _on_click(self, event: tk.Event) -> None:
+        index = self._top + event.y // self.ROW
+        if 0 <= index < len(self.history):
+            self.on_pick(f"#{self.history.recent(index):06x}")
@@ -9,13 +9,22 @@ within this class and all widget references live on the instance.
 
 from __future__ import annotations
 
+import ctypes.util
 import subprocess
 import sys
 import shutil
 import tkinter as tk
+from pathlib import Path
 from tkinter import ttk, colorchooser, messagebox
 
+from core.config import CONFIG, CONFIG_PATH
+from utils.color_match import Palette, css_palette, x11_palette
+from utils.color_space import SPACES, format_color, from_rgb, parse_color
 from utils.tooltip import ToolTip
+from widgets.color.color_history import ColorHistory, SwatchList
+from widgets.color.eyedropper import Eyedropper
+from widgets.color.image_palette import ImagePalette
+from widgets.color.x11_screen import X11Screen
 
 
 class ColorTab:
@@ -28,7 +37,35 @@ class ColorTab:
         self.outer_frame: ttk.Frame | None = None
         self.hex_var = tk.StringVar()
         self.color_entry: ttk.Entry | None = None
-        self.swatch: tk.Frame | None = None
+        self.swatch: tk.Label | None = None
+        self.notations_var = tk.StringVar()
+
+        # X display connection for screen picking, opened on first use;
+        # False once opening it failed (then xcolor is used).
+        self._screen: X11Screen | bool | None = None
+        self._eyedropper: Eyedropper | None = None
+
+        # Previously picked colors, newest first.
+        history_cfg = CONFIG["color"].get("history", {})
+        self.history = ColorHistory(
+            Path(__file__).resolve().parent / history_cfg.get("file", "color_history.bin"),
+            history_cfg.get("capacity", 1000),
+        )
+        self.swatches = SwatchList(self.history, self._update_color)
+
+        # Named colors and an optional palette of our own, loaded on first use.
+        self.match_var = tk.StringVar(value="Hex copied to clipboard")
+        self._palettes: list[Palette] | None = None
+
+        # Dominant colors of an image file.
+        palette_cfg = CONFIG["color"].get("image_palette", {})
+        self.image_palette = ImagePalette(
+            root,
+            self._update_color,
+            palette_cfg.get("count", 8),
+            palette_cfg.get("method", "median-cut"),
+            palette_cfg.get("max_pixels", 262144),
+        )
 
     # ------------------------------------------------------------------
     def build(self, parent_notebook: ttk.Notebook) -> ttk.Frame:
@@ -36,43 +73,82 @@ class ColorTab:
 
         self.outer_frame = ttk.Frame(parent_notebook)
 
-        # --- Color Picker Button ---
-        pick_btn = ttk.Button(
-            self.outer_frame, text="Pick Color", command=self._pick_color
-        )
-        pick_btn.pack(pady=5, padx=10, fill="x")
+        # --- Color Picker Buttons ---
+        pick_frame = ttk.Frame(self.outer_frame)
+        pick_frame.pack(pady=5, padx=10, fill="x")
+        pick_btn = ttk.Button(pick_frame, text="Pick Color", command=self._pick_color)
+        pick_btn.pack(side="left", fill="x", expand=True)
         ToolTip(pick_btn, "Open a color chooser dialog")
 
-        # --- Screen Color Picker Button ---
+        image_btn = ttk.Button(pick_frame, text="From Image...", command=self.image_palette.show)
+        image_btn.pack(side="left", fill="x", expand=True, padx=(4, 0))
+        ToolTip(image_btn, "Dominant colors of a PNG, GIF or PPM image")
+
+        # --- Screen Color Picker Buttons ---
+        screen_frame = ttk.Frame(self.outer_frame)
+        screen_frame.pack(pady=5, padx=10, fill="x")
+        linux = sys.platform.startswith("linux")
+        native = linux and ctypes.util.find_library("X11") is not None
+
         pick_screen_btn = ttk.Button(
-            self.outer_frame, text="Pick Screen Pixel", command=self._pick_screen_color
+            screen_frame, text="Pick Screen Pixel", command=self._pick_screen_color
         )
-        if not sys.platform.startswith("linux") or shutil.which("xcolor") is None:
+        if not (native or linux and shutil.which("xcolor")):
             pick_screen_btn.configure(state="disabled")
-        pick_screen_btn.pack(pady=5, padx=10, fill="x")
-        ToolTip(pick_screen_btn, "Pick color from screen (Linux only with xcolor)")
+        pick_screen_btn.pack(side="left", fill="x", expand=True)
+        ToolTip(pick_screen_btn, "Click anywhere on screen to pick its color (Linux/X11)")
+
+        eyedropper_btn = ttk.Button(
+            screen_frame, text="Eyedropper", command=self._start_eyedropper
+        )
+        if not native:
+            eyedropper_btn.configure(state="disabled")
+        eyedropper_btn.pack(side="left", fill="x", expand=True, padx=(4, 0))
+        ToolTip(eyedropper_btn, "Pick with a live magnifier (X11)")
 
-        # --- Color Hex Entry (readonly) ---
+        # --- Color Entry: hex value, or type any notation + Enter ---
         self.color_entry = ttk.Entry(
             self.outer_frame,
             textvariable=self.hex_var,
-            state="readonly",
             justify="center",
         )
         self.color_entry.pack(pady=5, padx=10, fill="x")
-        ToolTip(self.color_entry, "Hex color value (auto copied to clipboard)")
+        self.color_entry.bind("<Return>", lambda e: self._enter_color())
+        ToolTip(
+            self.color_entry,
+            "Hex color value (auto copied to clipboard); "
+            "type rgb(), hsl(), hsv(), lab() or oklch() and press Enter",
+        )
 
-        # --- Color Swatch Panel ---
-        self.swatch = tk.Frame(
-            self.outer_frame, height=30, bg="#ffffff", relief="sunken", borderwidth=1
+        # --- Color Swatch Panel, listing the color in the other notations ---
+        self.swatch = tk.Label(
+            self.outer_frame,
+            textvariable=self.notations_var,
+            bg="#ffffff",
+            relief="sunken",
+            borderwidth=1,
+            height=len(SPACES) - 1,
+            justify="left",
+            anchor="w",
+            font=("TkFixedFont", 8),
         )
         self.swatch.pack(pady=5, padx=10, fill="x")
 
         # Trace changes to update swatch colour
         self.hex_var.trace_add("write", lambda *_: self._update_swatch())
 
-        # --- Label ---
-        ttk.Label(self.outer_frame, text="Hex copied to clipboard").pack(pady=5)
+        # --- Label: clipboard note, then the closest named colors ---
+        match_label = ttk.Label(self.outer_frame, textvariable=self.match_var)
+        match_label.pack(pady=5)
+        ToolTip(match_label, "Closest named color (and palette color), by Lab distance")
+
+        # --- History ---
+        history_frame = ttk.LabelFrame(self.outer_frame, text="History")
+        history_frame.pack(fill="both", expand=True, padx=10, pady=(0, 8))
+        self.swatches.build(history_frame)
+        ToolTip(self.swatches.canvas, "Click a color to use it again")
+        self.history.load()
+        self.swatches.refresh()
 
         return self.outer_frame
 
@@ -82,12 +158,67 @@ class ColorTab:
         if color and color[1]:
             self._update_color(color[1])
 
+    # ------------------------------------------------------------------
+    def _open_screen(self) -> X11Screen | None:
+        if self._screen is None:
+            try:
+                self._screen = X11Screen()
+            except OSError:
+                self._screen = False
+        return self._screen or None
+
+    def close(self) -> None:
+        """Release the X display connection (called when the app closes)."""
+        if self._eyedropper is not None:
+            self._eyedropper.stop()
+        if self._screen:
+            self._screen.close()
+        self._screen = None
+
+    def _start_eyedropper(self) -> None:
+        screen = self._open_screen()
+        if screen is None:
+            messagebox.showerror("Error", "The eyedropper needs an X11 display")
+            return
+        if self._eyedropper is None:
+            self._eyedropper = Eyedropper(self.root, screen, self._update_color)
+        self._eyedropper.start()
+
     # ------------------------------------------------------------------
     def _pick_screen_color(self) -> None:
-        # Hide window before picking
+        screen = self._open_screen()
+        if screen is not None and not screen.picking and screen.start_pick():
+            # Woken by the X connection itself: no sleep, no polling.
+            self.root.tk.createfilehandler(
+                screen.fileno(), tk.READABLE, lambda *_: self._poll_screen_pick()
+            )
+            self._poll_screen_pick()  # the click may already be queued
+            return
+        if shutil.which("xcolor") is None:
+            messagebox.showerror("Error", "Screen picking needs an X11 display or xcolor")
+            return
+        # Fallback: hide window before picking with xcolor
         self.root.withdraw()
         self.root.after(300, self._run_xcolor)
 
+    def _poll_screen_pick(self) -> None:
+        screen = self._screen
+        if not screen:
+            return
+        try:
+            outcome = screen.poll_pick()
+        except OSError as e:  # pragma: no cover - GUI path
+            screen.cancel_pick()
+            outcome = ("error", e)
+        if outcome is None:
+            return
+        self.root.tk.deletefilehandler(screen.fileno())
+        status, value = outcome
+        if status == "picked":
+            self._update_color(f"#{value:06x}")
+        elif status == "error":
+            messagebox.showerror("Error", f"Screen picking failed: {value}")
+
     # ------------------------------------------------------------------
     def _run_xcolor(self) -> None:
         try:
@@ -106,18 +237,62 @@ class ColorTab:
     def _update_swatch(self) -> None:
         if self.swatch is None:
             return
-        value = self.hex_var.get().strip()
-        if value.startswith("#") and len(value) == 7:
-            try:
-                self.swatch.configure(bg=value)
-            except tk.TclError:
-                self.swatch.configure(bg="#ffffff")
-        else:
-            self.swatch.configure(bg="#ffffff")
+        try:
+            rgb = parse_color(self.hex_var.get())
+        except ValueError:
+            self.swatch.configure(bg="#ffffff", fg="#000000")
+            self.notations_var.set("")
+            return
+        light = from_rgb(rgb, "oklch")[0] > 0.6
+        self.swatch.configure(bg=f"#{rgb:06x}", fg="#000000" if light else "#ffffff")
+        self.notations_var.set("\n".join(format_color(rgb, space) for space in SPACES[1:]))
+
+    def _enter_color(self) -> None:
+        try:
+            rgb = parse_color(self.hex_var.get())
+        except ValueError:
+            self.root.bell()
+            return
+        self._update_color(f"#{rgb:06x}")
+
+    # ------------------------------------------------------------------
+    def _load_palettes(self) -> list[Palette]:
+        if self._palettes is None:
+            match_cfg = CONFIG["color"].get("match", {})
+            named = x11_palette() if match_cfg.get("named") == "x11" else None
+            self._palettes = [named or css_palette()]
+            palette_file = match_cfg.get("palette_file")
+            if palette_file:
+                # Relative to config.json (an absolute path is kept as is)
+                path = CONFIG_PATH.parent / Path(palette_file).expanduser()
+                try:
+                    self._palettes.append(Palette.from_file(path))
+                except (OSError, ValueError) as e:
+                    messagebox.showerror("Error", f"Cannot load palette {path}: {e}")
+        return self._palettes
+
+    def _describe_match(self, rgb: int) -> str:
+        parts = []
+        for palette in self._load_palettes():
+            match = palette.nearest(rgb)
+            if match is None:
+                continue
+            name, color, _distance = match
+            exact = "=" if color == rgb else "≈"
+            parts.append(f"{exact} {name}" if not parts else f"{palette.name}: {name}")
+        return "Copied · " + " · ".join(parts) if parts else "Hex copied to clipboard"
 
     # ------------------------------------------------------------------
     def _update_color(self, value: str) -> None:
         self.hex_var.set(value)
+        try:
+            rgb = int(value.lstrip("#"), 16)
+        except ValueError:
+            pass
+        else:
+            self.history.add(rgb)
+            self.swatches.refresh()
+            self.match_var.set(self._describe_match(rgb))
         try:
             self.root.clipboard_clear()
             self.root.clipboard_append(value)
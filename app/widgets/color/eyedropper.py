@@ -0,0 +1,128 @@
+"""Eyedropper: a live magnified view of the pixels around the pointer.
+
+While active, the pointer is grabbed (see :meth:`X11Screen.start_pick`) and
+a small window shows the ``grid`` x ``grid`` pixels around it, enlarged,
+with the hex value of the centre pixel.  Clicking picks that colour; Esc or
+another button cancels.
+
+Each frame reads the pointer position once and captures only the ``grid``
+x ``grid`` pixels around it, so any number of pointer motions between two
+frames collapse into one update, and the next frame is only scheduled once
+the current one is drawn: the loop cannot fall behind the pointer.  The
+pixels go into one preallocated ``grid`` x ``grid`` image, which Tk scales
+into a second preallocated image (``copy -zoom``); no image is created per
+frame.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+from collections.abc import Callable
+from tkinter import ttk
+
+from widgets.color.x11_screen import X11Screen
+
+
+class Eyedropper:
+    """Magnifier window following the pointer until a click or Esc."""
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        screen: X11Screen,
+        on_pick: Callable[[str], None],
+        grid: int = 11,
+        zoom: int = 8,
+        interval_ms: int = 16,
+    ) -> None:
+        self.root = root
+        self.screen = screen
+        self.on_pick = on_pick
+        self.grid = grid | 1  # odd, so there is a centre pixel
+        self.zoom = zoom
+        self.interval_ms = interval_ms
+        self.frames = 0
+
+        self._window: tk.Toplevel | None = None
+        self._pixels: tk.PhotoImage | None = None
+        self._zoomed: tk.PhotoImage | None = None
+        self._hex_var: tk.StringVar | None = None
+        self._job: str | None = None
+        self._last: list[int] | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._window is not None
+
+    def start(self) -> bool:
+        """Grab the pointer and show the magnifier; ``False`` if no grab."""
+        if self.active or self.screen.picking or not self.screen.start_pick():
+            return False
+        size = self.grid * self.zoom
+        self._window = tk.Toplevel(self.root)
+        self._window.title("Eyedropper")
+        self._window.transient(self.root)
+        self._window.resizable(False, False)
+
+        self._pixels = tk.PhotoImage(master=self._window, width=self.grid, height=self.grid)
+        self._zoomed = tk.PhotoImage(master=self._window, width=size, height=size)
+        canvas = tk.Canvas(self._window, width=size, height=size, highlightthickness=0)
+        canvas.pack(padx=6, pady=(6, 2))
+        canvas.create_image(0, 0, image=self._zoomed, anchor="nw")
+        centre = self.grid // 2 * self.zoom
+        canvas.create_rectangle(
+            centre, centre, centre + self.zoom - 1, centre + self.zoom - 1, outline="#ff00ff"
+        )
+        self._hex_var = tk.StringVar(value="")
+        ttk.Label(self._window, textvariable=self._hex_var, font=("TkFixedFont", 10)).pack()
+        ttk.Label(self._window, text="Click to pick, Esc to cancel").pack(padx=6, pady=(0, 6))
+
+        self._frame()
+        return True
+
+    def stop(self) -> None:
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self.screen.cancel_pick()
+        if self._window is not None:
+            self._window.destroy()
+        self._window = self._pixels = self._zoomed = None
+        self._last = None
+
+    # ------------------------------------------------------------------
+    def _frame(self) -> None:
+        self._job = None
+        try:
+            outcome = self.screen.poll_pick()
+            if outcome is None:
+                self._draw()
+        except (OSError, tk.TclError):
+            outcome = ("cancelled", None)
+        if outcome is not None:
+            self.stop()
+            status, value = outcome
+            if status == "picked":
+                self.on_pick(f"#{value:06x}")
+            return
+        self._job = self.root.after(self.interval_ms, self._frame)
+
+    def _draw(self) -> None:
+        x, y = self.screen.pointer()
+        half = self.grid // 2
+        left, top, pixels = self.screen.region(x - half, y - half, self.grid, self.grid)
+        self.frames += 1
+        if pixels != self._last:
+            self._last = pixels
+            grid = self.grid
+            rows = (
+                "{" + " ".join(f"#{p:06x}" for p in pixels[r * grid : (r + 1) * grid]) + "}"
+                for r in range(grid)
+            )
+            self._pixels.put(" ".join(rows), to=(0, 0))
+            self._zoomed.tk.call(
+                self._zoomed, "copy", self._pixels, "-zoom", self.zoom, self.zoom
+            )
+        # Near the screen edge the captured square is shifted inwards.
+        centre = pixels[(y - top) * self.grid + (x - left)]
+        self._hex_var.set(f"#{centre:06x}  ({x}, {y})")
@@ -0,0 +1,172 @@
+"""Dialog extracting the dominant colors of an image file.
+
+Tk decodes the image (PNG, GIF or PPM) and shrinks it with ``copy
+-subsample`` to at most ``max_pixels``, both in C on the Tk thread; the
+pixels are then handed to a worker thread as Tk's hex text, converted to
+bytes there and reduced with :func:`utils.palette_extract.extract_palette`.
+Clicking a swatch passes its hex value to ``on_pick``.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+import tkinter as tk
+from collections.abc import Callable
+from pathlib import Path
+from tkinter import ttk, filedialog
+
+from utils.palette_extract import METHODS, extract_palette
+from utils.tooltip import ToolTip
+
+_FILETYPES = [("Images", "*.png *.gif *.ppm *.pgm"), ("All files", "*")]
+_HEX_JUNK = str.maketrans("", "", "#{}")
+
+
+def photo_rgb(text: str) -> bytes:
+    """RGB bytes from the text of Tk's ``$photo data`` (rows of ``#rrggbb``)."""
+    return bytes.fromhex(text.translate(_HEX_JUNK))
+
+
+def subsample_factor(width: int, height: int, max_pixels: int) -> int:
+    """Smallest step in both directions leaving at most ``max_pixels``."""
+    return max(1, math.ceil(math.sqrt(width * height / max(max_pixels, 1))))
+
+
+class ImagePalette:
+    """Toplevel showing an image's dominant colors as clickable swatches."""
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        on_pick: Callable[[str], None],
+        count: int = 8,
+        method: str = "median-cut",
+        max_pixels: int = 262144,
+    ) -> None:
+        self.root = root
+        self.on_pick = on_pick
+        self.max_pixels = max_pixels
+        self._pixels: bytes | None = None
+        self._name = ""
+        self._generation = 0  # results of older runs are dropped
+
+        self._window: tk.Toplevel | None = None
+        self._swatches: ttk.Frame | None = None
+        self.count_var: tk.IntVar | None = None
+        self.method_var: tk.StringVar | None = None
+        self.status_var: tk.StringVar | None = None
+        self._defaults = (count, method if method in METHODS else METHODS[0])
+
+    def show(self) -> None:
+        if self._window is not None and self._window.winfo_exists():
+            self._window.deiconify()
+            self._window.lift()
+            return
+        self._window = window = tk.Toplevel(self.root)
+        window.title("Image Palette")
+        window.transient(self.root)
+        frame = ttk.Frame(window, padding=8)
+        frame.pack(fill="both", expand=True)
+
+        count, method = self._defaults
+        self.count_var = tk.IntVar(value=count)
+        self.method_var = tk.StringVar(value=method)
+        self.status_var = tk.StringVar(value="Open a PNG, GIF or PPM image")
+
+        ttk.Button(frame, text="Open Image...", command=self._open).grid(
+            row=0, column=0, sticky="ew"
+        )
+        method_box = ttk.Combobox(
+            frame, textvariable=self.method_var, values=METHODS, state="readonly", width=10
+        )
+        method_box.grid(row=0, column=1, padx=4)
+        method_box.bind("<<ComboboxSelected>>", lambda e: self._extract())
+        ToolTip(method_box, "Median cut, or median cut refined by k-means")
+        count_box = ttk.Spinbox(
+            frame, from_=2, to=16, textvariable=self.count_var, width=3, command=self._extract
+        )
+        count_box.grid(row=0, column=2)
+        ToolTip(count_box, "Number of colors")
+        ttk.Label(frame, textvariable=self.status_var).grid(
+            row=1, column=0, columnspan=3, sticky="w", pady=4
+        )
+        self._swatches = ttk.Frame(frame)
+        self._swatches.grid(row=2, column=0, columnspan=3, sticky="nsew")
+        frame.columnconfigure(0, weight=1)
+        self._pixels = None
+
+    # ------------------------------------------------------------------
+    def _open(self) -> None:
+        path = filedialog.askopenfilename(
+            parent=self._window, title="Open Image", filetypes=_FILETYPES
+        )
+        if not path:
+            return
+        try:
+            image = tk.PhotoImage(master=self._window, file=path)
+        except tk.TclError as e:
+            self.status_var.set(f"Cannot read image: {e}")
+            return
+        width, height = image.width(), image.height()
+        step = subsample_factor(width, height, self.max_pixels)
+        if step > 1:
+            small = tk.PhotoImage(master=self._window)
+            small.tk.call(small, "copy", image, "-subsample", step, step)
+            image = small  # the full-size image is freed here
+        self._name = f"{Path(path).name} ({width}x{height})"
+        self._pixels = None
+        self._extract(image.tk.eval(f"{image} data"))
+
+    def _extract(self, photo_data: str | None = None) -> None:
+        """Extract the palette on a worker thread (Tk's text, or reuse pixels)."""
+        if photo_data is None and self._pixels is None:
+            return
+        try:
+            count = max(2, min(int(self.count_var.get()), 16))
+        except (tk.TclError, ValueError):
+            return
+        method = self.method_var.get()
+        self._generation += 1
+        generation = self._generation
+        outcome: list = []
+
+        def _work() -> None:
+            start = time.perf_counter()
+            try:
+                pixels = self._pixels if photo_data is None else photo_rgb(photo_data)
+                colors = extract_palette(pixels, 3, count, method)
+                outcome.append((pixels, colors, time.perf_counter() - start))
+            except Exception as e:  # always leave an outcome, or _poll never stops
+                outcome.append(e)
+
+        def _poll() -> None:
+            if not outcome:
+                self.root.after(30, _poll)
+            elif generation == self._generation and self._window.winfo_exists():
+                self._show(outcome[0])
+
+        self.status_var.set(f"Extracting colors of {self._name}...")
+        threading.Thread(target=_work, name="color-palette", daemon=True).start()
+        self.root.after(30, _poll)
+
+    def _show(self, result) -> None:
+        if isinstance(result, Exception):
+            self.status_var.set(f"Cannot read image: {result}")
+            return
+        self._pixels, colors, seconds = result
+        self.status_var.set(f"{self._name}, {seconds * 1000:.0f} ms")
+        for child in self._swatches.winfo_children():
+            child.destroy()
+        for index, (color, share) in enumerate(colors):
+            hex_color = f"#{color:06x}"
+            row, column = index // 2, index % 2 * 2
+            tk.Label(
+                self._swatches, bg=hex_color, width=3, relief="sunken", borderwidth=1
+            ).grid(row=row, column=column, sticky="ns", padx=(0, 2), pady=1)
+            ttk.Button(
+                self._swatches,
+                text=f"{hex_color}  {share:4.0%}",
+                command=lambda value=hex_color: self.on_pick(value),
+            ).grid(row=row, column=column + 1, sticky="ew", padx=(0, 6), pady=1)
@@ -0,0 +1,283 @@
+"""Read screen pixels straight from the X server.
+
+Xlib is used through :mod:`ctypes`, on a display connection of our own (not
+Tk's), so picking needs neither an external program nor hiding the window:
+the pointer is grabbed with a crosshair cursor, and the click's position is
+read from the grab's event.  Pixels are read with ``XGetImage`` of just the
+pixels needed (one, or the few around the pointer for the eyedropper).
+
+:class:`X11Screen` raises :class:`OSError` when Xlib or the display is not
+available (Windows, macOS, Wayland without XWayland, no ``DISPLAY``).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import sys
+from ctypes import POINTER, byref, c_char_p, c_int, c_long, c_uint, c_ulong, c_void_p
+
+_ALL_PLANES = c_ulong(-1).value
+_Z_PIXMAP = 2
+_KEY_PRESS_MASK = 1 << 0
+_BUTTON_PRESS_MASK = 1 << 2
+_GRAB_MODE_ASYNC = 1
+_GRAB_SUCCESS = 0
+_CURRENT_TIME = 0
+_XC_CROSSHAIR = 34
+_KEY_PRESS = 2
+_BUTTON_PRESS = 4
+
+
+class _XImage(ctypes.Structure):
+    # Leading fields of Xlib's XImage; the rest is only used by Xlib.
+    _fields_ = [
+        ("width", c_int),
+        ("height", c_int),
+        ("xoffset", c_int),
+        ("format", c_int),
+        ("data", c_void_p),
+        ("byte_order", c_int),
+        ("bitmap_unit", c_int),
+        ("bitmap_bit_order", c_int),
+        ("bitmap_pad", c_int),
+        ("depth", c_int),
+        ("bytes_per_line", c_int),
+        ("bits_per_pixel", c_int),
+        ("red_mask", c_ulong),
+        ("green_mask", c_ulong),
+        ("blue_mask", c_ulong),
+    ]
+
+
+class _XButtonEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", c_int),
+        ("serial", c_ulong),
+        ("send_event", c_int),
+        ("display", c_void_p),
+        ("window", c_ulong),
+        ("root", c_ulong),
+        ("subwindow", c_ulong),
+        ("time", c_ulong),
+        ("x", c_int),
+        ("y", c_int),
+        ("x_root", c_int),
+        ("y_root", c_int),
+        ("state", c_uint),
+        ("button", c_uint),
+        ("same_screen", c_int),
+    ]
+
+
+class _XEvent(ctypes.Union):
+    _fields_ = [("type", c_int), ("xbutton", _XButtonEvent), ("pad", c_long * 24)]
+
+
+def _load_xlib():
+    name = ctypes.util.find_library("X11")
+    if name is None:
+        raise OSError("libX11 not found")
+    xlib = ctypes.CDLL(name)
+    signatures = {
+        "XOpenDisplay": (c_void_p, [c_char_p]),
+        "XCloseDisplay": (c_int, [c_void_p]),
+        "XDefaultRootWindow": (c_ulong, [c_void_p]),
+        "XDefaultScreen": (c_int, [c_void_p]),
+        "XDisplayWidth": (c_int, [c_void_p, c_int]),
+        "XDisplayHeight": (c_int, [c_void_p, c_int]),
+        "XConnectionNumber": (c_int, [c_void_p]),
+        "XGetImage": (
+            POINTER(_XImage),
+            [c_void_p, c_ulong, c_int, c_int, c_uint, c_uint, c_ulong, c_int],
+        ),
+        "XGetPixel": (c_ulong, [POINTER(_XImage), c_int, c_int]),
+        "XDestroyImage": (c_int, [POINTER(_XImage)]),
+        "XQueryPointer": (
+            c_int,
+            [c_void_p, c_ulong, POINTER(c_ulong), POINTER(c_ulong)]
+            + [POINTER(c_int)] * 4
+            + [POINTER(c_uint)],
+        ),
+        "XCreateFontCursor": (c_ulong, [c_void_p, c_uint]),
+        "XFreeCursor": (c_int, [c_void_p, c_ulong]),
+        "XGrabPointer": (
+            c_int,
+            [c_void_p, c_ulong, c_int, c_uint, c_int, c_int, c_ulong, c_ulong, c_ulong],
+        ),
+        "XUngrabPointer": (c_int, [c_void_p, c_ulong]),
+        "XGrabKeyboard": (c_int, [c_void_p, c_ulong, c_int, c_int, c_int, c_ulong]),
+        "XUngrabKeyboard": (c_int, [c_void_p, c_ulong]),
+        "XCheckMaskEvent": (c_int, [c_void_p, c_long, POINTER(_XEvent)]),
+        "XFlush": (c_int, [c_void_p]),
+    }
+    for func, (restype, argtypes) in signatures.items():
+        fn = getattr(xlib, func)
+        fn.restype = restype
+        fn.argtypes = argtypes
+    return xlib
+
+
+def _channel(pixel: int, mask: int) -> int:
+    """Extract the colour channel under ``mask`` as 0..255."""
+    if not mask:
+        return 0
+    shift = (mask & -mask).bit_length() - 1
+    top = mask >> shift
+    return ((pixel & mask) >> shift) * 255 // top
+
+
+class X11Screen:
+    """Pixel reads and click-to-pick on an X display."""
+
+    def __init__(self, display: str | None = None) -> None:
+        self._xlib = _load_xlib()
+        self._display = self._xlib.XOpenDisplay(display.encode() if display else None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        screen = self._xlib.XDefaultScreen(self._display)
+        self.root = self._xlib.XDefaultRootWindow(self._display)
+        self.width = self._xlib.XDisplayWidth(self._display, screen)
+        self.height = self._xlib.XDisplayHeight(self._display, screen)
+        self._cursor = 0
+        self.picking = False
+
+    def close(self) -> None:
+        if self._display:
+            self.cancel_pick()
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+    def fileno(self) -> int:
+        """The X connection's socket, readable when events arrive."""
+        return self._xlib.XConnectionNumber(self._display)
+
+    # ------------------------------------------------------------------
+    def pointer(self) -> tuple[int, int]:
+        """Current pointer position in screen coordinates."""
+        root, child = c_ulong(), c_ulong()
+        x, y, win_x, win_y = c_int(), c_int(), c_int(), c_int()
+        mask = c_uint()
+        self._xlib.XQueryPointer(
+            self._display,
+            self.root,
+            byref(root),
+            byref(child),
+            byref(x),
+            byref(y),
+            byref(win_x),
+            byref(win_y),
+            byref(mask),
+        )
+        return x.value, y.value
+
+    def pixel(self, x: int, y: int) -> int:
+        """Colour at ``(x, y)`` as a packed ``0xRRGGBB`` int."""
+        return self.region(x, y, 1, 1)[2][0]
+
+    def region(self, x: int, y: int, width: int, height: int) -> tuple[int, int, list[int]]:
+        """Colours of a rectangle, row by row, as packed ``0xRRGGBB`` ints.
+
+        The rectangle is moved inside the screen if it sticks out (asking
+        for pixels off screen is an X protocol error, which by default ends
+        the process); returns its actual top-left corner with the pixels.
+        """
+        width = min(width, self.width)
+        height = min(height, self.height)
+        x = min(max(x, 0), self.width - width)
+        y = min(max(y, 0), self.height - height)
+        image = self._xlib.XGetImage(
+            self._display, self.root, x, y, width, height, _ALL_PLANES, _Z_PIXMAP
+        )
+        if not image:
+            raise OSError("XGetImage failed")
+        try:
+            return x, y, self._decode(image, width, height)
+        finally:
+            self._xlib.XDestroyImage(image)
+
+    def _decode(self, image, width: int, height: int) -> list[int]:
+        info = image.contents
+        masks = (info.red_mask, info.green_mask, info.blue_mask)
+        if (
+            info.bits_per_pixel == 32
+            and masks == (0xFF0000, 0x00FF00, 0x0000FF)
+            and info.byte_order == (0 if sys.byteorder == "little" else 1)
+        ):
+            # Common 24-bit TrueColor: the pixel words are already 0x??RRGGBB.
+            raw = ctypes.string_at(info.data, info.bytes_per_line * height)
+            pixels = []
+            for row in range(height):
+                start = row * info.bytes_per_line
+                words = memoryview(raw[start : start + width * 4]).cast("I")
+                pixels.extend(word & 0xFFFFFF for word in words)
+            return pixels
+        get_pixel = self._xlib.XGetPixel
+        return [
+            _channel(value, masks[0]) << 16
+            | _channel(value, masks[1]) << 8
+            | _channel(value, masks[2])
+            for row in range(height)
+            for value in (get_pixel(image, col, row) for col in range(width))
+        ]
+
+    # ------------------------------------------------------------------
+    def start_pick(self) -> bool:
+        """Grab the pointer with a crosshair until :meth:`poll_pick` ends it.
+
+        Returns ``False`` if another program holds the grab.
+        """
+        xlib = self._xlib
+        self._cursor = xlib.XCreateFontCursor(self._display, _XC_CROSSHAIR)
+        status = xlib.XGrabPointer(
+            self._display,
+            self.root,
+            False,
+            _BUTTON_PRESS_MASK,
+            _GRAB_MODE_ASYNC,
+            _GRAB_MODE_ASYNC,
+            0,
+            self._cursor,
+            _CURRENT_TIME,
+        )
+        if status != _GRAB_SUCCESS:
+            self._release()
+            return False
+        # Keys cancel; without the keyboard grab Esc would go to other windows.
+        xlib.XGrabKeyboard(
+            self._display, self.root, False, _GRAB_MODE_ASYNC, _GRAB_MODE_ASYNC, _CURRENT_TIME
+        )
+        xlib.XFlush(self._display)
+        self.picking = True
+        return True
+
+    def poll_pick(self) -> tuple[str, int | None] | None:
+        """``("picked", rgb)``, ``("cancelled", None)`` or ``None`` (waiting).
+
+        The left button picks; other buttons and any key cancel.
+        """
+        if not self.picking:
+            return None
+        event = _XEvent()
+        mask = _BUTTON_PRESS_MASK | _KEY_PRESS_MASK
+        while self._xlib.XCheckMaskEvent(self._display, mask, byref(event)):
+            if event.type == _BUTTON_PRESS and event.xbutton.button == 1:
+                self._release()
+                return ("picked", self.pixel(event.xbutton.x_root, event.xbutton.y_root))
+            if event.type in (_BUTTON_PRESS, _KEY_PRESS):
+                self._release()
+                return ("cancelled", None)
+        return None
+
+    def cancel_pick(self) -> None:
+        if self.picking or self._cursor:
+            self._release()
+
+    def _release(self) -> None:
+        self.picking = False
+        self._xlib.XUngrabKeyboard(self._display, _CURRENT_TIME)
+        self._xlib.XUngrabPointer(self._display, _CURRENT_TIME)
+        if self._cursor:
+            self._xlib.XFreeCursor(self._display, self._cursor)
+            self._cursor = 0
+        self._xlib.XFlush(self._display)
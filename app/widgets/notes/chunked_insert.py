@@ -0,0 +1,156 @@
+"""Stream large text into a ``tk.Text`` without freezing the UI.
+
+A single ``text.insert`` of a multi-megabyte string blocks the Tk main loop
+until the widget has laid out all of it.  :class:`ChunkedInserter` instead
+inserts bounded chunks, one per ``after()`` callback, so events are handled
+in between and a progress indicator can be updated.
+
+Chunks come from any iterator of strings: :func:`iter_string_chunks` for
+text already in memory and :func:`iter_file_chunks` for files, which are
+memory-mapped and decoded incrementally instead of being read up front.
+"""
+
+from __future__ import annotations
+
+import codecs
+import mmap
+import os
+import tkinter as tk
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+
+def iter_string_chunks(content: str, chunk_size: int) -> Iterator[str]:
+    """Yield ``content`` in slices of at most ``chunk_size`` characters."""
+
+    for start in range(0, len(content), chunk_size):
+        yield content[start : start + chunk_size]
+
+
+def iter_file_chunks(
+    path: Path, chunk_size: int, encoding: str = "utf-8"
+) -> Iterator[str]:
+    """Yield the decoded text of ``path`` chunk by chunk via ``mmap``.
+
+    Invalid bytes are replaced rather than aborting the whole load.
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), chunk_size):
+                chunk = decoder.decode(mm[start : start + chunk_size])
+                if chunk:
+                    yield chunk
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class ChunkedInserter:
+    """Insert text from ``chunks`` into ``text`` a chunk per ``after()`` tick.
+
+    Parameters
+    ----------
+    text:
+        Target widget.
+    chunks:
+        Iterator of strings to insert in order.
+    total:
+        Expected total size (characters, or bytes for files); only used for
+        the progress fraction.
+    index:
+        Where to start inserting.  A right-gravity mark keeps later chunks
+        following earlier ones even if the user edits elsewhere meanwhile.
+    readonly:
+        Keep the widget disabled between chunks so the user cannot type into
+        a half-loaded note.
+    on_progress:
+        Called with a fraction in ``[0, 1]`` after every chunk.
+    on_done:
+        Called once everything has been inserted.
+    """
+
+    _mark_counter = 0
+
+    def __init__(
+        self,
+        text: tk.Text,
+        chunks: Iterator[str],
+        total: int,
+        index: str = "insert",
+        readonly: bool = False,
+        delay: int = 1,
+        on_progress: Callable[[float], None] | None = None,
+        on_done: Callable[[], None] | None = None,
+    ) -> None:
+        self.text = text
+        self.chunks = chunks
+        self.total = max(total, 1)
+        self.readonly = readonly
+        self.delay = delay
+        self.on_progress = on_progress
+        self.on_done = on_done
+
+        ChunkedInserter._mark_counter += 1
+        self._mark = f"chunked_insert_{ChunkedInserter._mark_counter}"
+        self._index = index
+        self._inserted = 0
+        self._after_id: str | None = None
+        self._undo = False
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Begin streaming; returns immediately."""
+
+        self.text.mark_set(self._mark, self._index)
+        self.text.mark_gravity(self._mark, "right")
+        # Per-chunk undo records would be useless and large; the undo stack
+        # is reset once the stream completes instead.
+        self._undo = self.text.getboolean(self.text.cget("undo"))
+        self.text.configure(undo=False)
+        if self.readonly:
+            self.text.configure(state="disabled")
+        self._after_id = self.text.after_idle(self._step)
+
+    def cancel(self) -> None:
+        """Stop streaming, keeping whatever was inserted so far."""
+
+        if self._after_id is not None:
+            self.text.after_cancel(self._after_id)
+            self._after_id = None
+        self._finish(notify=False)
+
+    # ------------------------------------------------------------------
+    def _step(self) -> None:
+        self._after_id = None
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self._finish(notify=True)
+            return
+
+        try:
+            if self.readonly:
+                self.text.configure(state="normal")
+            self.text.insert(self._mark, chunk)
+            if self.readonly:
+                self.text.configure(state="disabled")
+        except tk.TclError:
+            return  # widget destroyed meanwhile (note closed)
+
+        self._inserted += len(chunk)
+        if self.on_progress is not None:
+            self.on_progress(min(self._inserted / self.total, 1.0))
+        self._after_id = self.text.after(self.delay, self._step)
+
+    def _finish(self, notify: bool) -> None:
+        try:
+            self.text.configure(state="normal", undo=self._undo)
+            self.text.edit_reset()
+            self.text.mark_unset(self._mark)
+        except tk.TclError:
+            return  # widget destroyed meanwhile
+        if notify and self.on_done is not None:
+            self.on_done()
@@ -0,0 +1,139 @@
+"""Observe the edits made to a ``tk.Text`` widget.
+
+Tk only reports *that* a text widget changed (``<<Modified>>``), not *what*
+changed.  :class:`EditObserver` renames the widget's Tcl command and puts a
+Python proxy in its place, so every ``insert``, ``delete`` and ``replace`` -
+whether typed, pasted, undone or done from code - is seen with its exact
+position and text before it is passed on to the real widget.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+from collections.abc import Callable
+
+
+class TextEdit:
+    """One insert or delete applied to a text widget.
+
+    ``index`` is the normalised ``line.col`` position where the change
+    starts.  ``line`` is its line number and ``removed_lines`` /
+    ``added_lines`` count the newlines removed and inserted, so the edit
+    replaced lines ``line .. line + removed_lines`` with lines
+    ``line .. line + added_lines``.
+    """
+
+    __slots__ = ("op", "index", "chars", "line", "removed_lines", "added_lines")
+
+    def __init__(self, op: str, index: str, chars: str) -> None:
+        self.op = op
+        self.index = index
+        self.chars = chars
+        self.line = int(index.split(".", 1)[0])
+        newlines = chars.count("\n")
+        self.removed_lines = newlines if op == "delete" else 0
+        self.added_lines = newlines if op == "insert" else 0
+
+
+class EditObserver:
+    """Proxy a text widget's command and report edits to listeners.
+
+    Listeners are called with a :class:`TextEdit` right after the widget has
+    applied the change.  A ``replace`` is reported as a delete followed by an
+    insert.
+    """
+
+    def __init__(self, text: tk.Text) -> None:
+        self.text = text
+        self.listeners: list[Callable[[TextEdit], None]] = []
+        self._name = str(text)
+        self._orig = self._name + "_observed"
+        text.tk.call("rename", self._name, self._orig)
+        text.tk.createcommand(self._name, self._dispatch)
+        text.bind("<Destroy>", self._on_destroy, add="+")
+
+    def add_listener(self, listener: Callable[[TextEdit], None]) -> None:
+        self.listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    def _call(self, *args):
+        return self.text.tk.call(self._orig, *args)
+
+    def _dispatch(self, *args):
+        op = args[0] if args else ""
+        if op not in ("insert", "delete", "replace") or not self.listeners:
+            return self._call(*args)
+        if str(self._call("cget", "-state")) == "disabled":
+            return self._call(*args)
+
+        if op == "insert":
+            index = self._insert_index(args[1])
+            chars = "".join(args[2::2])
+            result = self._call(*args)
+            self._notify(TextEdit("insert", index, chars))
+            return result
+
+        if op == "delete" and len(args) > 3:
+            # Several ranges at once: delete them one by one, last first, so
+            # the positions of the remaining ranges stay valid.
+            indices = args[1:]
+            ranges = [
+                self._delete_range(indices[i], indices[i + 1] if i + 1 < len(indices) else None)
+                for i in range(0, len(indices), 2)
+            ]
+            ranges.sort(key=lambda r: tuple(map(int, r[0].split("."))), reverse=True)
+            for start, end in ranges:
+                if start != end:
+                    self._dispatch("delete", start, end)
+            return ""
+
+        start, end = self._delete_range(args[1], args[2] if len(args) > 2 else None)
+        removed = self._call("get", start, end) if start != end else ""
+        if op == "delete":
+            result = self._call(*args)
+            if removed:
+                self._notify(TextEdit("delete", start, removed))
+            return result
+
+        # replace index1 index2 chars ?tagList chars tagList ...?
+        chars = "".join(args[3::2])
+        result = self._call(*args)
+        if removed:
+            self._notify(TextEdit("delete", start, removed))
+        if chars:
+            self._notify(TextEdit("insert", start, chars))
+        return result
+
+    def _index(self, index: str) -> str:
+        return str(self._call("index", index))
+
+    def _compare(self, index1: str, op: str, index2: str) -> bool:
+        return self.text.tk.getboolean(self._call("compare", index1, op, index2))
+
+    def _insert_index(self, index: str) -> str:
+        # Text inserted at "end" really goes before the final newline.
+        index = self._index(index)
+        if self._compare(index, "==", "end"):
+            index = self._index("end - 1 chars")
+        return index
+
+    def _delete_range(self, index1: str, index2: str | None) -> tuple[str, str]:
+        start = self._index(index1)
+        end = self._index(index2 if index2 is not None else f"{start} + 1 chars")
+        # The final newline can never be deleted.
+        if self._compare(end, "==", "end"):
+            end = self._index("end - 1 chars")
+        if self._compare(start, ">=", end):
+            return start, start
+        return start, end
+
+    def _notify(self, edit: TextEdit) -> None:
+        for listener in self.listeners:
+            listener(edit)
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self.text:
+            try:
+                self.text.tk.deletecommand(self._name)
+            except tk.TclError:
+                pass
@@ -0,0 +1,225 @@
+"""Incremental syntax/markup highlighting for note pages.
+
+Notes are highlighted line by line with one combined regular expression per
+language (Markdown, JSON or generic code, detected from the first lines of
+the note).  Re-tagging the whole widget on every keystroke would not scale,
+so :class:`Highlighter` only does three kinds of work:
+
+* the lines touched by an edit are re-tagged right away (tags on all other
+  lines simply move with the text);
+* the visible viewport is tagged as soon as it is shown;
+* everything else is tagged in idle callbacks, in batches bounded by
+  ``batch_ms``, walking the note from top to bottom.
+
+Tokens never span lines, so multi-line constructs (fenced code blocks,
+multi-line strings) are only highlighted on their marker lines.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+import tkinter as tk
+import tkinter.font as tkfont
+
+from widgets.notes.edit_observer import TextEdit
+
+_STRING = r'"(?:[^"\\\n]|\\.)*"'
+
+LANGUAGES: dict[str, list[tuple[str, str]]] = {
+    "markdown": [
+        ("heading", r"^#{1,6}\s.*$"),
+        ("fence", r"^\s*```.*$"),
+        ("list", r"^\s*(?:[-*+]|\d+[.)])(?=\s)"),
+        ("code", r"`[^`\n]+`"),
+        ("bold", r"\*\*[^*\n]+\*\*|__[^_\n]+__"),
+        ("link", r"\[[^\]\n]+\]\([^)\n]+\)"),
+    ],
+    "json": [
+        ("key", _STRING + r"(?=\s*:)"),
+        ("string", _STRING),
+        ("number", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+        ("keyword", r"\b(?:true|false|null)\b"),
+    ],
+    "code": [
+        ("comment", r"(?:#|//).*$"),
+        ("string", _STRING + r"|'(?:[^'\\\n]|\\.)*'"),
+        ("number", r"\b\d+(?:\.\d+)?\b"),
+        (
+            "keyword",
+            r"\b(?:def|class|return|if|elif|else|for|while|in|import|from|as|with|"
+            r"try|except|finally|raise|lambda|function|const|let|var|fn|pub|struct|"
+            r"impl|use|match|true|false|null|None|True|False)\b",
+        ),
+    ],
+}
+
+TAG_STYLES: dict[str, dict] = {
+    "heading": {"foreground": "#1a5fb4"},
+    "fence": {"foreground": "#777777"},
+    "list": {"foreground": "#c64600"},
+    "code": {"background": "#eeeeee", "font": "TkFixedFont"},
+    "bold": {},
+    "link": {"foreground": "#1a5fb4", "underline": True},
+    "key": {"foreground": "#813d9c"},
+    "string": {"foreground": "#26a269"},
+    "number": {"foreground": "#c64600"},
+    "keyword": {"foreground": "#1a5fb4"},
+    "comment": {"foreground": "#888888"},
+}
+# Tags drawn with a bold variant of the widget's own font.
+BOLD_TAGS = frozenset({"heading", "bold"})
+
+_PATTERNS = {
+    name: re.compile("|".join(f"(?P<{tag}>{rx})" for tag, rx in rules), re.MULTILINE)
+    for name, rules in LANGUAGES.items()
+}
+
+_DETECT_LINES = 20
+_MARKDOWN_HINT = re.compile(r"^(?:#{1,6}\s|\s*```|\s*[-*+]\s|\s*\d+[.)]\s)", re.MULTILINE)
+_CODE_HINT = re.compile(
+    r"^\s*(?:def |class |import |from \S+ import|function |const |let |fn |#include)"
+    r"|[;{]\s*$",
+    re.MULTILINE,
+)
+
+
+def detect_language(sample: str) -> str | None:
+    """Guess the language of a note from its first lines (``None``: plain)."""
+
+    stripped = sample.lstrip()
+    if stripped[:1] in ("{", "[") and re.match(r'[{\[]\s*(?:"|\d|-|\[|\{|\]|\}|$)', stripped):
+        return "json"
+    if _MARKDOWN_HINT.search(sample):
+        return "markdown"
+    if _CODE_HINT.search(sample):
+        return "code"
+    return None
+
+
+def tokenize_line(language: str, line: str) -> list[tuple[str, int, int]]:
+    """Return ``(tag, start, end)`` spans for one line of ``language``."""
+
+    return [(m.lastgroup, m.start(), m.end()) for m in _PATTERNS[language].finditer(line)]
+
+
+class Highlighter:
+    """Keep the highlighting of one text widget up to date."""
+
+    TAG_PREFIX = "hl_"
+
+    def __init__(self, text: tk.Text, batch_ms: int = 8, batch_lines: int = 200) -> None:
+        self.text = text
+        self.batch = batch_ms / 1000
+        self.batch_lines = batch_lines
+        self.language: str | None = None
+        # Lines before this one have been tagged by the background pass.
+        self._cursor = 1
+        self._after_id: str | None = None
+        self._bold_font: tkfont.Font | None = None
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Detect the language and (re)highlight the whole note lazily."""
+
+        sample = self.text.get("1.0", f"{_DETECT_LINES + 1}.0")
+        self._set_language(detect_language(sample))
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.text.after_cancel(self._after_id)
+            self._after_id = None
+
+    def on_edit(self, edit: TextEdit) -> None:
+        """Re-tag the lines touched by ``edit``."""
+
+        if edit.line <= _DETECT_LINES:
+            sample = self.text.get("1.0", f"{_DETECT_LINES + 1}.0")
+            language = detect_language(sample)
+            if language != self.language:
+                self._set_language(language)
+                return
+        if self.language is None:
+            return
+
+        if edit.line < self._cursor:
+            self._cursor = max(edit.line, self._cursor + edit.added_lines - edit.removed_lines)
+        if edit.added_lines < self.batch_lines:
+            self._tag_lines(edit.line, edit.line + edit.added_lines)
+            return
+        # A large paste: tag what is visible now and leave the rest to the
+        # background pass.
+        self._cursor = min(self._cursor, edit.line)
+        self.view_changed()
+        if self._after_id is None:
+            self._after_id = self.text.after_idle(self._background_step)
+
+    def view_changed(self) -> None:
+        """Tag the visible lines if the background pass has not got there yet."""
+
+        if self.language is None:
+            return
+        first, last = self._visible_lines()
+        if last >= self._cursor:
+            self._tag_lines(max(first, self._cursor), last)
+
+    # ------------------------------------------------------------------
+    def _set_language(self, language: str | None) -> None:
+        self.stop()
+        for tag in TAG_STYLES:
+            self.text.tag_remove(self.TAG_PREFIX + tag, "1.0", tk.END)
+        self.language = language
+        if language is None:
+            return
+        for tag, _ in LANGUAGES[language]:
+            style = dict(TAG_STYLES[tag])
+            if tag in BOLD_TAGS:
+                style["font"] = self._bold()
+            self.text.tag_configure(self.TAG_PREFIX + tag, **style)
+            # Below selection and search tags.
+            self.text.tag_lower(self.TAG_PREFIX + tag)
+        self._cursor = 1
+        self.view_changed()
+        self._after_id = self.text.after_idle(self._background_step)
+
+    def _background_step(self) -> None:
+        """Tag lines from the cursor on until the time budget is used up."""
+
+        self._after_id = None
+        if self.language is None:
+            return
+        last_line = int(self.text.index("end - 1 chars").split(".")[0])
+        deadline = time.perf_counter() + self.batch
+        while self._cursor <= last_line and time.perf_counter() < deadline:
+            end = min(self._cursor + self.batch_lines - 1, last_line)
+            self._tag_lines(self._cursor, end)
+            self._cursor = end + 1
+        if self._cursor <= last_line:
+            self._after_id = self.text.after(1, self._background_step)
+
+    def _tag_lines(self, first: int, last: int) -> None:
+        assert self.language is not None
+        text = self.text
+        start, stop = f"{first}.0", f"{last}.end"
+        for tag, _ in LANGUAGES[self.language]:
+            text.tag_remove(self.TAG_PREFIX + tag, start, stop)
+
+        content = text.get(start, stop)
+        spans: dict[str, list[str]] = {}
+        for number, line in enumerate(content.split("\n"), first):
+            for tag, s, e in tokenize_line(self.language, line):
+                spans.setdefault(tag, []).extend((f"{number}.{s}", f"{number}.{e}"))
+        for tag, indices in spans.items():
+            # One tag_add call per tag for all of its ranges.
+            text.tag_add(self.TAG_PREFIX + tag, *indices)
+
+    def _bold(self) -> tkfont.Font:
+        if self._bold_font is None:
+            self._bold_font = tkfont.Font(font=self.text.cget("font"))
+            self._bold_font.configure(weight="bold")
+        return self._bold_font
+
+    def _visible_lines(self) -> tuple[int, int]:
+        first = self.text.index("@0,0")
+        last = self.text.index(f"@0,{max(self.text.winfo_height(), 1)}")
+        return int(first.split(".")[0]), int(last.split(".")[0])
@@ -0,0 +1,259 @@
+"""Versioned snapshots of notes stored as compressed deltas.
+
+Every note has its own history file: a sequence of records, each a small
+fixed-size header followed by a zlib-compressed payload.  A payload is
+either a *keyframe* (the full text) or a *delta* against the previous
+version (line ranges to copy plus inserted text).  A keyframe is written at
+least every ``keyframe_every`` versions, so restoring any version decodes at
+most that many records.
+
+Listing versions only reads the headers, never the payloads.  When a file
+grows past ``max_bytes``, the oldest versions are pruned by cutting the file
+at a later keyframe.  A version is identified by its timestamp and checksum,
+which pruning does not change (its number does).
+
+Closing a note keeps its history, so it can be reopened from there; the
+histories of notes that are no longer open are deleted by :meth:`expire`
+once they have not been written for a while.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+from widgets.notes.notes_store import atomic_write_bytes
+
+# timestamp, keyframe flag, crc32 of the version's full text, payload size
+_HEADER = struct.Struct("<dBII")
+
+
+class Version(NamedTuple):
+    number: int
+    timestamp: float
+    keyframe: bool
+    checksum: int
+    offset: int  # of the payload
+    size: int
+
+
+def _encode_delta(old: str, new: str) -> bytes:
+    """Describe ``new`` as line ranges copied from ``old`` plus new text."""
+
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    ops: list = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(b[j1:j2]))
+    return json.dumps(ops).encode("utf-8")
+
+
+def _apply_delta(old: str, payload: bytes) -> str:
+    a = old.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(payload):
+        parts.append(op if isinstance(op, str) else "".join(a[op[0] : op[1]]))
+    return "".join(parts)
+
+
+class NoteHistory:
+    """Per-note version history in ``directory``; safe to use from threads."""
+
+    def __init__(
+        self,
+        directory: Path,
+        keyframe_every: int = 20,
+        max_bytes: int = 5 * 1024 * 1024,
+        min_interval: float = 600.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.keyframe_every = max(keyframe_every, 1)
+        self.max_bytes = max_bytes
+        self.min_interval = min_interval
+        self._versions: dict[str, list[Version]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, note_id: str) -> Path:
+        return self.directory / f"{note_id}.hist"
+
+    # ------------------------------------------------------------------
+    def versions(self, note_id: str) -> list[Version]:
+        """Return the stored versions of a note, oldest first."""
+
+        with self._lock:
+            return list(self._scan(note_id))
+
+    def record(self, note_id: str, text: str, now: float | None = None) -> bool:
+        """Store ``text`` as a new version unless it is unchanged or too soon.
+
+        Returns ``True`` if a version was written.
+        """
+
+        now = time.time() if now is None else now
+        checksum = zlib.crc32(text.encode("utf-8"))
+        with self._lock:
+            versions = self._scan(note_id)
+            if versions:
+                last = versions[-1]
+                if last.checksum == checksum or now - last.timestamp < self.min_interval:
+                    return False
+
+            since_keyframe = 0
+            for version in reversed(versions):
+                if version.keyframe:
+                    break
+                since_keyframe += 1
+
+            keyframe = zlib.compress(text.encode("utf-8"))
+            payload, is_keyframe = keyframe, True
+            if versions and since_keyframe + 1 < self.keyframe_every:
+                delta = zlib.compress(_encode_delta(self._restore(note_id, versions[-1]), text))
+                if len(delta) < len(keyframe):
+                    payload, is_keyframe = delta, False
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.path_for(note_id)
+            end = versions[-1].offset + versions[-1].size if versions else 0
+            with open(path, "ab") as f:
+                f.truncate(end)  # drop a torn record left by a crash
+                f.write(_HEADER.pack(now, is_keyframe, checksum, len(payload)))
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            offset = end + _HEADER.size
+            versions.append(
+                Version(len(versions), now, is_keyframe, checksum, offset, len(payload))
+            )
+
+            if offset + len(payload) > self.max_bytes:
+                self._prune(note_id)
+            return True
+
+    def restore(self, note_id: str, version: Version) -> str:
+        """Return the text of ``version`` (one listed by :meth:`versions`).
+
+        Raises :class:`LookupError` if it has been pruned since.
+        """
+
+        with self._lock:
+            for current in self._scan(note_id):
+                if (current.timestamp, current.checksum) == (version.timestamp, version.checksum):
+                    return self._restore(note_id, current)
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(version.timestamp))
+        raise LookupError(f"the version of {stamp} is no longer stored")
+
+    def note_ids(self) -> list[str]:
+        """Ids of the notes that have a history, most recently written first."""
+
+        try:
+            paths = [p for p in self.directory.iterdir() if p.suffix == ".hist"]
+            paths.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        except OSError:
+            return []
+        return [p.stem for p in paths]
+
+    def expire(self, keep: set[str], max_age: float, now: float | None = None) -> list[str]:
+        """Delete the histories of notes not in ``keep`` unwritten for ``max_age`` s.
+
+        Returns the ids of the notes whose history was deleted.
+        """
+
+        now = time.time() if now is None else now
+        expired = []
+        for note_id in self.note_ids():
+            if note_id in keep:
+                continue
+            try:
+                if now - self.path_for(note_id).stat().st_mtime < max_age:
+                    continue
+            except OSError:
+                continue
+            self.forget(note_id)
+            expired.append(note_id)
+        return expired
+
+    def forget(self, note_id: str) -> None:
+        """Delete the whole history of a note."""
+
+        with self._lock:
+            self._versions.pop(note_id, None)
+            try:
+                self.path_for(note_id).unlink()
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    def _scan(self, note_id: str) -> list[Version]:
+        """Read (and cache) the record headers of a note's history file."""
+
+        versions = self._versions.get(note_id)
+        if versions is not None:
+            return versions
+        versions = []
+        try:
+            with open(self.path_for(note_id), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                pos = 0
+                while pos + _HEADER.size <= size:
+                    timestamp, keyframe, checksum, length = _HEADER.unpack(
+                        f.read(_HEADER.size)
+                    )
+                    offset = pos + _HEADER.size
+                    if offset + length > size:
+                        break  # torn record
+                    versions.append(
+                        Version(len(versions), timestamp, bool(keyframe), checksum, offset, length)
+                    )
+                    pos = offset + length
+                    f.seek(pos)
+        except OSError:
+            pass
+        self._versions[note_id] = versions
+        return versions
+
+    def _restore(self, note_id: str, target: Version) -> str:
+        versions = self._scan(note_id)
+        start = target.number
+        while not versions[start].keyframe:
+            start -= 1
+        text = ""
+        with open(self.path_for(note_id), "rb") as f:
+            for version in versions[start : target.number + 1]:
+                f.seek(version.offset)
+                payload = zlib.decompress(f.read(version.size))
+                if version.keyframe:
+                    text = payload.decode("utf-8")
+                else:
+                    text = _apply_delta(text, payload)
+        return text
+
+    def _prune(self, note_id: str) -> None:
+        """Cut off the oldest versions, always starting at a keyframe."""
+
+        versions = self._scan(note_id)
+        end = versions[-1].offset + versions[-1].size
+        cut = None
+        for version in versions:
+            start = version.offset - _HEADER.size
+            if version.keyframe and start > 0:
+                cut = start
+                if end - start <= self.max_bytes:
+                    break
+        if cut is None:
+            return
+        path = self.path_for(note_id)
+        with open(path, "rb") as f:
+            f.seek(cut)
+            data = f.read()
+        atomic_write_bytes(path, data)
+        self._versions.pop(note_id, None)
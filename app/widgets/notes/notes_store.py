@@ -0,0 +1,335 @@
+"""Journaled, crash-safe storage for notes.
+
+Notes live in two files next to each other:
+
+* the snapshot (``notes.json``) holding every note, only ever replaced
+  atomically (temp file + rename);
+* the journal (``notes.journal``), an append-only log of JSON lines that
+  records per-note changes made since the snapshot was written.
+
+Loading replays the journal on top of the snapshot.  Saving appends only the
+notes that actually changed, so its cost no longer depends on the size of the
+whole archive.  Once the journal grows past ``compact_bytes`` it is folded
+back into a fresh snapshot.
+
+:class:`AutosaveWorker` runs the writes on a background thread so the Tk
+main loop never blocks on disk I/O.  It also feeds saved notes to an
+optional version history.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from widgets.notes.history import NoteHistory
+
+
+def new_note_id() -> str:
+    """Return a fresh, stable identifier for a note."""
+
+    return uuid.uuid4().hex
+
+
+def atomic_write_text(path: Path, data: str) -> None:
+    """Write ``data`` to ``path`` so readers see either the old or new file."""
+
+    atomic_write_bytes(path, data.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Binary counterpart of :func:`atomic_write_text`."""
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class NotesStore:
+    """Snapshot + append-only journal of notes keyed by stable ids."""
+
+    def __init__(self, path: Path, compact_bytes: int = 8 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.compact_bytes = compact_bytes
+
+        # Mirror of what is on disk; used to skip unchanged notes and to
+        # write the snapshot during compaction.
+        self._notes: dict[str, str] = {}
+        self._order: list[str] = []
+        self._snapshot_size = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def load(self) -> list[tuple[str, str]]:
+        """Return ``(note_id, text)`` pairs in tab order.
+
+        Both the current snapshot format and the legacy plain list of strings
+        are accepted.  A torn last journal line (crash mid-append) is ignored.
+        """
+
+        notes: dict[str, str] = {}
+        order: list[str] = []
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            data = None
+
+        legacy = isinstance(data, list)
+        if legacy:
+            for text in data:
+                if isinstance(text, str):
+                    nid = new_note_id()
+                    notes[nid] = text
+                    order.append(nid)
+        elif isinstance(data, dict):
+            for item in data.get("notes", []):
+                nid, text = item.get("id"), item.get("text")
+                if isinstance(nid, str) and isinstance(text, str):
+                    notes[nid] = text
+                    order.append(nid)
+
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self._apply(record, notes, order)
+        except OSError:
+            pass
+
+        if not order:
+            nid = new_note_id()
+            notes[nid] = ""
+            order.append(nid)
+
+        with self._lock:
+            self._notes = dict(notes)
+            self._order = list(order)
+            self._snapshot_size = self._file_size(self.path)
+            if legacy:
+                # Ids of legacy notes only exist in memory; persist them right
+                # away so later journal records can refer to them.
+                try:
+                    self._compact()
+                except OSError:
+                    pass
+        return [(nid, notes[nid]) for nid in order]
+
+    def notes(self) -> list[tuple[str, str]]:
+        """Return the stored ``(note_id, text)`` pairs without re-reading."""
+
+        with self._lock:
+            return [(nid, self._notes[nid]) for nid in self._order]
+
+    @staticmethod
+    def _apply(record: dict, notes: dict[str, str], order: list[str]) -> None:
+        op = record.get("op")
+        if op == "set":
+            nid = record["id"]
+            if nid not in notes:
+                order.append(nid)
+            notes[nid] = record["text"]
+        elif op == "delete":
+            nid = record["id"]
+            notes.pop(nid, None)
+            if nid in order:
+                order.remove(nid)
+        elif op == "order":
+            ids = [nid for nid in record["ids"] if nid in notes]
+            order[:] = ids + [nid for nid in order if nid not in ids]
+
+    # ------------------------------------------------------------------
+    def write(self, changes: dict[str, str], order: list[str]) -> None:
+        """Append the given note changes and the current tab ``order``.
+
+        Notes whose text matches what is already stored are skipped, and notes
+        missing from ``order`` are recorded as deleted.
+        """
+
+        with self._lock:
+            records = []
+            for nid, text in changes.items():
+                if self._notes.get(nid) != text:
+                    records.append({"op": "set", "id": nid, "text": text})
+            for nid in self._order:
+                if nid not in order:
+                    records.append({"op": "delete", "id": nid})
+            if not records and order == self._order:
+                return
+
+            records.append({"op": "order", "ids": list(order)})
+            payload = "".join(json.dumps(r) + "\n" for r in records)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+            for record in records:
+                self._apply(record, self._notes, self._order)
+
+            # Compact once the journal outgrows half the snapshot, so the
+            # amortised cost of compaction stays proportional to the edits.
+            threshold = max(self.compact_bytes, self._snapshot_size // 2)
+            if self._file_size(self.journal_path) > threshold:
+                self._compact()
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot."""
+
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        data = {
+            "version": 2,
+            "notes": [{"id": nid, "text": self._notes[nid]} for nid in self._order],
+        }
+        atomic_write_text(self.path, json.dumps(data))
+        self._snapshot_size = self._file_size(self.path)
+        # Replaying stale records on top of the new snapshot is harmless, so a
+        # crash between these two steps loses nothing.
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+
+class AutosaveWorker:
+    """Background thread that hands note changes to a :class:`NotesStore`.
+
+    Submissions are coalesced: if several arrive while a write is running,
+    only the latest text of each note is written afterwards.  A batch whose
+    write fails is kept and retried after ``retry_delay`` seconds; the
+    failure is left in :attr:`error` for the Tk side to report.
+    """
+
+    def __init__(
+        self, store: NotesStore, history: NoteHistory | None = None, retry_delay: float = 5.0
+    ) -> None:
+        self.store = store
+        self.history = history
+        self.retry_delay = retry_delay
+        # Exception of the last failed write, None once a write succeeds.
+        self.error: Exception | None = None
+        self._cond = threading.Condition()
+        self._pending: dict[str, str] = {}
+        self._order: list[str] | None = None
+        self._busy = False
+        self._closed = False
+        self._attempts = 0
+        self._thread = threading.Thread(
+            target=self._run, name="notes-autosave", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, changes: dict[str, str], order: list[str]) -> None:
+        """Queue ``changes`` for writing; returns immediately."""
+
+        with self._cond:
+            self._pending.update(changes)
+            self._order = list(order)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until everything submitted so far has been written.
+
+        Also returns once a write attempted meanwhile has failed.
+        """
+
+        with self._cond:
+            attempts = self._attempts
+            self._cond.wait_for(
+                lambda: not self._busy
+                and (
+                    self._order is None
+                    or (self.error is not None and self._attempts > attempts)
+                ),
+                timeout=timeout,
+            )
+
+    @property
+    def idle(self) -> bool:
+        """Whether nothing is being written or waiting to be."""
+
+        with self._cond:
+            return self._order is None and not self._busy
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write outstanding changes and stop the worker thread.
+
+        Changes are tried once more; if that fails too, :attr:`error` says why.
+        """
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._order is not None or self._closed)
+                if self._order is None:
+                    return
+                changes, order = self._pending, self._order
+                self._pending, self._order = {}, None
+                self._busy = True
+            error = None
+            try:
+                self.store.write(changes, order)
+            except Exception as exc:  # disk full, permissions, ...
+                error = exc
+            else:
+                self._record_history(changes)
+            with self._cond:
+                self._busy = False
+                self._attempts += 1
+                self.error = error
+                if error is not None:
+                    # Keep the batch; anything submitted meanwhile is newer.
+                    changes.update(self._pending)
+                    self._pending = changes
+                    if self._order is None:
+                        self._order = order
+                self._cond.notify_all()
+                if error is not None:
+                    if self._closed:
+                        return  # the final attempt failed as well
+                    self._cond.wait_for(lambda: self._closed, timeout=self.retry_delay)
+
+    def _record_history(self, changes: dict[str, str]) -> None:
+        # The notes are saved already; a version that cannot be recorded
+        # is skipped, not retried.
+        if self.history is None:
+            return
+        for nid, text in changes.items():
+            try:
+                self.history.record(nid, text)
+            except Exception:
+                pass
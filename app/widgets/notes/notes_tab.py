@@ -15,13 +15,69 @@ context menu live on the instance itself.
 
 from __future__ import annotations
 
-import json
+import os
+import threading
+import time
+import zlib
 import tkinter as tk
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, filedialog, messagebox
 
 from utils.tooltip import ToolTip
 from core.config import CONFIG
+from widgets.notes.chunked_insert import (
+    ChunkedInserter,
+    iter_file_chunks,
+    iter_string_chunks,
+)
+from widgets.notes.edit_observer import EditObserver, TextEdit
+from widgets.notes.highlight import Highlighter
+from widgets.notes.history import NoteHistory
+from widgets.notes.notes_store import AutosaveWorker, NotesStore, new_note_id
+from widgets.notes.search_bar import SearchBar
+from widgets.notes.sync import SyncReport, export_notes, import_notes
+from widgets.notes.undo import (
+    TextUndo,
+    UndoHistory,
+    content_checksum,
+    load_histories,
+    save_histories,
+)
+
+
+class NotePage:
+    """A single note: its stable id plus the widgets showing it.
+
+    Pages start out as a bare placeholder ``frame``; the text widget is only
+    created once the tab is first selected.  ``content`` is a cached snapshot
+    of the note's text.  The widget's ``<<Modified>>`` flag marks the
+    snapshot ``stale``, and only then does :meth:`get_text` copy the text
+    out of Tk again.
+    """
+
+    def __init__(self, note_id: str, frame: ttk.Frame, content: str) -> None:
+        self.note_id = note_id
+        self.frame = frame
+        self.content = content
+        self.text: tk.Text | None = None
+        self.undo: TextUndo | None = None
+        self.highlighter: Highlighter | None = None
+        self.stale = False
+        # True while ``content`` is still being streamed into the widget.
+        self.loading = False
+
+    def get_text(self) -> str:
+        """Return the current text of the note."""
+
+        if self.text is None or self.loading:
+            return self.content
+        # ``<<Modified>>`` is delivered asynchronously, so also consult the
+        # flag itself in case the event has not been processed yet.
+        if self.stale or self.text.edit_modified():
+            self.content = self.text.get("1.0", tk.END).rstrip()
+            self.stale = False
+        return self.content
 
 
 class NotesTab:
@@ -42,12 +98,80 @@ class NotesTab:
             The root ``tk`` widget used for scheduling events and creating
             context menus.
         saved_notes:
-            Optional list of notes to populate initially.  If ``None`` an
-            empty note is created.
+            Optional list of notes to populate initially.  If ``None`` the
+            notes are loaded from the notes store.
         """
 
         self.root = root
-        self.saved_notes = saved_notes if saved_notes is not None else self.load_notes()
+        autosave_cfg = CONFIG["notes"].get("autosave", {})
+        self.store = NotesStore(
+            self.notes_file,
+            compact_bytes=autosave_cfg.get("compact_bytes", 8 * 1024 * 1024),
+        )
+        if saved_notes is None:
+            self.saved_notes = self.store.load()
+        else:
+            self.saved_notes = [(new_note_id(), content) for content in saved_notes]
+
+        # Version history, recorded by the autosave worker after each write.
+        history_cfg = CONFIG["notes"].get("history", {})
+        self.history: NoteHistory | None = None
+        if history_cfg.get("enabled", True):
+            self.history = NoteHistory(
+                self.notes_file.parent / history_cfg.get("dir", "notes_history"),
+                keyframe_every=history_cfg.get("keyframe_every", 20),
+                max_bytes=history_cfg.get("max_bytes", 5 * 1024 * 1024),
+                min_interval=history_cfg.get("min_interval", 600),
+            )
+            if saved_notes is None:
+                # Closed notes keep their history (see "Closed Notes...")
+                # until it has not been written for ``closed_days``.
+                threading.Thread(
+                    target=self.history.expire,
+                    args=(
+                        {note_id for note_id, _ in self.saved_notes},
+                        history_cfg.get("closed_days", 30) * 86400,
+                    ),
+                    name="notes-history-expire",
+                    daemon=True,
+                ).start()
+
+        # Debounced autosave: edits mark pages dirty and (re)arm a timer, the
+        # actual disk write happens on the worker thread.
+        self.autosaver = AutosaveWorker(self.store, self.history)
+        self._autosave_delay: int = autosave_cfg.get("delay", 1000)
+        self._autosave_max_wait: float = autosave_cfg.get("max_wait", 10000) / 1000
+        self._autosave_id: str | None = None
+        self._dirty: set[str] = set()
+        self._dirty_since = 0.0
+        # Watches the worker for failed writes (see _watch_autosave).
+        self._watch_id: str | None = None
+        self._save_error: str | None = None
+        # Worker thread and outcome of a running import; autosave waits
+        # for it, as both write the whole page order to the store.
+        self._importing: tuple[threading.Thread, list] | None = None
+
+        # Notes larger than this are streamed into the widget in chunks.
+        stream_cfg = CONFIG["notes"].get("stream", {})
+        self._stream_threshold: int = stream_cfg.get("threshold", 256 * 1024)
+        self._stream_chunk: int = stream_cfg.get("chunk_size", 64 * 1024)
+        self._stream_delay: int = stream_cfg.get("delay", 1)
+
+        # Bounded undo per page, optionally persisted next to the notes.
+        undo_cfg = CONFIG["notes"].get("undo", {})
+        self._undo_options = {
+            "budget": undo_cfg.get("budget_bytes", 1024 * 1024),
+            "max_steps": undo_cfg.get("max_steps", 1000),
+            "group_ms": undo_cfg.get("group_ms", 1000),
+        }
+        self.undo_file = self.notes_file.with_suffix(".undo.json")
+        self._persist_undo: bool = undo_cfg.get("persist", True)
+        self._saved_undo = load_histories(self.undo_file) if self._persist_undo else {}
+
+        # Incremental syntax/markup highlighting of note pages.
+        highlight_cfg = CONFIG["notes"].get("highlight", {})
+        self._highlight: bool = highlight_cfg.get("enabled", True)
+        self._highlight_batch_ms: int = highlight_cfg.get("batch_ms", 8)
 
         # Widgets created during :meth:`build`.
         self.outer_frame: ttk.Frame | None = None
@@ -55,39 +179,119 @@ class NotesTab:
         self.plus_tab: ttk.Frame | None = None
 
         # Internal state
-        self.notes_pages: list[tk.Text] = []
+        self.notes_pages: list[NotePage] = []
         self._note_menu: tk.Menu | None = None
+        self.search = SearchBar(self)
 
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
-    @classmethod
-    def load_notes(cls) -> list[str]:
-        """Load saved notes from file or return a default list."""
-
-        try:
-            with open(cls.notes_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-        except Exception:
-            pass
-        return [""]
+    def save(self) -> None:
+        """Write pending changes and wait for the autosave worker to finish.
 
-    @classmethod
-    def save_notes(cls, notes: list[str]) -> None:
-        """Persist notes to the notes file."""
+        Called when the application closes.
+        """
 
-        try:
-            with open(cls.notes_file, "w", encoding="utf-8") as f:
-                json.dump(notes, f)
-        except Exception:
-            pass
+        if self._autosave_id is not None:
+            self.root.after_cancel(self._autosave_id)
+        if self._watch_id is not None:
+            self.root.after_cancel(self._watch_id)
+        if self._importing is not None:
+            # Open the imported notes first, or saving the page order
+            # would delete them again.
+            thread, outcome = self._importing
+            thread.join()
+            self._importing = None
+            if outcome and isinstance(outcome[0], SyncReport):
+                self._apply_import(outcome[0])
+        self._autosave()
+        if self._persist_undo:
+            self._save_undo()
+        self.autosaver.close()
+        if self.autosaver.error is not None:
+            messagebox.showerror(
+                "Notes Not Saved",
+                f"The latest changes could not be saved: {self.autosaver.error}",
+                parent=self.root,
+            )
 
-    def save(self) -> None:
-        """Save current notes to the configured notes file."""
+    def _save_undo(self) -> None:
+        """Persist the undo histories of all pages that have one."""
 
-        self.save_notes(self.get_notes())
+        histories = {}
+        for page in self.notes_pages:
+            if page.undo is None:
+                # Never opened this session: keep what was saved before.
+                if page.note_id in self._saved_undo:
+                    histories[page.note_id] = self._saved_undo[page.note_id]
+                continue
+            history = page.undo.history
+            if history.can_undo() or history.can_redo():
+                data = history.to_data()
+                data["checksum"] = content_checksum(page.get_text())
+                histories[page.note_id] = data
+        save_histories(self.undo_file, histories)
+
+    def _autosave(self) -> None:
+        """Hand the text of dirty pages to the background writer."""
+
+        self._autosave_id = None
+        if self._importing is not None:
+            # The pages lack the notes being imported; save once they exist.
+            self._autosave_id = self.root.after(self._autosave_delay, self._autosave)
+            return
+        changes = {
+            page.note_id: page.get_text()
+            for page in self.notes_pages
+            if page.note_id in self._dirty
+        }
+        self._dirty.clear()
+        self.autosaver.submit(changes, [page.note_id for page in self.notes_pages])
+        if self._watch_id is None:
+            self._watch_id = self.root.after(500, self._watch_autosave)
+
+    def _watch_autosave(self) -> None:
+        """Report a failing write once, and keep watching until one succeeds."""
+
+        self._watch_id = None
+        error = self.autosaver.error
+        if error is None:
+            self._save_error = None
+        elif str(error) != self._save_error:
+            self._save_error = str(error)
+            messagebox.showerror(
+                "Notes Not Saved",
+                f"Saving the notes failed; retrying in the background.\n\n{error}",
+                parent=self.root,
+            )
+        if error is not None or not self.autosaver.idle:
+            self._watch_id = self.root.after(500, self._watch_autosave)
+
+    def _mark_dirty(self, note_id: str | None = None) -> None:
+        """Flag ``note_id`` (or just the page order) as needing a save."""
+
+        if not self._dirty and self._autosave_id is None:
+            self._dirty_since = time.monotonic()
+        if note_id is not None:
+            self._dirty.add(note_id)
+
+        if self._autosave_id is not None:
+            # Keep postponing while the user types, but not forever.
+            if time.monotonic() - self._dirty_since >= self._autosave_max_wait:
+                return
+            self.root.after_cancel(self._autosave_id)
+        self._autosave_id = self.root.after(self._autosave_delay, self._autosave)
+
+    def _on_modified(self, page: NotePage) -> None:
+        """Handle ``<<Modified>>`` of a page's text widget."""
+
+        assert page.text is not None
+        if not page.text.edit_modified():
+            return  # fired by the reset below
+        page.text.edit_modified(False)
+        if not page.loading:
+            page.stale = True
+            self._mark_dirty(page.note_id)
 
     # ------------------------------------------------------------------
     # Building and utilities
@@ -102,6 +306,9 @@ class NotesTab:
 
         self.outer_frame = ttk.Frame(parent_notebook)
 
+        # Search bar across all notes
+        self.search.build(self.outer_frame).pack(fill="x", padx=5, pady=(5, 0))
+
         # Inner notebook to hold individual note pages
         self.notes_notebook = ttk.Notebook(self.outer_frame)
         self.notes_notebook.pack(expand=True, fill="both", padx=5, pady=5)
@@ -109,13 +316,17 @@ class NotesTab:
         # ``+`` tab that is always present for creating new notes
         self.plus_tab = ttk.Frame(self.notes_notebook)
 
-        # Create existing notes
-        for i, content in enumerate(self.saved_notes):
-            self._add_note_page(content, index=i + 1)
+        # Create existing notes as placeholders; only the selected one gets
+        # a text widget right away.
+        for i, (note_id, content) in enumerate(self.saved_notes):
+            self._add_note_page(content, index=i + 1, note_id=note_id)
+        self.saved_notes = []
 
         # Add the ``+`` tab at the end
         self.notes_notebook.add(self.plus_tab, text=" + ")
         ToolTip(self.plus_tab, CONFIG["notes"]["tooltip"]["add_note"])
+        self._materialize_selected()
+        self.search.index_all_later()
 
         # Bind tab change after a short delay to ensure the notebook exists
         def _bind_later() -> None:
@@ -128,9 +339,13 @@ class NotesTab:
 
     # ------------------------------------------------------------------
     def get_notes(self) -> list[str]:
-        """Return the text content for all note pages."""
+        """Return the text content for all note pages.
+
+        Only pages edited since the last call are read back from their
+        widgets; everything else comes from the cached snapshots.
+        """
 
-        return [txt.get("1.0", tk.END).rstrip() for txt in self.notes_pages]
+        return [page.get_text() for page in self.notes_pages]
 
     # ------------------------------------------------------------------
     @staticmethod
@@ -144,18 +359,18 @@ class NotesTab:
         return None
 
     # ------------------------------------------------------------------
-    def _add_note_page(self, content: str = "", index: int | None = None) -> ttk.Frame:
-        """Create a new note page populated with ``content``."""
+    def _add_note_page(
+        self, content: str = "", index: int | None = None, note_id: str | None = None
+    ) -> ttk.Frame:
+        """Create a new (placeholder) note page holding ``content``.
+
+        Pages created without a ``note_id`` are new notes and get saved on
+        the next autosave.
+        """
 
         assert self.notes_notebook is not None
         frame = ttk.Frame(self.notes_notebook)
-        text = scrolledtext.ScrolledText(frame, wrap="word", undo=True)
-        text.pack(expand=True, fill="both")
-        text.insert("1.0", content)
-
-        text.bind("<Control-a>", self._select_all)
-        text.bind("<Button-1>", lambda e, t=text: t.focus_set())
-        text.bind("<Button-3>", lambda e, fr=frame: self._show_context_menu(e, fr))
+        page = NotePage(note_id or new_note_id(), frame, content)
 
         # Insert before ``+`` tab if it exists
         if self.plus_tab and str(self.plus_tab) in self.notes_notebook.tabs():
@@ -171,9 +386,394 @@ class NotesTab:
                 text=f"{CONFIG['notes']['label']} {index or len(self.notes_pages) + 1}",
             )
 
-        self.notes_pages.append(text)
+        self.notes_pages.append(page)
+        if note_id is None:
+            self._mark_dirty(page.note_id)
+            self.search.note_added(page)
         return frame
 
+    def add_note(self, content: str) -> NotePage:
+        """Add a new note holding ``content`` and show it."""
+
+        self._add_note_page(content=content)
+        page = self.notes_pages[-1]
+        self.select_page(page)
+        return page
+
+    # ------------------------------------------------------------------
+    def _materialize(self, page: NotePage) -> None:
+        """Create and fill the text widget of ``page`` if not done yet."""
+
+        if page.text is not None:
+            return
+        # Tk's own unbounded undo is replaced by :class:`TextUndo`.
+        text = scrolledtext.ScrolledText(page.frame, wrap="word", undo=False)
+        text.pack(expand=True, fill="both")
+        page.text = text
+        # The stored text is already known to every consumer; edits made
+        # while loading it must not be reported as changes.
+        page.loading = True
+
+        saved = self._saved_undo.pop(page.note_id, None)
+        if saved and saved.get("checksum") == content_checksum(page.content):
+            history = UndoHistory.from_data(saved, **self._undo_options)
+        else:
+            history = UndoHistory(**self._undo_options)
+        page.undo = TextUndo(text, history)
+
+        observer = EditObserver(text)
+        observer.add_listener(lambda edit, p=page: self._on_edit(p, edit))
+
+        if self._highlight:
+            highlighter = Highlighter(text, self._highlight_batch_ms)
+            page.highlighter = highlighter
+
+            def _yscroll(first: str, last: str, t=text, h=highlighter) -> None:
+                t.vbar.set(first, last)
+                h.view_changed()
+
+            text.configure(yscrollcommand=_yscroll)
+
+        text.bind("<<Modified>>", lambda e, p=page: self._on_modified(p))
+        text.bind("<<Paste>>", lambda e, p=page: self._on_paste(p))
+        text.bind("<<Undo>>", lambda e, u=page.undo: u.undo())
+        text.bind("<<Redo>>", lambda e, u=page.undo: u.redo())
+        text.bind("<Control-a>", self._select_all)
+        text.bind("<Control-f>", lambda e: self.search.focus())
+        text.bind("<Button-1>", lambda e, t=text: t.focus_set())
+        text.bind("<Button-3>", lambda e, p=page: self._show_context_menu(e, p))
+
+        content = page.content
+        if len(content) <= self._stream_threshold:
+            text.insert("1.0", content)
+            text.edit_reset()
+            text.edit_modified(False)
+            page.loading = False
+            if page.highlighter is not None:
+                page.highlighter.start()
+            return
+
+        def _loaded() -> None:
+            page.loading = False
+            text.edit_modified(False)
+            if page.highlighter is not None:
+                page.highlighter.start()
+
+        self._stream_into(
+            page,
+            iter_string_chunks(content, self._stream_chunk),
+            len(content),
+            "1.0",
+            readonly=True,
+            on_done=_loaded,
+        )
+
+    def _materialize_selected(self) -> None:
+        """Materialize the page of the currently selected tab."""
+
+        page = self.selected_page()
+        if page is not None:
+            self._materialize(page)
+            self.search.page_shown(page)
+
+    def selected_page(self) -> NotePage | None:
+        """Return the page of the selected tab (``None`` for the ``+`` tab)."""
+
+        assert self.notes_notebook is not None
+        selected = self.notes_notebook.select()
+        if not selected or selected == str(self.plus_tab):
+            return None
+        idx = self.notes_notebook.index(selected)
+        return self.notes_pages[idx] if idx < len(self.notes_pages) else None
+
+    def select_page(self, page: NotePage) -> None:
+        """Bring ``page`` to the front, creating its widget if needed."""
+
+        assert self.notes_notebook is not None
+        self.notes_notebook.select(page.frame)
+        self._materialize(page)
+
+    def _on_edit(self, page: NotePage, edit: TextEdit) -> None:
+        """Forward an edit reported by a page's observer to its consumers."""
+
+        if page.loading:
+            return
+        assert page.undo is not None
+        page.undo.on_edit(edit)
+        self.search.on_edit(page, edit)
+        if page.highlighter is not None:
+            page.highlighter.on_edit(edit)
+
+    # ------------------------------------------------------------------
+    def _stream_into(
+        self,
+        page: NotePage,
+        chunks: Iterator[str],
+        total: int,
+        index: str,
+        readonly: bool = False,
+        on_done: Callable[[], None] | None = None,
+    ) -> None:
+        """Stream ``chunks`` into the page's text widget with a progress bar."""
+
+        assert page.text is not None
+        progress = ttk.Progressbar(page.frame, mode="determinate", maximum=1.0)
+        progress.pack(side="bottom", fill="x", before=page.text)
+
+        # A streamed paste or file is undone in one step.
+        assert page.undo is not None
+        page.undo.history.begin_compound()
+
+        def _done() -> None:
+            progress.destroy()
+            assert page.undo is not None
+            page.undo.history.end_compound()
+            if on_done is not None:
+                on_done()
+
+        ChunkedInserter(
+            page.text,
+            chunks,
+            total,
+            index=index,
+            readonly=readonly,
+            delay=self._stream_delay,
+            on_progress=lambda fraction: progress.configure(value=fraction),
+            on_done=_done,
+        ).start()
+
+    def _on_paste(self, page: NotePage) -> str | None:
+        """Stream large clipboard contents instead of one blocking insert."""
+
+        assert page.text is not None
+        try:
+            data = page.text.clipboard_get()
+        except tk.TclError:
+            return None
+        if len(data) <= self._stream_threshold:
+            return None  # let Tk's default binding handle it
+
+        try:
+            page.text.delete("sel.first", "sel.last")
+        except tk.TclError:
+            pass  # no selection
+        self._stream_into(
+            page, iter_string_chunks(data, self._stream_chunk), len(data), "insert"
+        )
+        return "break"
+
+    def _open_file(self, page: NotePage) -> None:
+        """Insert a file at the cursor, streaming it if it is large."""
+
+        assert page.text is not None
+        path = filedialog.askopenfilename(parent=self.root, title="Open File")
+        if not path:
+            return
+        try:
+            size = os.path.getsize(path)
+            if size <= self._stream_threshold:
+                page.text.insert(
+                    "insert", Path(path).read_text(encoding="utf-8", errors="replace")
+                )
+                return
+            chunks = iter_file_chunks(Path(path), self._stream_chunk)
+        except OSError:
+            return
+        self._stream_into(page, chunks, size, "insert")
+
+    def _show_history(self, page: NotePage) -> None:
+        """List the saved versions of ``page`` and offer to restore one."""
+
+        assert self.history is not None
+        versions = list(reversed(self.history.versions(page.note_id)))
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Note History")
+        dialog.transient(self.root)
+
+        listbox = tk.Listbox(dialog, height=10, width=30)
+        listbox.pack(fill="both", expand=True, padx=5, pady=5)
+        for version in versions:
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(version.timestamp))
+            listbox.insert(tk.END, stamp)
+        if not versions:
+            listbox.insert(tk.END, "No saved versions yet")
+
+        def _restore() -> None:
+            selection = listbox.curselection()
+            if not selection or not versions:
+                return
+            assert self.history is not None
+            version = versions[selection[0]]
+            try:
+                content = self.history.restore(page.note_id, version)
+            except LookupError as exc:  # pruned while the dialog was open
+                messagebox.showerror("Note History", str(exc).capitalize(), parent=dialog)
+                return
+            dialog.destroy()
+            self._replace_text(page, content)
+
+        restore_btn = ttk.Button(dialog, text="Restore", command=_restore)
+        restore_btn.pack(pady=(0, 5))
+        if not versions:
+            restore_btn.configure(state="disabled")
+        ToolTip(restore_btn, "Replace the note with the selected version (undoable)")
+        listbox.bind("<Double-Button-1>", lambda e: _restore())
+
+    def _show_closed_notes(self) -> None:
+        """List closed notes that still have a history and offer to reopen one."""
+
+        assert self.history is not None
+        open_ids = {page.note_id for page in self.notes_pages}
+        closed = []  # (note_id, newest version, its text), newest first
+        for note_id in self.history.note_ids():
+            if note_id in open_ids:
+                continue
+            versions = self.history.versions(note_id)
+            if not versions:
+                continue
+            try:
+                closed.append((note_id, versions[-1], self.history.restore(note_id, versions[-1])))
+            except (LookupError, OSError, ValueError, zlib.error):
+                continue  # damaged or pruned meanwhile
+            if len(closed) >= 100:
+                break
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Closed Notes")
+        dialog.transient(self.root)
+
+        listbox = tk.Listbox(dialog, height=10, width=50)
+        listbox.pack(fill="both", expand=True, padx=5, pady=5)
+        for _, version, text in closed:
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(version.timestamp))
+            first = next((line.strip() for line in text.splitlines() if line.strip()), "")
+            listbox.insert(tk.END, f"{stamp}  {first[:60]}")
+        if not closed:
+            listbox.insert(tk.END, "No closed notes with a history")
+
+        def _reopen() -> None:
+            selection = listbox.curselection()
+            if not selection or not closed:
+                return
+            note_id, _, text = closed[selection[0]]
+            dialog.destroy()
+            if note_id in {page.note_id for page in self.notes_pages}:
+                return  # reopened meanwhile
+            self._add_note_page(content=text, note_id=note_id)
+            page = self.notes_pages[-1]
+            self.search.note_added(page)
+            self._mark_dirty(note_id)
+            self.select_page(page)
+
+        reopen_btn = ttk.Button(dialog, text="Reopen", command=_reopen)
+        reopen_btn.pack(pady=(0, 5))
+        if not closed:
+            reopen_btn.configure(state="disabled")
+        ToolTip(reopen_btn, "Open the selected note again, as last saved")
+        listbox.bind("<Double-Button-1>", lambda e: _reopen())
+
+    def _replace_text(self, page: NotePage, content: str) -> None:
+        """Replace the whole text of ``page`` as a single undo step."""
+
+        self._materialize(page)
+        assert page.text is not None and page.undo is not None
+        page.undo.history.begin_compound()
+        try:
+            page.text.delete("1.0", tk.END)
+            if len(content) <= self._stream_threshold:
+                page.text.insert("1.0", content)
+            else:
+                self._stream_into(
+                    page, iter_string_chunks(content, self._stream_chunk), len(content), "1.0"
+                )
+        finally:
+            page.undo.history.end_compound()
+
+    def _sync_notes(self, direction: str) -> None:
+        """Export to or import from a directory of text files.
+
+        The files are processed on a worker thread; imported changes are
+        applied to the open pages once it is done.  Autosave is held back
+        until then, so the import and the pages never write the store with
+        different note sets.
+        """
+
+        title = "Export Notes To" if direction == "export" else "Import Notes From"
+        if self._importing is not None:
+            messagebox.showinfo(title, "An import is still running.", parent=self.root)
+            return
+        directory = filedialog.askdirectory(parent=self.root, title=title, mustexist=False)
+        if not directory:
+            return
+
+        # The store must hold every edit made so far.
+        if self._autosave_id is not None:
+            self.root.after_cancel(self._autosave_id)
+        self._autosave()
+        self.autosaver.flush()
+        if self.autosaver.error is not None:
+            # A retried write would race the import with an old page order.
+            messagebox.showerror(
+                title, f"The notes cannot be saved: {self.autosaver.error}", parent=self.root
+            )
+            return
+
+        run = export_notes if direction == "export" else import_notes
+        outcome: list[SyncReport | Exception] = []
+
+        def _work() -> None:
+            # Always leave an outcome: a running import holds back autosave.
+            try:
+                outcome.append(run(self.store, Path(directory)))
+            except Exception as exc:
+                outcome.append(exc)
+
+        def _poll() -> None:
+            if not outcome:
+                self.root.after(50, _poll)
+                return
+            if direction == "import":
+                if self._importing is None:
+                    return  # already applied by save()
+                self._importing = None
+            result = outcome[0]
+            if isinstance(result, Exception):
+                messagebox.showerror(title, str(result), parent=self.root)
+                return
+            if direction == "import":
+                self._apply_import(result)
+            messagebox.showinfo(title, str(result).capitalize(), parent=self.root)
+
+        thread = threading.Thread(target=_work, name=f"notes-{direction}", daemon=True)
+        if direction == "import":
+            self._importing = (thread, outcome)
+        thread.start()
+        self.root.after(50, _poll)
+
+    def _apply_import(self, report: SyncReport) -> None:
+        """Show the notes changed by an import in the open pages."""
+
+        texts = dict(self.store.notes())
+        pages = {page.note_id: page for page in self.notes_pages}
+        for note_id in report.written:
+            page = pages.get(note_id)
+            if page is None or note_id not in texts:
+                continue
+            if page.text is None:
+                page.content = texts[note_id]
+                self.search.note_added(page)
+            else:
+                self._replace_text(page, texts[note_id])
+        for note_id in report.added:
+            if note_id in texts and note_id not in pages:
+                self._add_note_page(content=texts[note_id], note_id=note_id)
+                self.search.note_added(self.notes_pages[-1])
+        for note_id in report.deleted:
+            page = pages.get(note_id)
+            if page is not None:
+                self._close_note_page(page.frame)
+
     # ------------------------------------------------------------------
     def _on_tab_changed(self, event: tk.Event | None = None) -> None:
         """Handle the inner notebook tab changed event."""
@@ -193,19 +793,47 @@ class NotesTab:
             if len(tabs) >= 2:
                 self.notes_notebook.select(tabs[-2])
 
-    # ------------------------------------------------------------------
-    def _show_context_menu(self, event: tk.Event, frame: ttk.Frame) -> None:
-        """Display a context menu for closing note pages."""
+        self._materialize_selected()
 
-        if len(self.notes_pages) <= 1:
-            return  # don't allow removing the last note
+    # ------------------------------------------------------------------
+    def _show_context_menu(self, event: tk.Event, page: NotePage) -> None:
+        """Display the context menu of a note page."""
 
         if self._note_menu is None:
             self._note_menu = tk.Menu(self.root, tearoff=0)
+            self._note_menu.add_command(label="Open File...", command=lambda: None)
+            self._note_menu.add_command(label="History...", command=lambda: None)
+            self._note_menu.add_command(label="Closed Notes...", command=lambda: None)
+            self._note_menu.add_separator()
+            self._note_menu.add_command(
+                label="Export Notes...", command=lambda: self._sync_notes("export")
+            )
+            self._note_menu.add_command(
+                label="Import Notes...", command=lambda: self._sync_notes("import")
+            )
+            self._note_menu.add_separator()
             self._note_menu.add_command(label="Close Note", command=lambda: None)
 
-        # Always update the command before showing the menu
-        self._note_menu.entryconfigure(0, command=lambda fr=frame: self._close_note_page(fr))
+        # Always update the commands before showing the menu
+        self._note_menu.entryconfigure(
+            "Open File...", command=lambda p=page: self._open_file(p)
+        )
+        self._note_menu.entryconfigure(
+            "History...",
+            command=lambda p=page: self._show_history(p),
+            state="normal" if self.history is not None else "disabled",
+        )
+        self._note_menu.entryconfigure(
+            "Closed Notes...",
+            command=self._show_closed_notes,
+            state="normal" if self.history is not None else "disabled",
+        )
+        self._note_menu.entryconfigure(
+            "Close Note",
+            command=lambda fr=page.frame: self._close_note_page(fr),
+            # don't allow removing the last note
+            state="normal" if len(self.notes_pages) > 1 else "disabled",
+        )
 
         try:
             self._note_menu.tk_popup(event.x_root, event.y_root)
@@ -235,9 +863,14 @@ class NotesTab:
                     break
 
         if idx < len(self.notes_pages):
+            # Its history stays, so the note can be reopened (Closed Notes...).
+            self.search.note_removed(self.notes_pages[idx])
+            if self.notes_pages[idx].highlighter is not None:
+                self.notes_pages[idx].highlighter.stop()
             del self.notes_pages[idx]
 
         self.notes_notebook.forget(frame)
+        self._mark_dirty()
 
         # Re-label remaining tabs sequentially
         for i, tab_id in enumerate(self.notes_notebook.tabs()):
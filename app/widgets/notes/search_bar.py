@@ -0,0 +1,242 @@
+"""Search bar for the Notes tab.
+
+:class:`SearchBar` owns the :class:`SearchIndex` over all notes and the
+widgets to query it.  The index is built once after start-up on a worker thread
+(one :class:`NoteIndex` per note, merged on the Tk thread as they arrive)
+and afterwards kept current from the edits reported by each page's
+:class:`EditObserver`.  Matches are highlighted with text tags and
+"next match" walks through them across tabs.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import TYPE_CHECKING
+
+from utils.tooltip import ToolTip
+from widgets.notes.edit_observer import TextEdit
+from widgets.notes.search_index import TOKEN_RE, NoteIndex, SearchIndex, tokenize
+
+if TYPE_CHECKING:
+    from widgets.notes.notes_tab import NotePage, NotesTab
+
+
+class SearchBar:
+    """Entry + "next match" button searching every note of a ``NotesTab``."""
+
+    HIT_TAG = "search_hit"
+    CURRENT_TAG = "search_current"
+
+    def __init__(self, tab: NotesTab) -> None:
+        self.tab = tab
+        self.index = SearchIndex()
+
+        self.frame: ttk.Frame | None = None
+        self.entry: ttk.Entry | None = None
+        self.query_var = tk.StringVar()
+        self.count_var = tk.StringVar(value="")
+
+        # Background build: notes still being indexed, and those of them
+        # edited meanwhile (their prebuilt index is outdated on arrival).
+        self._built: queue.SimpleQueue[tuple[str, NoteIndex] | None] = queue.SimpleQueue()
+        self._building: set[str] = set()
+        self._edited_while_building: set[str] = set()
+        self._results: dict[str, list[int]] = {}
+        self._matches: list[tuple[str, int]] = []
+        self._current = -1
+        self._stale = False
+        self._highlighted: set[str] = set()
+
+    # ------------------------------------------------------------------
+    def build(self, parent: tk.Misc) -> ttk.Frame:
+        """Create the search widgets and return their frame."""
+
+        self.frame = ttk.Frame(parent)
+
+        self.entry = ttk.Entry(self.frame, textvariable=self.query_var)
+        self.entry.pack(side="left", fill="x", expand=True)
+        self.entry.bind("<Return>", lambda e: self.next_match())
+        self.entry.bind("<KP_Enter>", lambda e: self.next_match())
+        self.entry.bind("<Escape>", lambda e: self.query_var.set(""))
+        ToolTip(self.entry, "Search all notes (Enter: next match)")
+
+        ttk.Label(self.frame, textvariable=self.count_var, width=9, anchor="e").pack(
+            side="left"
+        )
+
+        next_btn = ttk.Button(self.frame, text="↓", width=3, command=self.next_match)
+        next_btn.pack(side="left", padx=(2, 0))
+        ToolTip(next_btn, "Next match")
+
+        self.query_var.trace_add("write", lambda *_: self._run_query())
+        return self.frame
+
+    def focus(self) -> str:
+        """Focus the search entry (bound to ``Ctrl+F`` on note pages)."""
+
+        if self.entry is not None:
+            self.entry.focus_set()
+            self.entry.select_range(0, tk.END)
+        return "break"
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def index_all_later(self) -> None:
+        """Index every note on a worker thread without blocking start-up."""
+
+        jobs = [(page.note_id, page.get_text()) for page in self.tab.notes_pages]
+        self._building = {note_id for note_id, _ in jobs}
+        threading.Thread(
+            target=self._build_worker, args=(jobs,), name="notes-index", daemon=True
+        ).start()
+        self.tab.root.after(50, self._collect_built)
+
+    def _build_worker(self, jobs: list[tuple[str, str]]) -> None:
+        for note_id, text in jobs:
+            self._built.put((note_id, NoteIndex(text)))
+        self._built.put(None)
+
+    def _collect_built(self) -> None:
+        """Merge the notes indexed so far (runs on the Tk thread)."""
+
+        pages = self._pages_by_id()
+        finished = False
+        while True:
+            try:
+                item = self._built.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+                break
+            note_id, built = item
+            self._building.discard(note_id)
+            page = pages.get(note_id)
+            if page is None:
+                continue  # closed meanwhile
+            if note_id in self._edited_while_building:
+                self.index.set_note(note_id, page.get_text())
+            else:
+                self.index.add_note(note_id, built)
+
+        if not finished:
+            self.tab.root.after(50, self._collect_built)
+            return
+        self._edited_while_building.clear()
+        if self.query_var.get().strip():
+            self._run_query()
+
+    def note_added(self, page: NotePage) -> None:
+        self.index.set_note(page.note_id, page.content)
+
+    def note_removed(self, page: NotePage) -> None:
+        self.index.remove_note(page.note_id)
+        self._stale = True
+
+    def on_edit(self, page: NotePage, edit: TextEdit) -> None:
+        """Re-index just the lines touched by ``edit``."""
+
+        if page.loading or page.text is None:
+            return
+        if page.note_id not in self.index:
+            if page.note_id in self._building:
+                self._edited_while_building.add(page.note_id)
+            return
+        line = edit.line
+        new_text = page.text.get(f"{line}.0", f"{line + edit.added_lines}.end")
+        self.index.replace_lines(
+            page.note_id, line - 1, edit.removed_lines + 1, new_text.split("\n")
+        )
+        self._stale = True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _run_query(self) -> None:
+        self._clear_highlights()
+        query = self.query_var.get()
+        self._results = self.index.search(query)
+        self._stale = False
+
+        order = {page.note_id: i for i, page in enumerate(self.tab.notes_pages)}
+        self._matches = [
+            (note_id, line)
+            for note_id in sorted(self._results, key=lambda n: order.get(n, len(order)))
+            for line in self._results[note_id]
+        ]
+        self._current = -1
+        if not query.strip():
+            self.count_var.set("")
+        else:
+            self.count_var.set(f"0/{len(self._matches)}")
+        page = self.tab.selected_page()
+        if page is not None:
+            self.page_shown(page)
+
+    def next_match(self) -> None:
+        """Jump to the next match, switching tabs when needed."""
+
+        if self._stale:
+            current = self._current
+            self._run_query()
+            self._current = current
+        if not self._matches:
+            return
+
+        self._current = (self._current + 1) % len(self._matches)
+        note_id, line = self._matches[self._current]
+        self.count_var.set(f"{self._current + 1}/{len(self._matches)}")
+
+        page = self._pages_by_id().get(note_id)
+        if page is None:
+            return
+        self.tab.select_page(page)
+        self.page_shown(page)
+        assert page.text is not None
+        page.text.tag_remove(self.CURRENT_TAG, "1.0", tk.END)
+        for start, end in self._token_spans(page.text, line + 1):
+            page.text.tag_add(self.CURRENT_TAG, start, end)
+        page.text.mark_set("insert", f"{line + 1}.0")
+        page.text.see(f"{line + 1}.0")
+
+    def page_shown(self, page: NotePage) -> None:
+        """Highlight the matches on ``page`` once it is visible."""
+
+        if page.text is None or page.loading or page.note_id in self._highlighted:
+            return
+        lines = self._results.get(page.note_id)
+        if not lines:
+            return
+        text = page.text
+        text.tag_configure(self.HIT_TAG, background="#fff59d")
+        text.tag_configure(self.CURRENT_TAG, background="#ffb74d")
+        for line in lines:
+            for start, end in self._token_spans(text, line + 1):
+                text.tag_add(self.HIT_TAG, start, end)
+        self._highlighted.add(page.note_id)
+
+    # ------------------------------------------------------------------
+    def _token_spans(self, text: tk.Text, line: int) -> list[tuple[str, str]]:
+        tokens = set(tokenize(self.query_var.get()))
+        content = text.get(f"{line}.0", f"{line}.end")
+        return [
+            (f"{line}.{m.start()}", f"{line}.{m.end()}")
+            for m in TOKEN_RE.finditer(content)
+            if m.group().lower() in tokens
+        ]
+
+    def _clear_highlights(self) -> None:
+        pages = self._pages_by_id()
+        for note_id in self._highlighted:
+            page = pages.get(note_id)
+            if page is not None and page.text is not None:
+                page.text.tag_remove(self.HIT_TAG, "1.0", tk.END)
+                page.text.tag_remove(self.CURRENT_TAG, "1.0", tk.END)
+        self._highlighted.clear()
+
+    def _pages_by_id(self) -> dict[str, NotePage]:
+        return {page.note_id: page for page in self.tab.notes_pages}
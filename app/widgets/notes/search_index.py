@@ -0,0 +1,163 @@
+"""In-memory inverted index over the lines of all notes.
+
+Every token maps to the notes and lines it occurs on.  Lines are kept as
+small objects rather than numbers, so inserting or removing a line only
+requires renumbering (done lazily, on the next query) instead of touching
+every posting below it.  Edits are applied with :meth:`SearchIndex.replace_lines`
+using the line range reported by the edit, so typing never rescans a note.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into lower-cased word tokens."""
+
+    return TOKEN_RE.findall(text.lower())
+
+
+class _Line:
+    __slots__ = ("tokens", "number")
+
+    def __init__(self, tokens: frozenset[str], number: int) -> None:
+        self.tokens = tokens
+        self.number = number
+
+
+class NoteIndex:
+    """Index of a single note, built without touching a :class:`SearchIndex`.
+
+    Building only reads the given string, so it can run on a worker thread;
+    :meth:`SearchIndex.add_note` then merges it on the owning thread.
+    """
+
+    __slots__ = ("lines", "postings")
+
+    def __init__(self, text: str) -> None:
+        findall = TOKEN_RE.findall
+        self.lines: list[_Line] = []
+        self.postings: dict[str, set[_Line]] = {}
+        postings = self.postings
+        for number, raw in enumerate(text.lower().split("\n")):
+            line = _Line(frozenset(findall(raw)), number)
+            self.lines.append(line)
+            for token in line.tokens:
+                bucket = postings.get(token)
+                if bucket is None:
+                    postings[token] = {line}
+                else:
+                    bucket.add(line)
+
+
+class SearchIndex:
+    """Token -> note -> lines index with incremental line updates.
+
+    Line numbers are 0-based.  A query matches a line when every query token
+    occurs on it (whole tokens, case-insensitive).
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[str, set[_Line]]] = {}
+        self._lines: dict[str, list[_Line]] = {}
+        # Per note: first line whose ``number`` may be out of date.
+        self._renumber_from: dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    def __contains__(self, note_id: str) -> bool:
+        return note_id in self._lines
+
+    def set_note(self, note_id: str, text: str) -> None:
+        """(Re)index the complete text of a note."""
+
+        self.add_note(note_id, NoteIndex(text))
+
+    def add_note(self, note_id: str, built: NoteIndex) -> None:
+        """Install a prebuilt :class:`NoteIndex`, replacing any old one."""
+
+        self.remove_note(note_id)
+        self._lines[note_id] = built.lines
+        postings = self._postings
+        for token, lines in built.postings.items():
+            notes = postings.get(token)
+            if notes is None:
+                postings[token] = {note_id: lines}
+            else:
+                notes[note_id] = lines
+
+    def remove_note(self, note_id: str) -> None:
+        for line in self._lines.pop(note_id, []):
+            self._unpost(note_id, line)
+        self._renumber_from.pop(note_id, None)
+
+    def replace_lines(
+        self, note_id: str, start: int, count: int, new_lines: Iterable[str]
+    ) -> None:
+        """Replace ``count`` lines from ``start`` with ``new_lines``."""
+
+        lines = self._lines.setdefault(note_id, [])
+        for line in lines[start : start + count]:
+            self._unpost(note_id, line)
+
+        added = []
+        for offset, text in enumerate(new_lines):
+            line = _Line(frozenset(tokenize(text)), start + offset)
+            added.append(line)
+            self._post(note_id, line)
+        lines[start : start + count] = added
+
+        if len(added) != count:
+            old = self._renumber_from.get(note_id, len(lines))
+            self._renumber_from[note_id] = min(old, start + len(added))
+
+    # ------------------------------------------------------------------
+    def search(self, query: str) -> dict[str, list[int]]:
+        """Return ``{note_id: sorted line numbers}`` of lines matching ``query``."""
+
+        tokens = set(tokenize(query))
+        if not tokens:
+            return {}
+        # Start from the rarest token to keep the intersections small.
+        ordered = sorted(tokens, key=lambda t: sum(map(len, self._postings.get(t, {}).values())))
+        first = self._postings.get(ordered[0])
+        if not first:
+            return {}
+
+        result: dict[str, list[int]] = {}
+        for note_id, lines in first.items():
+            matches = lines
+            for token in ordered[1:]:
+                matches = matches & self._postings.get(token, {}).get(note_id, set())
+                if not matches:
+                    break
+            if matches:
+                self._renumber(note_id)
+                result[note_id] = sorted(line.number for line in matches)
+        return result
+
+    # ------------------------------------------------------------------
+    def _post(self, note_id: str, line: _Line) -> None:
+        for token in line.tokens:
+            self._postings.setdefault(token, {}).setdefault(note_id, set()).add(line)
+
+    def _unpost(self, note_id: str, line: _Line) -> None:
+        for token in line.tokens:
+            notes = self._postings[token]
+            lines = notes[note_id]
+            lines.discard(line)
+            if not lines:
+                del notes[note_id]
+                if not notes:
+                    del self._postings[token]
+
+    def _renumber(self, note_id: str) -> None:
+        start = self._renumber_from.pop(note_id, None)
+        if start is None:
+            return
+        lines = self._lines[note_id]
+        for number in range(start, len(lines)):
+            lines[number].number = number
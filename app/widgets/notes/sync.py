@@ -0,0 +1,205 @@
+"""Import and export notes to a directory of plain text files.
+
+Every note becomes one ``.md`` file (``.txt`` files are imported too), which
+makes the notes easy to keep in git.  The directory holds a manifest,
+``.notes-sync.json``, mapping each file to its note id together with the
+file's size, mtime and SHA-256 at the last sync.  This makes syncs
+incremental:
+
+* export only rewrites files whose note text changed;
+* import only reads files whose size or mtime changed, and only updates
+  notes whose content hash differs.
+
+Files are read and written one at a time.  A file that was exported and
+later removed from the directory deletes its note on import; notes deleted
+from the store remove their (unmodified) files on export.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from widgets.notes.notes_store import NotesStore, atomic_write_bytes, new_note_id
+
+MANIFEST_NAME = ".notes-sync.json"
+SUFFIXES = (".md", ".txt")
+_READ_BLOCK = 1024 * 1024
+# Imported text is handed to the store whenever this much is pending.
+_WRITE_BATCH = 16 * 1024 * 1024
+_SLUG_RE = re.compile(r"[^\w-]+")
+
+
+class SyncReport:
+    """Note ids touched by an import or export."""
+
+    def __init__(self) -> None:
+        self.written: list[str] = []
+        self.added: list[str] = []
+        self.deleted: list[str] = []
+        self.unchanged = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.written)} updated, {len(self.added)} added, "
+            f"{len(self.deleted)} deleted, {self.unchanged} unchanged"
+        )
+
+
+# ----------------------------------------------------------------------
+def _load_manifest(directory: Path) -> dict[str, dict]:
+    try:
+        with open(directory / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        files = data.get("files", {})
+        if isinstance(files, dict):
+            return files
+    except Exception:
+        pass
+    return {}
+
+
+def _save_manifest(directory: Path, files: dict[str, dict]) -> None:
+    data = json.dumps({"version": 1, "files": files}, indent=1, sort_keys=True)
+    atomic_write_bytes(directory / MANIFEST_NAME, data.encode("utf-8"))
+
+
+def _entry(note_id: str, digest: str, st: os.stat_result) -> dict:
+    return {"id": note_id, "sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _unchanged_on_disk(st: os.stat_result | None, entry: dict | None) -> bool:
+    return (
+        st is not None
+        and entry is not None
+        and st.st_size == entry.get("size")
+        and st.st_mtime_ns == entry.get("mtime_ns")
+    )
+
+
+def _stat(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def _read(path: Path) -> tuple[bytes, str]:
+    """Read ``path`` block by block, hashing as it goes."""
+
+    digest = hashlib.sha256()
+    data = bytearray()
+    with open(path, "rb") as f:
+        while block := f.read(_READ_BLOCK):
+            digest.update(block)
+            data += block
+    return bytes(data), digest.hexdigest()
+
+
+def file_name_for(note_id: str, text: str) -> str:
+    """Readable, stable file name: first line as a slug plus the id prefix."""
+
+    first = next((line for line in text.splitlines() if line.strip()), "")
+    slug = _SLUG_RE.sub("-", first.lower()).strip("-_")[:40].rstrip("-_")
+    return f"{slug}-{note_id[:8]}.md" if slug else f"{note_id[:8]}.md"
+
+
+# ----------------------------------------------------------------------
+def export_notes(store: NotesStore, directory: Path) -> SyncReport:
+    """Write the notes of ``store`` to ``directory``, one file per note."""
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = _load_manifest(directory)
+    names = {entry["id"]: name for name, entry in files.items()}
+    report = SyncReport()
+
+    exported: set[str] = set()
+    for note_id, text in store.notes():
+        name = names.get(note_id) or file_name_for(note_id, text)
+        if name in files and files[name]["id"] != note_id:
+            name = f"{note_id}.md"
+        path = directory / name
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        entry = files.get(name)
+        st = _stat(path)
+        if entry is not None and entry["sha256"] == digest and _unchanged_on_disk(st, entry):
+            report.unchanged += 1
+        else:
+            atomic_write_bytes(path, data)
+            st = path.stat()
+            (report.written if entry is not None else report.added).append(note_id)
+        files[name] = _entry(note_id, digest, st)
+        exported.add(name)
+
+    for name in [name for name in files if name not in exported]:
+        entry = files.pop(name)
+        path = directory / name
+        # Only remove files nobody touched since we wrote them.
+        if _unchanged_on_disk(_stat(path), entry):
+            path.unlink()
+            report.deleted.append(entry["id"])
+
+    _save_manifest(directory, files)
+    return report
+
+
+def import_notes(store: NotesStore, directory: Path) -> SyncReport:
+    """Bring the notes of ``store`` in line with the files in ``directory``."""
+
+    directory = Path(directory)
+    files = _load_manifest(directory)
+    current = store.notes()
+    notes = dict(current)
+    order = [note_id for note_id, _ in current]
+    changes: dict[str, str] = {}
+    pending = 0
+    report = SyncReport()
+
+    seen: set[str] = set()
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() not in SUFFIXES or not path.is_file():
+            continue
+        seen.add(path.name)
+        entry = files.get(path.name)
+        st = path.stat()
+        if _unchanged_on_disk(st, entry) and entry["id"] in notes:
+            report.unchanged += 1
+            continue
+
+        data, digest = _read(path)
+        note_id = entry["id"] if entry is not None else new_note_id()
+        text = data.decode("utf-8", errors="replace")
+        if note_id not in notes:
+            order.append(note_id)
+            changes[note_id] = text
+            report.added.append(note_id)
+        elif notes[note_id] != text:
+            changes[note_id] = text
+            report.written.append(note_id)
+        else:
+            report.unchanged += 1
+        files[path.name] = _entry(note_id, digest, st)
+        if note_id in changes:
+            pending += len(data)
+            if pending > _WRITE_BATCH:
+                store.write(changes, order)
+                changes, pending = {}, 0
+
+    for name in [name for name in files if name not in seen]:
+        note_id = files.pop(name)["id"]
+        if note_id in order:
+            order.remove(note_id)
+            report.deleted.append(note_id)
+    if not order:
+        note_id = new_note_id()
+        changes[note_id] = ""
+        order.append(note_id)
+
+    store.write(changes, order)
+    _save_manifest(directory, files)
+    return report
@@ -0,0 +1,267 @@
+"""Bounded undo/redo history for note pages.
+
+Tk's built-in undo (``undo=True``) keeps every edit of a page for the whole
+session with no limit.  :class:`UndoHistory` replaces it with a compact
+record of deltas:
+
+* each record is ``[op, line, col, chars]`` (``op`` is ``"i"`` or ``"d"``);
+* consecutive typing / backspacing is merged into a single record;
+* records are grouped into undo steps, and the oldest steps are evicted once
+  the approximate memory used exceeds ``budget`` bytes or ``max_steps``.
+
+:class:`TextUndo` connects a history to a text widget: it records the edits
+reported by an :class:`EditObserver` and replays them on undo/redo.
+Histories can be serialised with :meth:`UndoHistory.to_data` so undo
+survives a restart.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tkinter as tk
+import zlib
+from collections import deque
+from pathlib import Path
+
+from widgets.notes.edit_observer import TextEdit
+from widgets.notes.notes_store import atomic_write_text
+
+# Rough per-record overhead (list + ints) on top of the string itself.
+_RECORD_OVERHEAD = 120
+
+
+def content_checksum(text: str) -> int:
+    """Checksum used to tie a persisted history to the text it belongs to."""
+
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def load_histories(path: Path) -> dict[str, dict]:
+    """Load persisted histories as ``{note_id: data}`` (empty on any error)."""
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def save_histories(path: Path, histories: dict[str, dict]) -> None:
+    """Persist ``{note_id: data}`` atomically."""
+
+    try:
+        atomic_write_text(path, json.dumps(histories))
+    except OSError:
+        pass
+
+
+class UndoHistory:
+    """Undo and redo stacks of grouped delta records with a memory budget."""
+
+    def __init__(
+        self, budget: int = 1024 * 1024, max_steps: int = 1000, group_ms: int = 1000
+    ) -> None:
+        self.budget = budget
+        self.max_steps = max_steps
+        self.group_window = group_ms / 1000
+
+        self._undo: deque[list[list]] = deque()
+        self._redo: list[list[list]] = []
+        self._sizes: deque[int] = deque()
+        self.size = 0
+        self._last_time = 0.0
+        self._separate = True
+        self._compound = 0
+
+    # ------------------------------------------------------------------
+    def record(
+        self, op: str, line: int, col: int, chars: str, now: float | None = None
+    ) -> None:
+        """Record an insert (``"i"``) or delete (``"d"``) at ``line.col``."""
+
+        now = time.monotonic() if now is None else now
+        self._redo.clear()
+        grouped = not self._separate and (
+            self._compound > 0 or now - self._last_time <= self.group_window
+        )
+        self._last_time = now
+        self._separate = False
+
+        if grouped and self._undo:
+            step = self._undo[-1]
+            last = step[-1]
+            before = self._record_size(last)
+            if self._merge(last, op, line, col, chars):
+                self._grow_last(self._record_size(last) - before)
+                return
+            over_selection = last[0] == "d" and op == "i" and last[1:3] == [line, col]
+            if self._compound or over_selection:
+                # Compound edit, or typing over a selection: one step.
+                step.append([op, line, col, chars])
+                self._grow_last(self._record_size(step[-1]))
+                return
+
+        record = [op, line, col, chars]
+        self._undo.append([record])
+        self._sizes.append(self._record_size(record))
+        self.size += self._sizes[-1]
+        self._evict()
+
+    def separate(self) -> None:
+        """Force the next record to start a new undo step."""
+
+        self._separate = True
+
+    def begin_compound(self) -> None:
+        """Group every record until :meth:`end_compound` into one step.
+
+        Calls nest; the step ends with the outermost ``end_compound``.
+        """
+
+        if self._compound == 0:
+            self._separate = True
+        self._compound += 1
+
+    def end_compound(self) -> None:
+        self._compound = max(self._compound - 1, 0)
+        if self._compound == 0:
+            self._separate = True
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def pop_undo(self) -> list[list] | None:
+        """Remove and return the newest step; it moves to the redo stack."""
+
+        if not self._undo:
+            return None
+        self._compound = 0
+        step = self._undo.pop()
+        self.size -= self._sizes.pop()
+        self._redo.append(step)
+        self._separate = True
+        return step
+
+    def pop_redo(self) -> list[list] | None:
+        """Remove and return the newest undone step; it moves back to undo."""
+
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        self._sizes.append(sum(map(self._record_size, step)))
+        self.size += self._sizes[-1]
+        self._separate = True
+        self._evict()
+        return step
+
+    # ------------------------------------------------------------------
+    def to_data(self) -> dict:
+        return {"undo": list(self._undo), "redo": self._redo}
+
+    @classmethod
+    def from_data(cls, data: dict, **kwargs) -> UndoHistory:
+        history = cls(**kwargs)
+        for step in data.get("undo", []):
+            history._undo.append(step)
+            history._sizes.append(sum(map(cls._record_size, step)))
+            history.size += history._sizes[-1]
+        history._redo = list(data.get("redo", []))
+        history._evict()
+        return history
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _merge(last: list, op: str, line: int, col: int, chars: str) -> bool:
+        if last[0] != op or last[1] != line or "\n" in chars or "\n" in last[3]:
+            return False
+        if op == "i" and col == last[2] + len(last[3]):
+            last[3] += chars  # typing forward
+            return True
+        if op == "d" and col + len(chars) == last[2]:
+            last[2], last[3] = col, chars + last[3]  # backspace
+            return True
+        if op == "d" and col == last[2]:
+            last[3] += chars  # forward delete
+            return True
+        return False
+
+    @staticmethod
+    def _record_size(record: list) -> int:
+        return sys.getsizeof(record[3]) + _RECORD_OVERHEAD
+
+    def _grow_last(self, delta: int) -> None:
+        self._sizes[-1] += delta
+        self.size += delta
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._undo and (self.size > self.budget or len(self._undo) > self.max_steps):
+            if len(self._undo) == 1:
+                # A single step over budget: undoing anything older without
+                # it would corrupt the text, so drop the whole history.
+                self._undo.clear()
+                self._sizes.clear()
+                self._redo.clear()
+                self.size = 0
+                return
+            self._undo.popleft()
+            self.size -= self._sizes.popleft()
+
+
+class TextUndo:
+    """Record the edits of a text widget into an :class:`UndoHistory`."""
+
+    def __init__(self, text: tk.Text, history: UndoHistory) -> None:
+        self.text = text
+        self.history = history
+        self._applying = False
+        # Tk 8.6 counts characters outside the BMP as two index positions.
+        self._wide = int(text.tk.call("string", "length", "\U0001F600")) > 1
+
+    def on_edit(self, edit: TextEdit) -> None:
+        if self._applying:
+            return
+        line, col = (int(part) for part in edit.index.split("."))
+        self.history.record("i" if edit.op == "insert" else "d", line, col, edit.chars)
+
+    def undo(self) -> str:
+        step = self.history.pop_undo()
+        if step is not None:
+            self._apply(reversed(step), invert=True)
+        return "break"
+
+    def redo(self) -> str:
+        step = self.history.pop_redo()
+        if step is not None:
+            self._apply(step, invert=False)
+        return "break"
+
+    # ------------------------------------------------------------------
+    def _apply(self, records, invert: bool) -> None:
+        self._applying = True
+        try:
+            for op, line, col, chars in records:
+                index = f"{line}.{col}"
+                if (op == "i") != invert:
+                    self.text.insert(index, chars)
+                    self.text.mark_set("insert", f"{index} + {self._tk_len(chars)} chars")
+                else:
+                    self.text.delete(index, f"{index} + {self._tk_len(chars)} chars")
+                    self.text.mark_set("insert", index)
+            self.text.see("insert")
+        finally:
+            self._applying = False
+
+    def _tk_len(self, chars: str) -> int:
+        if self._wide:
+            return len(chars.encode("utf-16-le")) // 2
+        return len(chars)
@@ -0,0 +1,71 @@
+"""Benchmark: nearest-named-color queries, k-d tree vs linear scans.
+
+Run from the repo root::
+
+    python tests/bench/bench_color_match.py [--sizes 148 10000 100000] [--queries 2000]
+
+For random palettes of each size, compares a k-d tree query in Lab with a
+linear scan in Lab (same answer) and a linear scan in RGB (the naive way,
+often a different answer).  Also times building the palette and, with
+NumPy, the batch lookup (vectorized for small palettes).
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from utils.color_match import Palette
+from utils.color_space import np, rgb_to_lab
+
+
+def per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[148, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queries = [rng.randrange(1 << 24) for _ in range(args.queries)]
+    scan_queries = queries[: max(args.queries // 20, 10)]
+    print(f"numpy: {'yes' if np is not None else 'no'}")
+    for size in args.sizes:
+        colors = [rng.randrange(1 << 24) for _ in range(size)]
+        start = time.perf_counter()
+        palette = Palette("random", ((f"c{i}", c) for i, c in enumerate(colors)))
+        build = time.perf_counter() - start
+        labs = [rgb_to_lab(c) for c in palette.colors]
+        rgbs = [(c >> 16, c >> 8 & 0xFF, c & 0xFF) for c in palette.colors]
+
+        def scan_lab(q):
+            l0, l1, l2 = rgb_to_lab(q)
+            return min(labs, key=lambda p: (p[0] - l0) ** 2 + (p[1] - l1) ** 2 + (p[2] - l2) ** 2)
+
+        def scan_rgb(q):
+            r, g, b = q >> 16, q >> 8 & 0xFF, q & 0xFF
+            return min(rgbs, key=lambda p: (p[0] - r) ** 2 + (p[1] - g) ** 2 + (p[2] - b) ** 2)
+
+        print(f"\n{size} colors (build {build * 1000:.1f} ms)")
+        print(f"  k-d tree, Lab     {per_query(palette.nearest, queries) * 1e6:10.2f} us/query")
+        print(f"  linear scan, Lab  {per_query(scan_lab, scan_queries) * 1e6:10.2f} us/query")
+        print(f"  linear scan, RGB  {per_query(scan_rgb, scan_queries) * 1e6:10.2f} us/query")
+        if np is not None:
+            start = time.perf_counter()
+            palette.nearest_many(queries)
+            batch = (time.perf_counter() - start) / len(queries)
+            print(f"  nearest_many      {batch * 1e6:10.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
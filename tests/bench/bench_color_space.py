@@ -0,0 +1,53 @@
+"""Benchmark: color conversions per second, scalar vs batch.
+
+Run from the repo root (with and without NumPy installed)::
+
+    python tests/bench/bench_color_space.py [--count 100000]
+
+Each row converts ``--count`` random colors from hex into each space and
+back.  "scalar" calls :func:`convert` per color with its result cache
+cleared first (so every call computes); "batch" is one
+:func:`convert_many` call over the whole list.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from utils.color_space import SPACES, convert, convert_many, from_rgb, np
+
+
+def rate(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    hexes = [f"#{rng.randrange(1 << 24):06x}" for _ in range(args.count)]
+    print(f"numpy: {'yes' if np is not None else 'no'}   colors/s")
+    print(f"{'':18s}{'scalar':>14s}{'batch':>14s}")
+    for space in SPACES[1:]:
+        values = convert_many(hexes, "hex", space)
+        for label, source, target, items in (
+            (f"hex -> {space}", "hex", space, hexes),
+            (f"{space} -> hex", space, "hex", values),
+        ):
+            from_rgb.cache_clear()
+            scalar = rate(lambda: [convert(v, source, target) for v in items], args.count)
+            batch = rate(lambda: convert_many(items, source, target), args.count)
+            print(f"{label:18s}{scalar:14,.0f}{batch:14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
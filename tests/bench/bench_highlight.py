@@ -0,0 +1,87 @@
+"""Benchmark: keystroke latency with highlighting in a 50k-line note.
+
+Needs a display (an Xvfb works).  Run from the repo root::
+
+    python tests/bench/bench_highlight.py [--lines 50000]
+
+"full" re-tags the whole note after every keystroke; "incremental" is what
+:class:`Highlighter` does (only the edited line).  The tokenizer throughput
+on its own is printed first and needs no display.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from widgets.notes.edit_observer import EditObserver
+from widgets.notes.highlight import Highlighter, tokenize_line
+
+
+def make_note(lines: int) -> str:
+    block = [
+        "# Heading {i}",
+        "- item with `code` and **bold** text, see [link](http://example.com)",
+        "plain line number {i} with a few more words in it",
+        "",
+    ]
+    return "\n".join(block[i % len(block)].format(i=i) for i in range(lines))
+
+
+def keystrokes(text: tk.Text, highlighter: Highlighter, full: bool, count: int) -> list[float]:
+    """Type ``count`` characters in the middle of the note; return latencies."""
+
+    middle = int(text.index("end - 1 chars").split(".")[0]) // 2
+    text.mark_set("insert", f"{middle}.end")
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        text.insert("insert", "x")  # the observer calls highlighter.on_edit
+        if full:
+            highlighter._tag_lines(1, int(text.index("end - 1 chars").split(".")[0]))
+        text.update_idletasks()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=20)
+    args = parser.parse_args()
+
+    note = make_note(args.lines)
+    start = time.perf_counter()
+    for line in note.split("\n"):
+        tokenize_line("markdown", line)
+    elapsed = time.perf_counter() - start
+    print(f"tokenize {args.lines} lines: {elapsed * 1000:.1f} ms")
+
+    root = tk.Tk()
+    text = tk.Text(root)
+    text.pack()
+    text.insert("1.0", note)
+    highlighter = Highlighter(text)
+    observer = EditObserver(text)
+    observer.add_listener(highlighter.on_edit)
+    highlighter.start()
+    # Let the background pass finish so both runs start from the same state.
+    while highlighter._after_id is not None:
+        root.update()
+
+    for label, full in (("full", True), ("incremental", False)):
+        latencies = keystrokes(text, highlighter, full, args.keys)
+        print(
+            f"{label:11s}  median {statistics.median(latencies) * 1000:8.2f} ms"
+            f"   max {max(latencies) * 1000:8.2f} ms"
+        )
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: cost of the live preview per keystroke.
+
+Run from the repo root::
+
+    python tests/bench/bench_live_preview.py [--rounds 200]
+
+Types a few expressions one character at a time (every prefix is looked
+up, as the preview would after each keystroke without debouncing) and
+reports microseconds per keystroke for:
+
+* "raising check": ``compile`` inside ``try/except`` for every prefix,
+* "cold": ``LivePreview.lookup`` with empty caches,
+* "memoized": the same input typed again.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from utils.live_preview import LivePreview
+from utils.safe_eval import SafeEvaluator
+
+TYPED = [
+    "(1.5 + 2.25) * (7 - 3) / 2",
+    "rate * (1 + rate) ** 12 - 1",
+    "((((1 + 2) * 3) - 4) / 5) ** 2",
+    "2 ** 64 - 1 + 0x1f // 3",
+]
+ENV = {"rate": 0.07}
+
+
+def keystrokes():
+    return [text[:n] for text in TYPED for n in range(1, len(text) + 1)]
+
+
+def raising_check(prefixes, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        evaluator = SafeEvaluator()
+        for prefix in prefixes:
+            try:
+                evaluator.compile(prefix)(ENV)
+            except Exception:
+                pass
+    return time.perf_counter() - started
+
+
+def cold_preview(prefixes, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        live = LivePreview(SafeEvaluator())
+        for prefix in prefixes:
+            live.lookup(prefix, ENV)
+    return time.perf_counter() - started
+
+
+def memoized_preview(prefixes, rounds):
+    live = LivePreview(SafeEvaluator())
+    for prefix in prefixes:
+        live.lookup(prefix, ENV)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for prefix in prefixes:
+            live.lookup(prefix, ENV)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    prefixes = keystrokes()
+    total = len(prefixes) * args.rounds
+    print(f"{len(prefixes)} keystrokes x {args.rounds} rounds")
+    for label, seconds in [
+        ("raising check", raising_check(prefixes, args.rounds)),
+        ("cold", cold_preview(prefixes, args.rounds)),
+        ("memoized", memoized_preview(prefixes, args.rounds)),
+    ]:
+        print(f"{label:>14}: {seconds / total * 1e6:8.2f} us/keystroke")
+
+
+if __name__ == "__main__":
+    main()
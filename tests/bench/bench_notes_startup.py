@@ -0,0 +1,67 @@
+"""Benchmark: time-to-first-paint of the Notes tab with many saved notes.
+
+Needs a display (an Xvfb works).  Run from the repo root::
+
+    python tests/bench/bench_notes_startup.py [--notes 1000] [--size 2000]
+
+"lazy" is the current behaviour (placeholders, only the selected page gets a
+text widget).  "eager" materializes every page during build, which is what
+``NotesTab.build`` used to do.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from widgets.notes.notes_tab import NotesTab
+
+
+def first_paint(notes: list[str], eager: bool) -> tuple[float, float]:
+    """Return (build seconds, seconds until the window is mapped and idle)."""
+
+    root = tk.Tk()
+    start = time.perf_counter()
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill="both", expand=True)
+    tab = NotesTab(root, notes)
+    notebook.add(tab.build(notebook), text="Notes")
+    if eager:
+        for page in tab.notes_pages:
+            tab._materialize(page)
+    built = time.perf_counter() - start
+
+    root.wait_visibility()
+    root.update()
+    painted = time.perf_counter() - start
+
+    tab.autosaver.close()
+    root.destroy()
+    return built, painted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Never touch the real notes file.
+        NotesTab.notes_file = Path(tmp) / "notes.json"
+        notes = [("note %d\n" % i) * (args.size // 8) for i in range(args.notes)]
+
+        print(f"{args.notes} notes x ~{args.size} chars")
+        for label, eager in (("eager", True), ("lazy", False)):
+            built, painted = first_paint(notes, eager)
+            print(f"{label:5s}  build {built * 1000:8.1f} ms   first paint {painted * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: notes save latency, full JSON rewrite vs. journaled store.
+
+Run from the repo root::
+
+    python tests/bench/bench_notes_store.py [--notes 500] [--size 1000000]
+
+"Before" is the old ``save_notes`` behaviour (``json.dump`` of every note on
+each save).  "After" is an autosave with one edited note going through
+:class:`NotesStore`, plus the time the Tk thread spends handing the change
+to :class:`AutosaveWorker`.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.widgets.notes.notes_store import AutosaveWorker, NotesStore
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    block = "lorem ipsum dolor sit amet\n"
+    body = (block * (args.size // len(block) + 1))[: args.size]
+    ids = [f"note{i:04d}" for i in range(args.notes)]
+    notes = {nid: body for nid in ids}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "legacy.json"
+
+        def full_rewrite():
+            with open(legacy, "w", encoding="utf-8") as f:
+                json.dump(list(notes.values()), f)
+
+        before = best_of(args.repeat, full_rewrite)
+
+        store = NotesStore(Path(tmp) / "notes.json")
+        store.load()
+        store.write(notes, ids)
+        store.compact()
+
+        edits = iter(range(10**9))
+
+        def one_dirty_note():
+            store.write({ids[0]: body + str(next(edits))}, ids)
+
+        after = best_of(args.repeat, one_dirty_note)
+
+        start = time.perf_counter()
+        store.compact()
+        compact = time.perf_counter() - start
+
+        worker = AutosaveWorker(store)
+        start = time.perf_counter()
+        worker.submit({ids[1]: body + "!"}, ids)
+        handoff = time.perf_counter() - start
+        worker.close()
+
+    total_mb = args.notes * args.size / 1e6
+    print(f"{args.notes} notes x {args.size / 1e6:.2f} MB ({total_mb:.0f} MB total)")
+    print(f"before  full json.dump per save : {before * 1000:10.1f} ms")
+    print(f"after   one dirty note (journal): {after * 1000:10.1f} ms  (background thread)")
+    print(f"after   Tk-thread hand-off      : {handoff * 1000:10.3f} ms")
+    print(f"        compaction (occasional) : {compact * 1000:10.1f} ms  (background thread)")
+
+
+if __name__ == "__main__":
+    main()
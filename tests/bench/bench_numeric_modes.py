@@ -0,0 +1,100 @@
+"""Benchmark: evaluation speed of each numeric mode.
+
+Run from the repo root::
+
+    python tests/bench/bench_numeric_modes.py [--seconds 1]
+
+For float, decimal and fraction, reports compiled-and-cached evaluations
+per second and the slowdown relative to float.  "decimal (dispatch)" is
+the alternative the modes replace: float operator table plus a type check
+on every operator to route Decimals to the context.
+"""
+
+import argparse
+import decimal
+import operator
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from utils.safe_eval import MODES, CompiledExpression, SafeEvaluator
+
+EXPRESSIONS = [
+    "19.99 * 3 + 4.50 - 0.1",
+    "(1.5 + 2.25) * (7 - 3) / 2",
+    "1000 * (1 + 0.07 / 12) ** 12",
+    "-(5 % 3) + 17 // 4",
+    "((((1 + 2) * 3) - 4) / 5) ** 2",
+    "0.1 + 0.2 + 0.3 + 0.4 + 0.5 + 0.6",
+]
+
+
+def rate(programs, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for program in programs:
+            program()
+        count += len(programs)
+    return count / (time.perf_counter() - start)
+
+
+def dispatching(evaluator: SafeEvaluator) -> list:
+    """Decimal programs whose operators check types on every call."""
+    ctx = decimal.Context(prec=28)
+    routed = {
+        operator.add: ctx.add,
+        operator.sub: ctx.subtract,
+        operator.mul: ctx.multiply,
+        operator.truediv: ctx.divide,
+        operator.floordiv: ctx.divide_int,
+        operator.mod: ctx.remainder,
+        operator.pow: ctx.power,
+        operator.neg: ctx.minus,
+        operator.pos: ctx.plus,
+    }
+
+    def wrap(fn):
+        exact = routed[fn]
+
+        def op(*args):
+            if any(isinstance(arg, Decimal) for arg in args):
+                return exact(*args)
+            return fn(*args)
+
+        return op
+
+    programs = []
+    for expr in EXPRESSIONS:
+        program = tuple(
+            (arity, Decimal(repr(value)) if arity == 0 else wrap(value))
+            for arity, value in evaluator.compile(expr, mode="float").program
+        )
+        programs.append(CompiledExpression(expr, program))
+    return programs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    evaluator = SafeEvaluator()
+    results = {}
+    for mode in MODES:
+        evaluator.set_mode(mode)
+        results[mode] = rate([evaluator.compile(expr) for expr in EXPRESSIONS], args.seconds)
+    results["decimal (dispatch)"] = rate(dispatching(evaluator), args.seconds)
+
+    base = results["float"]
+    for label, per_second in results.items():
+        print(f"{label:20s} {per_second:12,.0f} evals/s   x{base / per_second:.2f} slower")
+
+
+if __name__ == "__main__":
+    main()
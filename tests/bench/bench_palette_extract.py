@@ -0,0 +1,57 @@
+"""Benchmark: palette extraction from a 4K (3840x2160) RGB buffer.
+
+Run from the repo root (with and without NumPy installed)::
+
+    python tests/bench/bench_palette_extract.py [--repeat 5] [--count 8]
+
+"screenshot" is a few flat colors in large blocks, "noise" is random
+pixels, the worst case (every histogram bin used).  Each run includes the
+sampling, the histogram and the median cut (plus k-means for "kmeans"),
+but not decoding and subsampling the file, which Tk does in C.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from utils.palette_extract import METHODS, extract_palette, np
+
+WIDTH, HEIGHT = 3840, 2160
+
+
+def screenshot() -> bytes:
+    rng = random.Random(1)
+    colors = [rng.randrange(1 << 24).to_bytes(3, "big") for _ in range(6)]
+    row = b"".join(colors[x // 400 % 6] for x in range(WIDTH))
+    rows = (row, row[1200:] + row[:1200])
+    return b"".join(rows[y // 300 % 2] for y in range(HEIGHT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--count", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"numpy: {'yes' if np is not None else 'no'}")
+    images = {"screenshot": screenshot(), "noise": os.urandom(WIDTH * HEIGHT * 3)}
+    for name, data in images.items():
+        for method in METHODS:
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                extract_palette(data, 3, args.count, method)
+                samples.append(time.perf_counter() - start)
+            median, worst = statistics.median(samples) * 1000, max(samples) * 1000
+            print(f"{name:10s} {method:10s} median {median:8.1f} ms   max {worst:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark: SafeEvaluator evaluations per second, before and after caching.
+
+Run from the repo root::
+
+    python tests/bench/bench_safe_eval.py [--seconds 1]
+
+"before" is the previous implementation (``ast.parse`` plus a recursive
+walk on every call), copied below for reference.  "after (cold)" compiles
+every time (cache cleared), "after (cached)" re-evaluates a working set of
+expressions that fits in the cache, like re-running history entries.
+
+The scaling section compiles and evaluates ever longer ``1+1+...`` chains
+and nested parentheses; time and peak memory per term should stay flat.
+"""
+
+import argparse
+import ast
+import operator
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from utils.safe_eval import SafeEvaluator
+
+EXPRESSIONS = [
+    "3 + 4 * 2",
+    "(1.5 + 2.25) * (7 - 3) / 2",
+    "2 ** 10 - 1",
+    "-(5 % 3) + 17 // 4",
+    "((((1 + 2) * 3) - 4) / 5) ** 2",
+    "1 + 2 + 3 + 4 + 5 + 6 + 7 + 8 + 9 + 10",
+]
+
+_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def legacy_eval(expr: str):
+    """The evaluator as it was before compilation and caching."""
+
+    def eval_node(node):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.BinOp):
+            return _OPS[type(node.op)](eval_node(node.left), eval_node(node.right))
+        if isinstance(node, ast.UnaryOp):
+            return _OPS[type(node.op)](eval_node(node.operand))
+        raise ValueError("Invalid expression")
+
+    return eval_node(ast.parse(expr, mode="eval").body)
+
+
+def rate(fn, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for expr in EXPRESSIONS:
+            fn(expr)
+        count += len(EXPRESSIONS)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    evaluator = SafeEvaluator()
+
+    def cold(expr):
+        evaluator.clear_cache()
+        return evaluator.eval(expr)
+
+    before = rate(legacy_eval, args.seconds)
+    print(f"before          {before:12,.0f} evals/s")
+    print(f"after (cold)    {rate(cold, args.seconds):12,.0f} evals/s")
+    evaluator.clear_cache()
+    cached = rate(evaluator.eval, args.seconds)
+    print(f"after (cached)  {cached:12,.0f} evals/s   x{cached / before:.1f}")
+    print(f"cache hits {evaluator.hits:,}  misses {evaluator.misses:,}")
+
+    print()
+    for label, make in (
+        ("chain", lambda n: "+".join(["1"] * n)),
+        ("nested", lambda n: "(1+" * (n - 1) + "1" + ")" * (n - 1)),
+    ):
+        for n in (10_000, 100_000, 1_000_000):
+            expr = make(n)
+            evaluator.clear_cache()
+            start = time.perf_counter()
+            evaluator.eval(expr)
+            elapsed = time.perf_counter() - start
+            # Separate run: tracing allocations skews the timing.
+            evaluator.clear_cache()
+            tracemalloc.start()
+            evaluator.eval(expr)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{label:6s} {n:>9,} terms  {elapsed * 1000:9.1f} ms"
+                f"  {elapsed / n * 1e9:6.0f} ns/term  peak {peak / n:5.0f} B/term"
+            )
+
+
+if __name__ == "__main__":
+    main()
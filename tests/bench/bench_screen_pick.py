@@ -0,0 +1,72 @@
+"""Benchmark: latency of reading a screen pixel, native vs xcolor.
+
+Run from the repo root, on X11 (or under Xvfb)::
+
+    python tests/bench/bench_screen_pick.py [--repeat 200]
+
+"native" is one ``XGetImage`` of a single pixel over an open connection
+(what happens after the click); the 11x11 region is what the eyedropper
+reads per frame.  The old path always waited 300 ms after
+hiding the window and then spawned ``xcolor``; since xcolor waits for a
+click, its cost is shown as the fixed delay plus the time to spawn it
+(``xcolor --version``, or ``true`` if xcolor is not installed).
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from widgets.color.x11_screen import X11Screen
+
+OLD_DELAY = 0.3
+
+
+def timings(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    median = statistics.median(samples)
+    print(f"{label:24s} median {median * 1000:9.3f} ms   p95 {p95 * 1000:9.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    screen = X11Screen()
+    print(f"open display              {(time.perf_counter() - start) * 1000:9.3f} ms (once)")
+    try:
+        x, y = screen.pointer()
+        report("native pixel", timings(lambda: screen.pixel(x, y), args.repeat))
+        both = timings(lambda: screen.pixel(*screen.pointer()), args.repeat)
+        report("native pointer + pixel", both)
+        # One eyedropper frame's capture.
+        report("native 11x11 region", timings(lambda: screen.region(x, y, 11, 11), args.repeat))
+    finally:
+        screen.close()
+
+    command = ["xcolor", "--version"] if shutil.which("xcolor") else ["true"]
+    repeat = max(args.repeat // 10, 5)
+    spawn = timings(lambda: subprocess.run(command, capture_output=True), repeat)
+    report(f"old: 300 ms + {command[0]}", [OLD_DELAY + s for s in spawn])
+
+
+if __name__ == "__main__":
+    main()
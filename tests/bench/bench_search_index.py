@@ -0,0 +1,61 @@
+"""Benchmark: notes search index build, query and edit latency.
+
+Run from the repo root::
+
+    python tests/bench/bench_search_index.py [--mb 20] [--notes 40]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from app.widgets.notes.search_index import SearchIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=20)
+    parser.add_argument("--notes", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    vocab = [f"w{i}" for i in range(50_000)]
+    note_chars = int(args.mb * 1e6 / args.notes)
+    notes = {}
+    for n in range(args.notes):
+        lines, size = [], 0
+        while size < note_chars:
+            line = " ".join(rng.choice(vocab) for _ in range(10))
+            lines.append(line)
+            size += len(line) + 1
+        notes[f"note{n}"] = "\n".join(lines)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    for note_id, text in notes.items():
+        index.set_note(note_id, text)
+    build = time.perf_counter() - start
+
+    queries = [rng.choice(vocab) for _ in range(1000)]
+    start = time.perf_counter()
+    hits = sum(len(index.search(q)) for q in queries)
+    query = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.replace_lines("note0", i, 1, [f"edited line {i}", "new line"])
+    edit = (time.perf_counter() - start) / 1000
+
+    print(f"corpus {args.mb:.0f} MB in {args.notes} notes")
+    print(f"build (worker thread, once): {build:8.2f} s")
+    print(f"query, single token        : {query * 1e6:8.1f} us  ({hits} note hits)")
+    print(f"edit (line split, shifting): {edit * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: startup cost with deferred tabs vs building every tab up front.
+
+Run from the repo root::
+
+    python tests/bench/bench_startup.py [--repeat 10]
+
+"imports" starts fresh interpreters and times importing the GUI module and
+the first tab's module (what startup imports now) against importing every
+tab's module (what it used to import).  With a display (an Xvfb works),
+"first idle" also times creating the app until Tk first goes idle, with
+only the first tab built vs all of them; notes go to a temporary file.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+APP = ROOT / "app"
+sys.path.insert(0, str(APP))
+
+IMPORT_LAZY = "import gui.app\n__import__(gui.app.TABS[0][1])"
+IMPORT_EAGER = "import gui.app\nfor _, m, _ in gui.app.TABS: __import__(m)"
+
+
+def import_seconds(code: str) -> float:
+    timed = f"import time\nt = time.perf_counter()\n{code}\nprint(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", timed], cwd=APP, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout)
+
+
+def first_idle(eager: bool) -> float:
+    from gui.app import TABS, MultitoolApp
+
+    root = tk.Tk()
+    root.withdraw()
+    start = time.perf_counter()
+    app = MultitoolApp(root)
+    if eager:
+        for key, _, _ in TABS:
+            app.build_tab(key)
+    root.deiconify()
+    root.wait_visibility()
+    root.update()
+    elapsed = time.perf_counter() - start
+
+    app._closing = True  # no pre-warming
+    if app.notes_tab is not None:
+        app.notes_tab.autosaver.close()
+    for tab in (app.calc_tab, app.color_tab):
+        if tab is not None:
+            tab.close()
+    root.destroy()
+    return elapsed
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(f"{label:28s} median {statistics.median(samples) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    report("imports: gui + first tab", [import_seconds(IMPORT_LAZY) for _ in range(args.repeat)])
+    report("imports: gui + all tabs", [import_seconds(IMPORT_EAGER) for _ in range(args.repeat)])
+
+    if not os.environ.get("DISPLAY"):
+        print("first idle: skipped (no DISPLAY)")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        from widgets.notes.notes_tab import NotesTab
+
+        # Never touch the real notes file.
+        NotesTab.notes_file = Path(tmp) / "notes.json"
+        first_idle(eager=False)  # warm up imports
+        report("first idle: first tab", [first_idle(False) for _ in range(args.repeat)])
+        report("first idle: all tabs", [first_idle(True) for _ in range(args.repeat)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark: summoning the running instance vs a cold start.
+
+Needs a display (an Xvfb works).  Run from the repo root::
+
+    python tests/bench/bench_summon.py [--repeat 10]
+
+Starts ``main.py --daemon`` on a private socket and times:
+
+* "summon (request)": one show request over the socket until the
+  instance has raised the window and answered;
+* "summon (main.py)": a whole ``main.py --tab calc`` launch, what
+  ``run.sh`` costs once an instance is running;
+* "cold start": a second, independent ``main.py --startup-report`` from
+  spawning it until its window first goes idle.
+
+The instances use the real notes file (only reading it).
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+APP = ROOT / "app"
+sys.path.insert(0, str(APP))
+
+from core.single_instance import SOCKET_ENV, send_request
+
+
+def wait_for_socket(path: Path, timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if send_request({"action": "ping"}, path, timeout=1) is not None:
+            return
+        time.sleep(0.05)
+    raise RuntimeError("instance did not start")
+
+
+def cold_start(env: dict) -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py", "--startup-report"],
+        cwd=APP,
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    for line in proc.stderr:
+        if "first idle" in line:
+            break
+    elapsed = time.perf_counter() - start
+    send_request({"action": "quit"}, Path(env[SOCKET_ENV]))
+    proc.wait(10)
+    return elapsed
+
+
+def report(label: str, samples: list[float]) -> None:
+    print(f"{label:20s} median {statistics.median(samples) * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    if not os.environ.get("DISPLAY") or not hasattr(socket, "AF_UNIX"):
+        print("skipped: needs a display and Unix sockets")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "daemon.sock"
+        env = dict(os.environ, **{SOCKET_ENV: str(path)})
+        daemon = subprocess.Popen([sys.executable, "main.py", "--daemon"], cwd=APP, env=env)
+        try:
+            wait_for_socket(path)
+            requests, launches = [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                send_request({"action": "show", "tab": "calc"}, path)
+                requests.append(time.perf_counter() - start)
+                send_request({"action": "hide"}, path)
+
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "main.py", "--tab", "calc"], cwd=APP, env=env)
+                launches.append(time.perf_counter() - start)
+                send_request({"action": "hide"}, path)
+            report("summon (request)", requests)
+            report("summon (main.py)", launches)
+        finally:
+            send_request({"action": "quit"}, path)
+            daemon.wait(10)
+
+        cold_env = dict(os.environ, **{SOCKET_ENV: str(Path(tmp) / "cold.sock")})
+        report("cold start", [cold_start(cold_env) for _ in range(args.repeat)])
+
+
+if __name__ == "__main__":
+    main()
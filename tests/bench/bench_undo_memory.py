@@ -0,0 +1,76 @@
+"""Benchmark: undo memory after a scripted 100k-edit session.
+
+Run from the repo root::
+
+    python tests/bench/bench_undo_memory.py [--edits 100000]
+
+Replays the same scripted session (typing, backspacing, Enter, cursor
+jumps and pauses) into an unbounded history - what Tk's ``undo=True``
+without ``maxundo`` amounts to - and into the budgeted :class:`UndoHistory`
+with the default configuration, and reports the memory each holds.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "app"))
+
+from widgets.notes.undo import UndoHistory
+
+
+def session(edits: int):
+    """Yield ``(op, line, col, chars, now)`` for a plausible editing session."""
+
+    rng = random.Random(7)
+    line, col, now = 1, 0, 0.0
+    for _ in range(edits):
+        now += rng.uniform(0.05, 0.2)
+        roll = rng.random()
+        if roll < 0.02:
+            now += 2.0  # pause
+            line, col = rng.randint(1, 500), rng.randint(0, 60)  # cursor jump
+        if roll < 0.10 and col > 0:
+            col -= 1
+            yield "d", line, col, "x", now
+        elif roll < 0.13:
+            yield "i", line, col, "\n", now
+            line, col = line + 1, 0
+        else:
+            yield "i", line, col, rng.choice("abcdefgh "), now
+            col += 1
+
+
+def measure(edits: int, **options) -> tuple[int, int, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    history = UndoHistory(**options)
+    for op, line, col, chars, now in session(edits):
+        history.record(op, line, col, chars, now=now)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, len(history._undo), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--edits", type=int, default=100_000)
+    args = parser.parse_args()
+
+    unbounded = measure(args.edits, budget=10**12, max_steps=10**12)
+    bounded = measure(args.edits)
+    print(f"{args.edits} scripted edits")
+    for label, (mem, steps, elapsed) in (("unbounded", unbounded), ("budgeted", bounded)):
+        print(
+            f"{label:9s}: {mem / 1024:9.1f} KiB retained, {steps:6d} undo steps, "
+            f"{elapsed / args.edits * 1e6:5.2f} us/edit"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import csv
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils import batch_eval
+from utils.batch_eval import (
+    TooManyValues,
+    ValueRange,
+    evaluate,
+    summarize,
+    to_lambda,
+    write_csv,
+)
+from utils.safe_eval import SafeEvaluator
+
+BACKENDS = [False] + ([True] if batch_eval.np is not None else [])
+
+
+@pytest.mark.parametrize("start, stop, step, expected", [
+    ("1", "5", "1", [1, 2, 3, 4, 5]),
+    ("0", "1", "0.25", [0, 0.25, 0.5, 0.75, 1.0]),
+    ("10", "1", "-3", [10, 7, 4, 1]),
+    ("5", "1", "1", []),
+])
+def test_value_range_is_inclusive(start, stop, step, expected):
+    assert list(ValueRange.parse(start, stop, step)) == expected
+
+
+@pytest.mark.parametrize("start, stop, step, error", [
+    ("0", "1e400", "1", ValueError),  # inf
+    ("0", "1", "0", ValueError),
+    ("0", "1", "1e-300", TooManyValues),
+    ("0", "1" + "0" * 400, "1", TooManyValues),  # too large for a float
+])
+def test_value_range_rejects_bad_or_huge_ranges(start, stop, step, error):
+    with pytest.raises(error):
+        ValueRange.parse(start, stop, step)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+@pytest.mark.parametrize("expr", ["x**2/3", "-x**2 + 2*x % 3", "7", "1/(x-2)"])
+def test_batch_matches_scalar_evaluation(expr, use_numpy):
+    # STEP 1: Every batch result equals evaluating with that x alone;
+    # errors (1/0) become nan instead of failing the batch.
+    evaluator = SafeEvaluator()
+    compiled = evaluator.compile(expr)
+    values = ValueRange(-3, 3)
+    results = list(evaluate(compiled, values, use_numpy=use_numpy))
+    for x, result in zip(values, results):
+        try:
+            assert result == pytest.approx(evaluator.eval(expr, {"x": x}))
+        except ZeroDivisionError:
+            assert math.isnan(result)
+
+
+def test_deep_nesting_falls_back_to_the_program():
+    # STEP 1: Python cannot compile this many nested parentheses...
+    compiled = SafeEvaluator().compile("(x+" * 500 + "x" + ")" * 500)
+    assert to_lambda(compiled) is None
+    # STEP 2: ...so each value runs through the postfix program instead.
+    assert evaluate(compiled, [1, 2], use_numpy=False) == [501, 1002]
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_non_real_results_are_nan(use_numpy):
+    # STEP 1: (-3) ** 0.5 is complex in Python; both paths give nan.
+    compiled = SafeEvaluator().compile("x**0.5")
+    results = list(evaluate(compiled, ValueRange(-1, 1), use_numpy=use_numpy))
+    assert math.isnan(results[0]) and results[1:] == [0.0, 1.0]
+    # STEP 2: The summary only counts the real results.
+    assert summarize(results).valid == 2
+    assert summarize([1.0, 2j]).valid == 1
+    # STEP 3: So does an operator that refuses the complex value.
+    compiled = SafeEvaluator().compile("(x-2)**0.5 * 2 // 1")
+    results = list(evaluate(compiled, ValueRange(0, 3), use_numpy=use_numpy))
+    assert all(map(math.isnan, results[:2])) and results[2:] == [0.0, 2.0]
+
+
+def test_constant_too_long_for_repr_falls_back_to_the_program():
+    # STEP 1: repr() refuses ints beyond the digit limit...
+    compiled = SafeEvaluator().compile("x+0x" + "f" * 4000)
+    assert to_lambda(compiled) is None
+    # STEP 2: ...so the postfix program runs instead.
+    assert evaluate(compiled, [1], use_numpy=False) == [16 ** 4000]
+
+
+def test_summary_and_csv(tmp_path):
+    # STEP 1: Statistics skip invalid results.
+    summary = summarize([1.0, 2.0, 3.0, math.nan])
+    assert (summary.count, summary.valid, summary.min, summary.max) == (4, 3, 1.0, 3.0)
+    assert summary.mean == pytest.approx(2.0)
+    assert summary.stdev == pytest.approx(math.sqrt(2 / 3))
+
+    # STEP 2: The CSV holds one row per value.
+    values = ValueRange(1, 3)
+    write_csv(tmp_path / "out.csv", values, [1, 4, 9])
+    with open(tmp_path / "out.csv", newline="") as f:
+        assert list(csv.reader(f)) == [["x", "result"], ["1", "1"], ["2", "4"], ["3", "9"]]
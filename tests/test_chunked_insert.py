@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.widgets.notes.chunked_insert import iter_file_chunks, iter_string_chunks
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+def test_file_chunks_decode_multibyte_text_across_boundaries(tmp_path, chunk_size):
+    # STEP 1: Mix 1-, 2-, 3- and 4-byte UTF-8 characters so that small chunk
+    # sizes are guaranteed to cut through the middle of a character.
+    text = "log: ä € 🙂 done\n" * 5
+    path = tmp_path / "big.log"
+    path.write_text(text, encoding="utf-8")
+
+    # STEP 2: Joining the streamed chunks must give back the exact text.
+    assert "".join(iter_file_chunks(path, chunk_size)) == text
+
+
+def test_empty_file_and_string_yield_nothing(tmp_path):
+    # An empty file cannot be memory-mapped; it simply streams no chunks.
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(iter_file_chunks(path, 16)) == []
+    assert list(iter_string_chunks("", 16)) == []
+
+
+def test_string_chunks_are_bounded_and_complete():
+    # Every chunk respects the bound and nothing is lost or reordered.
+    chunks = list(iter_string_chunks("abcdefghij", 4))
+    assert chunks == ["abcd", "efgh", "ij"]
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.color.color_history import ColorHistory
+
+
+def test_history_deduplicates_caps_and_persists(tmp_path):
+    # STEP 1: Re-picking a color moves it to the front instead of duplicating.
+    path = tmp_path / "colors.bin"
+    history = ColorHistory(path, capacity=3)
+    history.load()
+    for color in (0xFF0000, 0x00FF00, 0xFF0000, 0x0000FF):
+        history.add(color)
+    assert [history.recent(i) for i in range(len(history))] == [0x0000FF, 0xFF0000, 0x00FF00]
+
+    # STEP 2: Beyond capacity the least recently picked color drops out.
+    history.add(0x123456)
+    assert list(history.colors) == [0xFF0000, 0x0000FF, 0x123456]
+
+    # STEP 3: 4 bytes per color on disk, same order after reloading.
+    assert path.stat().st_size == 12
+    reloaded = ColorHistory(path, capacity=2)
+    reloaded.load()
+    assert list(reloaded.colors) == [0x0000FF, 0x123456]
+
+
+def test_damaged_file_loads_what_is_valid(tmp_path):
+    path = tmp_path / "colors.bin"
+    path.write_bytes((0x112233).to_bytes(4, "little") + b"\xff\xff\xff\xff" + b"\x01\x02")
+    history = ColorHistory(path)
+    history.load()
+    assert list(history.colors) == [0x112233]
@@ -0,0 +1,86 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils.color_match import KDTree, Palette, css_palette, load_palette_file
+from utils.color_space import rgb_to_lab
+
+
+@pytest.mark.parametrize(
+    "rgb, lab",
+    [
+        (0xFFFFFF, (100.0, 0.0, 0.0)),
+        (0x000000, (0.0, 0.0, 0.0)),
+        (0xFF0000, (53.24, 80.09, 67.20)),
+        (0x0000FF, (32.30, 79.19, -107.86)),
+    ],
+)
+def test_rgb_to_lab(rgb, lab):
+    assert rgb_to_lab(rgb) == pytest.approx(lab, abs=0.01)
+
+
+@pytest.mark.parametrize("size", [1, 7, 100, 2000])
+def test_kdtree_agrees_with_brute_force(size):
+    rng = random.Random(size)
+    points = [
+        (rng.uniform(0, 100), rng.uniform(-80, 80), rng.uniform(-80, 80)) for _ in range(size)
+    ]
+    tree = KDTree(points)
+    for _ in range(200):
+        query = (rng.uniform(-10, 110), rng.uniform(-100, 100), rng.uniform(-100, 100))
+        expected = min(sum((a - b) ** 2 for a, b in zip(p, query)) for p in points)
+        index, d2 = tree.nearest(query)
+        assert d2 == pytest.approx(expected)
+        assert sum((a - b) ** 2 for a, b in zip(points[index], query)) == pytest.approx(d2)
+
+
+def test_empty_palette_has_no_match():
+    assert KDTree([]).nearest((0, 0, 0)) == (-1, float("inf"))
+    assert Palette("empty", []).nearest(0x123456) is None
+
+
+def test_css_palette_nearest():
+    palette = css_palette()
+    # STEP 1: Exact named colors are found with distance 0.
+    name, color, distance = palette.nearest(0xFF6347)
+    assert (name, color) == ("tomato", 0xFF6347)
+    assert distance == pytest.approx(0, abs=1e-9)
+    # STEP 2: Nearby colors map to the perceptually closest name.
+    assert palette.nearest(0xFE6448)[0] == "tomato"
+    assert palette.nearest(0x010101)[0] == "black"
+    # STEP 3: Batch lookups agree with single lookups.
+    colors = [random.Random(3).randrange(1 << 24) for _ in range(50)]
+    expected = [palette.names.index(palette.nearest(c)[0]) for c in colors]
+    assert palette.nearest_many(colors) == expected
+
+
+def test_palette_dedupes_names_case_insensitively():
+    palette = Palette("brand", [("Red", 0xFF0000), ("red", 0xEE0000), ("Ink", 0x101020)])
+    assert palette.names == ["Red", "Ink"]
+    assert palette.nearest(0xEE0000)[0] == "Red"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"Brand Red": "#d62828", "Ink": "101020", "bad": 3}',
+        "GIMP Palette\nName: brand\n#\n214  40  40\tBrand Red\n 16  16  32 Ink\n",
+        "! comment\nBrand Red #D62828\n#101020 Ink\n",
+    ],
+)
+def test_load_palette_file_formats(tmp_path, text):
+    path = tmp_path / "brand.txt"
+    path.write_text(text)
+    assert load_palette_file(path) == [("Brand Red", 0xD62828), ("Ink", 0x101020)]
+    assert Palette.from_file(path).name == "brand"
+
+
+def test_json_palette_must_be_an_object(tmp_path):
+    path = tmp_path / "brand.json"
+    path.write_text('["#d62828", "#101020"]')
+    with pytest.raises(ValueError):
+        load_palette_file(path)
@@ -0,0 +1,107 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils.color_space import (
+    SPACES,
+    convert,
+    convert_many,
+    format_color,
+    from_rgb,
+    parse_color,
+    to_rgb,
+)
+
+TOMATO = 0xFF6347
+COLORS = [0x000000, 0xFFFFFF, 0x808080, 0xFF0000, 0x00FF00, 0x0000FF, TOMATO, 0x010203]
+COLORS += [random.Random(7).randrange(1 << 24) for _ in range(500)]
+
+
+@pytest.mark.parametrize(
+    "space, expected",
+    [
+        ("hex", "#ff6347"),
+        ("rgb", (255, 99, 71)),
+        ("hsl", (9.13, 100.0, 63.92)),
+        ("hsv", (9.13, 72.16, 100.0)),
+        ("lab", (62.21, 57.85, 46.42)),
+        ("oklch", (0.6962, 0.1955, 32.32)),
+    ],
+)
+def test_known_values(space, expected):
+    value = from_rgb(TOMATO, space)
+    if isinstance(expected, str):
+        assert value == expected
+    else:
+        assert value == pytest.approx(expected, abs=0.01)
+
+
+@pytest.mark.parametrize("space", SPACES)
+def test_round_trip_through_every_space(space):
+    for rgb in COLORS:
+        assert to_rgb(from_rgb(rgb, space), space) == rgb
+
+
+def test_any_to_any_and_gamut_clipping():
+    assert convert((0, 100, 50), "hsl", "hex") == "#ff0000"
+    assert convert("#00f", "hex", "hsv") == pytest.approx((240, 100, 100))
+    # Outside sRGB: channels are clipped.
+    assert convert((50, 200, -200), "lab", "rgb") == (174, 0, 255)
+    assert convert((1.2, 0, 30), "oklch", "hex") == "#ffffff"
+    assert convert((0.7, 0.4, 30), "oklch", "rgb")[1] == 0
+
+
+@pytest.mark.parametrize("source", SPACES)
+@pytest.mark.parametrize("target", ["hex", "rgb", "hsl", "oklch"])
+def test_batch_matches_scalar(source, target):
+    values = [from_rgb(rgb, source) for rgb in COLORS]
+    batch = convert_many(values, source, target)
+    expected = [convert(value, source, target) for value in values]
+    if target == "hex":
+        assert list(batch) == expected
+    else:
+        assert [tuple(row) for row in batch] == [pytest.approx(e, abs=1e-6) for e in expected]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "#ff6347",
+        "FF6347",
+        "rgb(255, 99, 71)",
+        "rgba(100% 38.8% 27.8% / 0.5)",
+        "hsl(9.1deg 100% 63.9%)",
+        "HSV(9.1, 72.2, 100)",
+        "lab(62.21 57.85 46.42)",
+        "oklch(69.62% 0.1955 32.32)",
+    ],
+)
+def test_parse_color(text):
+    assert parse_color(text) == TOMATO
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "", "#12345", "#ggg", "tomato", "rgb(1 2)", "hsl(10% 50% 50%)", "lab(nan 0 0)",
+        "hsl(0 1e300 1e300)", "hsv(0 1e300 1e300)",
+    ],
+)
+def test_parse_color_rejects(text):
+    with pytest.raises(ValueError):
+        parse_color(text)
+
+
+@pytest.mark.parametrize("space", SPACES)
+def test_format_color_parses_back(space):
+    for rgb in COLORS:
+        back = parse_color(format_color(rgb, space))
+        assert all(
+            abs((back >> shift & 0xFF) - (rgb >> shift & 0xFF)) <= 1 for shift in (0, 8, 16)
+        )
+        if space != "oklch":
+            assert back == rgb
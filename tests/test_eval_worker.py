@@ -0,0 +1,41 @@
+import sys
+import time
+from fractions import Fraction
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils.eval_worker import EvalWorker
+
+
+def wait(worker):
+    while (outcome := worker.poll()) is None:
+        time.sleep(0.01)
+    return outcome
+
+
+def test_results_timeouts_and_cancel():
+    worker = EvalWorker(timeout=0.5)
+    try:
+        # STEP 1: Results and errors come back from the child process.
+        worker.submit("2 ** 100")
+        assert wait(worker) == ("ok", 2**100)
+        worker.submit("1 / 0")
+        assert wait(worker)[0] == "error"
+
+        # STEP 2: A runaway calculation is killed after the timeout...
+        worker.submit("9 ** 9 ** 9")
+        assert wait(worker) == ("timeout", None)
+
+        # STEP 3: ...or on cancel, and the next job gets a fresh process.
+        worker.submit("9 ** 9 ** 9")
+        worker.cancel()
+        assert worker.poll() is None
+        worker.submit("6 * 7")
+        assert wait(worker) == ("ok", 42)
+
+        # STEP 4: The numeric mode travels with the job.
+        worker.submit("1 / 3", mode="fraction")
+        assert wait(worker) == ("ok", Fraction(1, 3))
+    finally:
+        worker.close()
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.notes.highlight import detect_language, tokenize_line
+
+
+@pytest.mark.parametrize(
+    "sample, language",
+    [
+        ('{\n  "a": 1\n}', "json"),
+        ("[1, 2, 3]", "json"),
+        ("# Title\n\nsome text", "markdown"),
+        ("shopping:\n- milk\n- eggs", "markdown"),
+        ("def main():\n    return 1", "code"),
+        ("int x = 1;\n", "code"),
+        ("just a plain note\nwith two lines", None),
+        ("", None),
+    ],
+)
+def test_detect_language(sample, language):
+    assert detect_language(sample) == language
+
+
+def test_tokenize_line_returns_tagged_spans():
+    # STEP 1: JSON keys are told apart from string values.
+    line = '"name": "blob", "size": 12, "ok": true'
+    spans = [(tag, line[s:e]) for tag, s, e in tokenize_line("json", line)]
+    assert spans == [
+        ("key", '"name"'),
+        ("string", '"blob"'),
+        ("key", '"size"'),
+        ("number", "12"),
+        ("key", '"ok"'),
+        ("keyword", "true"),
+    ]
+
+    # STEP 2: Markdown inline markup is found anywhere on the line.
+    line = "- see `cfg` and **this** [link](http://x)"
+    tags = [tag for tag, _, _ in tokenize_line("markdown", line)]
+    assert tags == ["list", "code", "bold", "link"]
+
+    # STEP 3: Comments swallow the rest of a code line.
+    line = 'x = "a#b"  # note 42'
+    spans = [(tag, line[s:e]) for tag, s, e in tokenize_line("code", line)]
+    assert spans == [("string", '"a#b"'), ("comment", "# note 42")]
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.calc.history_view import HistoryView
+
+
+def visible(view: HistoryView) -> list[str]:
+    return [view._entry(i) for i in range(view._size())]
+
+
+def test_prefix_filter_narrows_and_widens():
+    # STEP 1: Load a history and filter it by a growing prefix.
+    view = HistoryView(capacity=100)
+    view.set_entries(["1+1 = 2", "12*2 = 24", "2*3 = 6", "12/4 = 3.0"])
+    view.set_filter("1")
+    assert visible(view) == ["1+1 = 2", "12*2 = 24", "12/4 = 3.0"]
+    view.set_filter("12")
+    assert visible(view) == ["12*2 = 24", "12/4 = 3.0"]
+
+    # STEP 2: New entries join the filter if they match.
+    view.append("12-2 = 10")
+    view.append("3 = 3")
+    assert visible(view) == ["12*2 = 24", "12/4 = 3.0", "12-2 = 10"]
+
+    # STEP 3: A shorter prefix rescans; an empty one shows everything.
+    view.set_filter("2")
+    assert visible(view) == ["2*3 = 6"]
+    view.set_filter("")
+    assert len(visible(view)) == 6
+
+
+def test_full_history_drops_oldest_entries_and_their_matches():
+    view = HistoryView(capacity=3)
+    view.set_filter("a")
+    for i in range(10):
+        view.append(f"{'a' if i % 2 else 'b'}{i} = {i}")
+    assert view.entries() == ["a7 = 7", "b8 = 8", "a9 = 9"]
+    assert visible(view) == ["a7 = 7", "a9 = 9"]
+    assert len(view._entries) <= 2 * view.capacity
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils.live_preview import LivePreview
+from utils.safe_eval import SafeEvaluator
+
+
+@pytest.mark.parametrize("source", ["", "2 *", "(1 + 2", "2 ** ", "y + 1", "1 / 0", "1 $ 2"])
+def test_incomplete_or_failing_input_has_no_preview(source):
+    assert LivePreview(SafeEvaluator()).lookup(source, {}) == ("none", None)
+
+
+def test_outcomes_are_memoized_by_normalized_expression_and_names():
+    # STEP 1: Re-spaced input is served from the memo.
+    preview = LivePreview(SafeEvaluator())
+    assert preview.lookup("1+2*3", {}) == ("ok", "7")
+    assert preview.lookup(" 1 + 2 * 3 ", {}) == ("ok", "7")
+    assert preview.evaluations == 1
+
+    # STEP 2: A binding's value is part of the key; its name is not previewed.
+    assert preview.lookup("b = a * 2", {"a": 2}) == ("ok", "4")
+    assert preview.lookup("a*2", {"a": 3}) == ("ok", "6")
+    assert preview.lookup("a * 2", {"a": 2}) == ("ok", "4")
+    assert preview.evaluations == 3
+
+
+def test_expensive_input_is_handed_back_for_background_evaluation():
+    # STEP 1: Above the inline budget, the caller gets a key to evaluate.
+    preview = LivePreview(SafeEvaluator(), inline_bits=1024, max_bits=10**6)
+    status, key = preview.lookup("3 ** 5000", {})
+    assert status == "slow" and key[0] == "3 ** 5000"
+    assert preview.lookup("9 ** 9 ** 9", {}) == ("too large", None)
+
+    # STEP 2: The stored result is served from the memo afterwards.
+    preview.store(key, "ok", 3**5000)
+    assert preview.lookup("3**5000", {}) == ("ok", str(3**5000))
+    assert preview.evaluations == 0
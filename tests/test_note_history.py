@@ -0,0 +1,107 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.notes.history import NoteHistory
+
+
+def make_versions(count):
+    """Successive versions of a note: lines get appended and edited."""
+    lines = [f"line {i}\n" for i in range(200)]
+    versions = []
+    for v in range(count):
+        lines[v % 200] = f"edited in version {v}\n"
+        lines.append(f"appended {v}\n")
+        versions.append("".join(lines))
+    return versions
+
+
+def test_every_version_restores_exactly(tmp_path):
+    # STEP 1: Record 12 versions; a keyframe every 5 means deltas in between.
+    history = NoteHistory(tmp_path, keyframe_every=5, min_interval=0)
+    texts = make_versions(12)
+    for t, text in enumerate(texts):
+        assert history.record("n", text, now=float(t))
+
+    # STEP 2: Keyframes appear at the configured cadence.
+    versions = history.versions("n")
+    assert [v.keyframe for v in versions][:6] == [True, False, False, False, False, True]
+
+    # STEP 3: Restoring from a fresh instance (headers re-read from disk)
+    # returns the exact text of each version.
+    reopened = NoteHistory(tmp_path, keyframe_every=5, min_interval=0)
+    assert [reopened.restore("n", v) for v in reopened.versions("n")] == texts
+
+
+def test_unchanged_or_too_frequent_saves_are_skipped(tmp_path):
+    history = NoteHistory(tmp_path, min_interval=60)
+    assert history.record("n", "a", now=0.0)
+    assert not history.record("n", "a", now=100.0)  # same text
+    assert not history.record("n", "b", now=30.0)  # within min_interval
+    assert history.record("n", "b", now=100.0)
+    assert len(history.versions("n")) == 2
+
+
+def test_size_cap_prunes_oldest_versions_at_a_keyframe(tmp_path):
+    # STEP 1: A tight cap forces pruning while recording.
+    history = NoteHistory(tmp_path, keyframe_every=4, max_bytes=6000, min_interval=0)
+    texts = make_versions(40)
+    for t, text in enumerate(texts):
+        history.record("n", text, now=float(t))
+
+    # STEP 2: The file respects the cap, the oldest kept version is a
+    # keyframe, and the newest versions are still restorable.
+    versions = history.versions("n")
+    assert history.path_for("n").stat().st_size <= 6000
+    assert versions[0].keyframe and len(versions) < 40
+    assert history.restore("n", versions[-1]) == texts[-1]
+
+
+def test_restore_finds_a_listed_version_after_pruning(tmp_path):
+    # STEP 1: List the versions, as the History dialog does.
+    history = NoteHistory(tmp_path, keyframe_every=4, max_bytes=6000, min_interval=0)
+    texts = make_versions(40)
+    for t, text in enumerate(texts[:20]):
+        history.record("n", text, now=float(t))
+    listed = history.versions("n")
+
+    # STEP 2: Later saves prune the oldest versions and renumber the rest.
+    for t, text in enumerate(texts[20:], start=20):
+        history.record("n", text, now=float(t))
+    assert history.versions("n")[0].timestamp > listed[0].timestamp
+
+    # STEP 3: A listed version still restores its own text; a pruned one fails.
+    assert history.restore("n", listed[-1]) == texts[19]
+    with pytest.raises(LookupError):
+        history.restore("n", listed[0])
+
+
+def test_closed_notes_keep_their_history_until_it_expires(tmp_path):
+    history = NoteHistory(tmp_path, min_interval=0)
+    history.record("open", "a")
+    history.record("closed", "b")
+    # STEP 1: Recent histories of closed notes are kept...
+    assert history.expire({"open"}, max_age=3600) == []
+    assert sorted(history.note_ids()) == ["closed", "open"]
+    # STEP 2: ...and deleted once they have not been written for max_age.
+    assert history.expire({"open"}, max_age=3600, now=time.time() + 7200) == ["closed"]
+    assert history.note_ids() == ["open"]
+
+
+def test_torn_record_is_dropped_on_next_write(tmp_path):
+    # Simulate a crash in the middle of appending a record.
+    history = NoteHistory(tmp_path, min_interval=0)
+    history.record("n", "first", now=0.0)
+    with open(history.path_for("n"), "ab") as f:
+        f.write(b"\x00\x01\x02")
+
+    reopened = NoteHistory(tmp_path, min_interval=0)
+    assert reopened.record("n", "second", now=1.0)
+    assert [reopened.restore("n", v) for v in reopened.versions("n")] == [
+        "first",
+        "second",
+    ]
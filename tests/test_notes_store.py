@@ -0,0 +1,113 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.widgets.notes.notes_store import AutosaveWorker, NotesStore
+
+
+def reopen(path):
+    """Load the store from disk again, like a fresh app start would."""
+    return NotesStore(path).load()
+
+
+def test_changes_survive_reload_without_compaction(tmp_path):
+    # STEP 1: Start empty -> one blank note is provided.
+    path = tmp_path / "notes.json"
+    store = NotesStore(path)
+    [(first, text)] = store.load()
+    assert text == ""
+
+    # STEP 2: Edit, add, reorder and delete through journal appends only.
+    store.write({first: "alpha", "b": "beta", "c": "gamma"}, [first, "b", "c"])
+    store.write({"b": "beta v2"}, ["c", "b"])
+
+    # STEP 3: No snapshot was needed; the journal alone restores the state.
+    assert not path.exists()
+    assert reopen(path) == [("c", "gamma"), ("b", "beta v2")]
+
+
+def test_unchanged_notes_are_not_appended(tmp_path):
+    # STEP 1: Save two notes once.
+    store = NotesStore(tmp_path / "notes.json")
+    store.load()
+    store.write({"a": "x" * 1000, "b": "y"}, ["a", "b"])
+    size = store.journal_path.stat().st_size
+
+    # STEP 2: Saving identical content again must not grow the journal,
+    # while a real edit only costs roughly the size of that one note.
+    store.write({"a": "x" * 1000, "b": "y"}, ["a", "b"])
+    assert store.journal_path.stat().st_size == size
+    store.write({"b": "z"}, ["a", "b"])
+    assert store.journal_path.stat().st_size - size < 200
+
+
+def test_torn_journal_tail_is_ignored(tmp_path):
+    # STEP 1: Write a valid record, then simulate a crash mid-append.
+    path = tmp_path / "notes.json"
+    store = NotesStore(path)
+    store.load()
+    store.write({"a": "kept"}, ["a"])
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "set", "id": "a", "text": "lo')
+
+    # STEP 2: Loading keeps the last complete state.
+    assert reopen(path) == [("a", "kept")]
+
+
+def test_compaction_and_legacy_migration_keep_ids(tmp_path):
+    # STEP 1: A legacy notes.json is a plain list of strings.
+    path = tmp_path / "notes.json"
+    path.write_text(json.dumps(["one", "two"]), encoding="utf-8")
+
+    # STEP 2: Loading migrates it, so ids are stable across restarts.
+    loaded = NotesStore(path).load()
+    assert [text for _, text in loaded] == ["one", "two"]
+    assert reopen(path) == loaded
+
+    # STEP 3: Force compaction with a tiny threshold; the journal is emptied
+    # and the snapshot alone holds the edit.
+    store = NotesStore(path, compact_bytes=1)
+    store.load()
+    first_id = loaded[0][0]
+    store.write({first_id: "one v2"}, [nid for nid, _ in loaded])
+    assert store.journal_path.stat().st_size == 0
+    assert [text for _, text in reopen(path)] == ["one v2", "two"]
+
+
+class FlakyStore(NotesStore):
+    """Fails the first ``failures`` writes, like a full disk would."""
+
+    def __init__(self, path, failures):
+        super().__init__(path)
+        self.failures = failures
+
+    def write(self, changes, order):
+        if self.failures:
+            self.failures -= 1
+            raise OSError(28, "No space left on device")
+        super().write(changes, order)
+
+
+class BrokenHistory:
+    def record(self, note_id, text):
+        raise OSError("history directory is read-only")
+
+
+def test_failed_autosave_is_kept_and_retried(tmp_path):
+    store = FlakyStore(tmp_path / "notes.json", failures=1)
+    store.load()
+    worker = AutosaveWorker(store, BrokenHistory(), retry_delay=0.05)
+
+    # STEP 1: The failed write is reported, and its batch is not lost.
+    worker.submit({"a": "first"}, ["a"])
+    worker.flush(timeout=5)
+    assert isinstance(worker.error, OSError)
+
+    # STEP 2: Edits made meanwhile are merged in; the retry writes both,
+    # and a failing history does not count as a failed save.
+    worker.submit({"b": "second"}, ["a", "b"])
+    worker.close(timeout=5)
+    assert worker.error is None
+    assert reopen(store.path) == [("a", "first"), ("b", "second")]
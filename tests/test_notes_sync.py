@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.notes.notes_store import NotesStore
+from widgets.notes.sync import MANIFEST_NAME, export_notes, import_notes
+
+
+def make_store(path, notes):
+    store = NotesStore(path)
+    store.load()
+    store.write(dict(notes), [note_id for note_id, _ in notes])
+    return store
+
+
+def test_export_only_rewrites_changed_notes(tmp_path):
+    # STEP 1: The first export writes one readable file per note.
+    out = tmp_path / "out"
+    store = make_store(tmp_path / "notes.json", [("a" * 32, "# Todo\nmilk"), ("b" * 32, "")])
+    report = export_notes(store, out)
+    assert len(report.added) == 2
+    assert sorted(p.name for p in out.iterdir()) == [
+        MANIFEST_NAME,
+        "b" * 8 + ".md",
+        "todo-" + "a" * 8 + ".md",
+    ]
+
+    # STEP 2: Exporting again touches nothing; an edit rewrites one file,
+    # keeping its name even though the first line changed.
+    assert export_notes(store, out).unchanged == 2
+    store.write({"a" * 32: "# Groceries\nmilk"}, ["a" * 32, "b" * 32])
+    report = export_notes(store, out)
+    assert (report.written, report.unchanged) == (["a" * 32], 1)
+    assert (out / ("todo-" + "a" * 8 + ".md")).read_text() == "# Groceries\nmilk"
+
+    # STEP 3: A deleted note removes its file.
+    store.write({}, ["a" * 32])
+    assert export_notes(store, out).deleted == ["b" * 32]
+    assert not (out / ("b" * 8 + ".md")).exists()
+
+
+def test_import_round_trip_adds_updates_and_deletes(tmp_path):
+    # STEP 1: Export from one store, import into a fresh one.
+    out = tmp_path / "out"
+    source = make_store(tmp_path / "a.json", [("x" * 32, "one"), ("y" * 32, "two")])
+    export_notes(source, out)
+    target = NotesStore(tmp_path / "b.json")
+    target.load()
+    report = import_notes(target, out)
+    assert len(report.added) == 2
+    assert sorted(text for _, text in target.notes()) == ["", "one", "two"]
+
+    # STEP 2: Only edited, new and removed files change anything.
+    (out / ("one-" + "x" * 8 + ".md")).write_text("one, edited")
+    (out / "extra.txt").write_text("three")
+    (out / ("two-" + "y" * 8 + ".md")).unlink()
+    report = import_notes(target, out)
+    assert (len(report.written), len(report.added), len(report.deleted)) == (1, 1, 1)
+    assert sorted(text for _, text in target.notes()) == ["", "one, edited", "three"]
+
+    # STEP 3: Nothing changed on disk -> nothing is read or written.
+    report = import_notes(target, out)
+    assert (report.written, report.added, report.deleted) == ([], [], [])
+    assert report.unchanged == 2
@@ -0,0 +1,60 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils.palette_extract import METHODS, extract_palette
+from widgets.color.image_palette import photo_rgb, subsample_factor
+
+# Four colors covering 40%, 30%, 20% and 10% of the pixels.
+COLORS = [(0xD62828, 40), (0x1D3557, 30), (0xF1FAEE, 20), (0x2A9D8F, 10)]
+
+
+def _image(channels: int = 3) -> bytes:
+    pixels = [color for color, weight in COLORS for _ in range(weight * 50)]
+    random.Random(0).shuffle(pixels)
+    extra = b"\x80" * (channels - 3)
+    return b"".join(color.to_bytes(3, "big") + extra for color in pixels)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("channels", [3, 4])
+def test_recovers_dominant_colors_in_order(method, channels):
+    palette = extract_palette(_image(channels), channels, count=4, method=method)
+    assert [color for color, _ in palette] == [color for color, _ in COLORS]
+    assert [round(share, 2) for _, share in palette] == [0.4, 0.3, 0.2, 0.1]
+
+
+def test_sampling_and_count_limits():
+    # STEP 1: Fewer distinct colors than asked for: one entry per color.
+    assert len(extract_palette(_image(), count=16)) == 4
+    # STEP 2: Sampling every 10th pixel keeps the colors and about their shares.
+    palette = extract_palette(_image(), count=4, max_samples=500)
+    assert [color for color, _ in palette] == [color for color, _ in COLORS]
+    assert [share for _, share in palette] == pytest.approx([0.4, 0.3, 0.2, 0.1], abs=0.05)
+
+
+def test_gradient_splits_into_distinct_colors():
+    data = bytes(v for i in range(256) for v in (i, 255 - i, 128)) * 4
+    palette = extract_palette(data, count=8, method="kmeans")
+    assert len({color for color, _ in palette}) == 8
+    assert sum(share for _, share in palette) == pytest.approx(1)
+
+
+def test_bad_input():
+    assert extract_palette(b"") == []
+    with pytest.raises(ValueError):
+        extract_palette(_image(), method="octree")
+    with pytest.raises(ValueError):
+        extract_palette(_image(), channels=1)
+
+
+def test_photo_rgb_and_subsample_factor():
+    text = "{#ff0000 #00ff00} {#0000FF #102030}"
+    assert photo_rgb(text) == bytes.fromhex("ff0000 00ff00 0000ff 102030")
+    assert subsample_factor(300, 200, 262144) == 1
+    assert subsample_factor(3840, 2160, 262144) == 6
+    assert 3840 // 6 * (2160 // 6) <= 262144
@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.utils.ring_store import TRUNCATED, RingStore
+
+
+def test_appends_wrap_around_without_growing_the_file(tmp_path):
+    # STEP 1: Fill past capacity; only the newest records survive.
+    path = tmp_path / "history.bin"
+    store = RingStore(path, capacity=3, slot_size=16)
+    assert store.load() == []
+    for i in range(5):
+        store.append(f"entry {i}")
+    size = path.stat().st_size
+    store.append("entry 5")
+    store.close()
+
+    # STEP 2: The file size is fixed once full, and order is kept on reload.
+    assert path.stat().st_size == size
+    assert RingStore(path, capacity=3, slot_size=16).load() == ["entry 3", "entry 4", "entry 5"]
+
+
+@pytest.mark.parametrize("capacity, slot_size", [(2, 16), (10, 16), (3, 64)])
+def test_layout_change_keeps_newest_records(tmp_path, capacity, slot_size):
+    path = tmp_path / "history.bin"
+    store = RingStore(path, capacity=3, slot_size=16)
+    store.load()
+    for text in ("a", "b", "c"):
+        store.append(text)
+    store.close()
+
+    reopened = RingStore(path, capacity=capacity, slot_size=slot_size)
+    assert reopened.load() == ["a", "b", "c"][-capacity:]
+    reopened.append("d")
+    reopened.close()
+    assert RingStore(path, capacity, slot_size).load() == ["a", "b", "c", "d"][-capacity:]
+
+
+def test_long_records_are_truncated_on_a_character_boundary(tmp_path):
+    store = RingStore(tmp_path / "h.bin", capacity=2, slot_size=8)
+    store.load()
+    store.append("ééé")  # 6 bytes, fits exactly
+    store.append("ééééé")  # 10 bytes: 3 are left next to the 3-byte marker
+    store.close()
+    records = RingStore(tmp_path / "h.bin", capacity=2, slot_size=8).load()
+    assert records == ["ééé", "é" + TRUNCATED]
@@ -0,0 +1,137 @@
+import sys
+from decimal import Decimal
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.utils.safe_eval import SafeEvaluator, estimate_bits, normalize, numeric_mode
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "1 + 2 * 3",
+        "(1 + 2) * 3",
+        "-2 ** 2",
+        "2 ** -1",
+        "2 ** -2 ** 2",
+        "-2 ** -2 * 3",
+        "7 // 2 - 7 % 3",
+        "+-+1.5 / 4",
+        "2**3**2",
+        "2*-3--4",
+        "1_000 + 0x1f - 0b101 + 0o7",
+        ".5e1 + 1. + 1e-3",
+    ],
+)
+def test_compiled_result_matches_python(expr):
+    assert SafeEvaluator().eval(expr) == eval(expr)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    ["x + 1", "abs(-1)", "'a' * 3", "1 < 2", "[1][0]", "1 2", "(1", "1)", "2 *", "01", "1__0"],
+)
+def test_rejects_anything_but_arithmetic(expr):
+    with pytest.raises(ValueError):
+        SafeEvaluator().eval(expr)
+
+
+@pytest.mark.parametrize("expr", ["2 *", "(1", "1)", "01", "1 $ 2", ""])
+def test_try_compile_returns_none_for_invalid_input(expr):
+    evaluator = SafeEvaluator()
+    assert evaluator.try_compile(expr) is None
+    assert evaluator.try_compile("1 + 2")(None) == 3
+
+
+def test_normalize_spaces_tokens_evenly():
+    assert normalize(" 2*( x+1 )**2") == "2 * ( x + 1 ) ** 2"
+    assert normalize("1 2") == "1 2"
+
+
+def test_cache_counts_hits_and_evicts_least_recently_used():
+    # STEP 1: The second evaluation of an expression is a cache hit.
+    evaluator = SafeEvaluator(cache_size=2)
+    evaluator.eval("1 + 1")
+    evaluator.eval("1 + 1")
+    assert (evaluator.hits, evaluator.misses) == (1, 1)
+
+    # STEP 2: Touching "1 + 1" keeps it; "2 + 2" is evicted by "3 + 3".
+    evaluator.eval("2 + 2")
+    evaluator.eval("1 + 1")
+    evaluator.eval("3 + 3")
+    evaluator.eval("1 + 1")
+    evaluator.eval("2 + 2")
+    assert (evaluator.hits, evaluator.misses) == (3, 4)
+
+
+@pytest.mark.parametrize(
+    "expr, low, high",
+    [
+        ("1 + 2", 1, 3),
+        ("2 ** 10", 9, 11),
+        ("10 ** 100 * 10 ** 100", 660, 670),
+        ("1.5 ** 1000000", 0, 0),  # floats overflow instead of growing
+        ("9 ** 9 ** 9", 1e9, float("inf")),
+    ],
+)
+def test_estimate_bits_bounds_integer_growth(expr, low, high):
+    assert low <= estimate_bits(SafeEvaluator().compile(expr)) <= high
+
+
+@pytest.mark.parametrize(
+    "mode, expr, expected",
+    [
+        ("decimal", "0.1 + 0.2", Decimal("0.3")),
+        ("decimal", "1 / 3", Decimal("0.3333333333")),
+        ("decimal", "19.99 * 3 - 0x10", Decimal("43.97")),
+        ("decimal", "-7 // 2", Decimal("-3")),  # Decimal truncates
+        ("fraction", "0.1 + 0.2", Fraction(3, 10)),
+        ("fraction", "1 / 3 * 3", 1),
+        ("fraction", "2 ** -2 + 1e-3", Fraction(251, 1000)),
+        ("fraction", "7 // 2", 3),
+        ("float", "0.1 + 0.2", 0.1 + 0.2),
+    ],
+)
+def test_numeric_modes(mode, expr, expected):
+    assert SafeEvaluator(mode=mode, precision=10).eval(expr) == expected
+
+
+def test_modes_are_cached_separately_and_convert_values():
+    # STEP 1: The same source compiles once per mode.
+    evaluator = SafeEvaluator()
+    assert evaluator.eval("1 / 4") == 0.25
+    evaluator.set_mode("fraction")
+    assert evaluator.eval("1 / 4") == Fraction(1, 4)
+    assert evaluator.compile("1 / 4", mode="float")(None) == 0.25
+    assert (evaluator.hits, evaluator.misses) == (1, 2)
+
+    # STEP 2: Values carry over between modes without float noise.
+    assert numeric_mode("fraction").convert(0.1) == Fraction(1, 10)
+    assert numeric_mode("decimal", 5).convert(Fraction(2, 3)) == Decimal("0.66667")
+    assert numeric_mode("float").convert(Decimal("0.5")) == 0.5
+
+
+def test_estimate_bits_follows_exact_division():
+    # A fraction's denominator grows like an integer; a decimal's does not.
+    expr = "(1 / 3) ** 100000"
+    assert estimate_bits(SafeEvaluator(mode="fraction").compile(expr)) > 100_000
+    assert estimate_bits(SafeEvaluator(mode="decimal").compile(expr)) == 0
+    # Each compiled expression carries its own mode's operator table.
+    float_kinds = SafeEvaluator().compile(expr).kinds
+    assert len(float_kinds) == 7 and float_kinds is not numeric_mode("fraction").kinds
+
+
+@pytest.mark.parametrize("n", [1_000, 100_000])
+def test_long_and_deeply_nested_expressions(n):
+    # STEP 1: A flat chain of n terms.
+    evaluator = SafeEvaluator()
+    assert evaluator.eval("+".join(["1"] * n)) == n
+
+    # STEP 2: n nested parentheses, both around a single number and
+    # around a right-leaning chain, never hit the recursion limit.
+    assert evaluator.eval("(" * n + "7" + ")" * n) == 7
+    assert evaluator.eval("(1+" * (n - 1) + "1" + ")" * (n - 1)) == n
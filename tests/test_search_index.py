@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.widgets.notes.search_index import SearchIndex
+
+
+def test_search_is_case_insensitive_and_requires_all_tokens_on_a_line():
+    # STEP 1: Index two notes.
+    index = SearchIndex()
+    index.set_note("a", "Buy milk\nbuy BREAD and milk\nnothing")
+    index.set_note("b", "milk shake")
+
+    # STEP 2: Single tokens match everywhere, regardless of case.
+    assert index.search("MILK") == {"a": [0, 1], "b": [0]}
+
+    # STEP 3: Several tokens must all be on the same line.
+    assert index.search("buy milk") == {"a": [0, 1]}
+    assert index.search("bread shake") == {}
+
+
+def test_line_edits_update_positions_without_reindexing_the_note():
+    # STEP 1: "todo" sits on line 2 (0-based).
+    index = SearchIndex()
+    index.set_note("n", "one\ntwo\ntodo here")
+
+    # STEP 2: Typing Enter at the end of line 0 splits it into two lines;
+    # everything below moves down by one.
+    index.replace_lines("n", 0, 1, ["one", ""])
+    assert index.search("todo") == {"n": [3]}
+
+    # STEP 3: Deleting the empty line and "two" (joining lines 1-2 into
+    # one) moves it back up, and "two" is no longer found.
+    index.replace_lines("n", 1, 2, [""])
+    assert index.search("todo") == {"n": [2]}
+    assert index.search("two") == {}
+
+
+def test_removed_notes_disappear_from_results():
+    index = SearchIndex()
+    index.set_note("a", "shared word")
+    index.set_note("b", "shared")
+    index.remove_note("a")
+    assert index.search("shared") == {"b": [0]}
+    assert index.search("word") == {}
@@ -0,0 +1,153 @@
+import io
+import select
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from core.single_instance import InstanceServer, instance_running, send_request
+from gui.app import TABS
+import main
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def _serve(server: InstanceServer, handler, count: int = 1) -> None:
+    handled = 0
+    while handled < count:
+        ready, _, _ = select.select([server.fileno()], [], [], 5)
+        assert ready, "no request arrived"
+        handled += server.poll(handler)
+
+
+def test_request_round_trip(tmp_path):
+    path = tmp_path / "app.sock"
+    server = InstanceServer(path)
+    seen = []
+    replies = []
+
+    def handler(request):
+        seen.append(request)
+        return {"ok": True, "echo": request.get("note")}
+
+    # STEP 1: A client's request reaches the handler and gets its reply.
+    note = "piped text\n" * 10000
+    client = threading.Thread(
+        target=lambda: replies.append(send_request({"action": "show", "note": note}, path))
+    )
+    client.start()
+    _serve(server, handler)
+    client.join(5)
+    assert seen == [{"action": "show", "note": note}]
+    assert replies == [{"ok": True, "echo": note}]
+
+    # STEP 2: Only the owner can connect.
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    # STEP 3: Closing removes the socket; then nobody answers.
+    server.close()
+    assert not path.exists()
+    assert send_request({"action": "ping"}, path, timeout=1) is None
+
+
+def test_second_server_refused_and_stale_socket_replaced(tmp_path):
+    path = tmp_path / "app.sock"
+    first = InstanceServer(path)
+    # STEP 1: While one instance listens, another cannot take over.
+    with pytest.raises(OSError):
+        InstanceServer(path)
+    first.close()
+
+    # STEP 2: A socket file left by a crashed instance is replaced.
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    assert path.exists()
+    server = InstanceServer(path)
+    server.close()
+
+    # STEP 3: Something that is not a socket is never removed.
+    path.write_text("keep me")
+    with pytest.raises(OSError):
+        InstanceServer(path)
+    assert path.read_text() == "keep me"
+
+
+def test_bad_request_gets_error_reply(tmp_path):
+    path = tmp_path / "app.sock"
+    server = InstanceServer(path)
+    replies = []
+
+    def raw_client():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            sock.sendall(b"[1, 2]")
+            sock.shutdown(socket.SHUT_WR)
+            replies.append(sock.recv(4096))
+
+    client = threading.Thread(target=raw_client)
+    client.start()
+    select.select([server.fileno()], [], [], 5)
+    assert server.poll(lambda request: {"ok": True}) == 0
+    client.join(5)
+    server.close()
+    assert b'"ok": false' in replies[0]
+
+
+def test_failing_handler_still_replies(tmp_path):
+    path = tmp_path / "app.sock"
+    server = InstanceServer(path)
+    replies = []
+
+    def handler(request):
+        raise TypeError("unhashable type: 'list'")
+
+    # STEP 1: The client gets an error reply instead of a closed connection.
+    client = threading.Thread(
+        target=lambda: replies.append(send_request({"tab": ["calc"]}, path))
+    )
+    client.start()
+    _serve(server, handler)
+    client.join(5)
+    assert replies[0]["ok"] is False and "TypeError" in replies[0]["error"]
+
+    # STEP 2: A listening instance counts as running even before it answers.
+    assert instance_running(path)
+    server.close()
+    assert not instance_running(path)
+
+
+def test_sync_refused_while_an_instance_runs(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "app.sock"
+    monkeypatch.setenv("BLOB_MINI_TOOLS_SOCKET", str(path))
+    server = InstanceServer(path)
+    try:
+        args = main.parse_args(["--import-notes", str(tmp_path / "notes")])
+        assert main.sync_notes(args) == 1
+        assert "running" in capsys.readouterr().err
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize(
+    "argv, stdin, expected",
+    [
+        ([], "", {"action": "show", "tab": None}),
+        (["--tab", "calc"], "", {"action": "show", "tab": "calc"}),
+        (["--note", "hi"], "", {"action": "show", "tab": None, "note": "hi"}),
+        (["--note"], "from stdin", {"action": "show", "tab": None, "note": "from stdin"}),
+        (["--daemon"], "", {"action": "ping"}),
+        (["--quit"], "", {"action": "quit"}),
+    ],
+)
+def test_build_request(monkeypatch, argv, stdin, expected):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(stdin))
+    assert main.build_request(main.parse_args(argv)) == expected
+
+
+def test_tab_choices_match_registry():
+    assert main.TAB_KEYS == tuple(key for key, _, _ in TABS)
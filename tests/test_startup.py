@@ -0,0 +1,71 @@
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+APP = Path(__file__).resolve().parents[1] / "app"
+sys.path.append(str(APP))
+
+from core.startup import StartupTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_steps_and_milestones(capsys):
+    clock = FakeClock()
+    timer = StartupTimer(clock)
+
+    # STEP 1: Steps record their duration, milestones the time since start.
+    with timer.measure("import notes"):
+        clock.now += 0.040
+    clock.now += 0.010
+    assert timer.mark("first idle") == pytest.approx(0.050)
+    assert timer.steps == [("import notes", pytest.approx(0.040))]
+    report = timer.report()
+    assert "import notes" in report and "40.0 ms" in report
+    assert "first idle" in report and "50.0 ms since start" in report
+
+    # STEP 2: Nothing is printed unless enabled.
+    timer.print_report()
+    with timer.measure("build calc"):
+        clock.now += 0.002
+    assert capsys.readouterr().err == ""
+
+    # STEP 3: Enabled, the report prints once; later steps print one by one.
+    timer = StartupTimer(clock)
+    timer.enabled = True
+    timer.print_report()
+    timer.print_report()
+    with timer.measure("build color"):
+        clock.now += 0.003
+    err = capsys.readouterr().err
+    assert err.count("startup:") == 1
+    assert "build color" in err and "(after startup)" in err
+
+
+def test_gui_import_leaves_tab_modules_unloaded():
+    code = (
+        "import sys, gui.app;"
+        "print(sorted(m for m in sys.modules if m.endswith('_tab') or m == 'subprocess'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=APP, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_registered_tabs_exist():
+    from gui.app import TABS
+    from core.config import CONFIG
+
+    for key, module, name in TABS:
+        assert "title" in CONFIG[key]
+        assert hasattr(importlib.import_module(module), name)
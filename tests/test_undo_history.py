@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.notes.undo import UndoHistory
+
+
+def type_text(history, line, col, text, start=0.0):
+    """Record ``text`` typed one character at a time, 10 ms apart."""
+    for i, ch in enumerate(text):
+        history.record("i", line, col + i, ch, now=start + i * 0.01)
+
+
+def test_typing_and_backspacing_collapse_into_single_steps():
+    # STEP 1: Typing a word quickly is one undo step with one record.
+    history = UndoHistory(group_ms=1000)
+    type_text(history, 1, 0, "hello")
+    # STEP 2: Backspacing twice right after is merged the same way,
+    # but as a separate step because the operation changed.
+    history.record("d", 1, 4, "o", now=1.0)
+    history.record("d", 1, 3, "l", now=1.01)
+
+    assert history.pop_undo() == [["d", 1, 3, "lo"]]
+    assert history.pop_undo() == [["i", 1, 0, "hello"]]
+    assert history.pop_undo() is None
+
+
+def test_pause_or_cursor_jump_starts_a_new_step():
+    history = UndoHistory(group_ms=500)
+    type_text(history, 1, 0, "ab")
+    # A pause longer than the group window splits the typing ...
+    history.record("i", 1, 2, "c", now=5.0)
+    # ... and so does typing somewhere else, even without a pause.
+    history.record("i", 3, 0, "x", now=5.01)
+    steps = [history.pop_undo() for _ in range(3)]
+    assert [step[0][3] for step in steps] == ["x", "c", "ab"]
+
+
+def test_budget_evicts_oldest_steps_and_redo_round_trips():
+    # STEP 1: Tiny budget -> only the newest few steps fit.
+    history = UndoHistory(budget=2000, group_ms=0)
+    for i in range(100):
+        history.record("i", i + 1, 0, f"line {i}\n", now=float(i))
+    assert history.size <= 2000
+    kept = []
+    while history.can_undo():
+        kept.append(history.pop_undo()[0][3])
+    assert 0 < len(kept) < 100 and kept[0] == "line 99\n"
+
+    # STEP 2: Everything undone can be redone, newest-undone first.
+    assert history.pop_redo()[0][3] == kept[-1]
+
+
+def test_single_step_over_budget_drops_the_whole_history():
+    # Keeping older steps without the newest one would corrupt the text.
+    history = UndoHistory(budget=1000, group_ms=0)
+    history.record("i", 1, 0, "small", now=0.0)
+    history.record("i", 2, 0, "x" * 5000, now=1.0)
+    assert not history.can_undo()
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from utils.safe_eval import split_binding
+from utils.worksheet import Worksheet
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("rate = 0.07", ("rate", " 0.07")),
+    ("  x=1+2", ("x", "1+2")),
+    ("1 + 2", (None, "1 + 2")),
+    ("a == b", (None, "a == b")),
+])
+def test_split_binding(text, expected):
+    assert split_binding(text) == expected
+
+
+def values(sheet):
+    return [cell.error or cell.value for cell in sheet.cells]
+
+
+def test_editing_a_binding_recomputes_only_downstream_cells():
+    # STEP 1: Evaluate a small sheet once.
+    sheet = Worksheet()
+    lines = ["rate = 0.5", "base = 100", "base * (1 + rate)", "other = 3", "other * 2"]
+    sheet.set_lines(lines)
+    assert values(sheet) == [0.5, 100, 150.0, 3, 6]
+
+    # STEP 2: Changing rate re-evaluates rate and its one user, nothing else.
+    before = sheet.evaluations
+    lines[0] = "rate = 1"
+    assert sheet.set_lines(lines) == [0, 2]
+    assert sheet.evaluations - before == 2
+    assert values(sheet) == [1, 100, 200, 3, 6]
+
+    # STEP 3: Inserting a line re-parses only that line.
+    lines.insert(3, "# comment")
+    before = sheet.evaluations
+    assert sheet.set_lines(lines) == [3]
+    assert sheet.evaluations == before
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (["a = b + 1", "b = 2"], [3, 2]),  # order of lines does not matter
+    (["a = b", "b = a"], ["Circular reference", "Circular reference"]),
+    (["a = a + 1"], ["Circular reference"]),
+    (["a = 1", "a = 2", "a"], ["Duplicate name: a", "Duplicate name: a", "Error in a"]),
+    (["a = 1/0", "a + 1", "c"], ["ZeroDivisionError", "Error in a", "Unknown name: c"]),
+])
+def test_errors_propagate(lines, expected):
+    sheet = Worksheet()
+    sheet.set_lines(lines)
+    assert values(sheet) == expected
+
+
+def test_removing_a_duplicate_revives_the_name():
+    sheet = Worksheet()
+    sheet.set_lines(["a = 1", "a = 2", "a * 10"])
+    sheet.set_lines(["a = 1", "a * 10"])
+    assert values(sheet) == [1, 10]
@@ -0,0 +1,52 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+
+from widgets.color.x11_screen import X11Screen, _channel
+
+
+@pytest.mark.parametrize(
+    "pixel, mask, expected",
+    [
+        (0x12AB34, 0xFF0000, 0x12),
+        (0x12AB34, 0x0000FF, 0x34),
+        (0xF800, 0xF800, 255),  # 16-bit 565 red, full
+        (0x0400, 0x07E0, 129),  # 16-bit 565 green, half
+        (0x123456, 0, 0),
+    ],
+)
+def test_channel_scales_to_8_bits(pixel, mask, expected):
+    assert _channel(pixel, mask) == expected
+
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY"), reason="needs an X display (e.g. Xvfb)")
+def test_reads_the_pixel_under_a_window():
+    import tkinter as tk
+
+    # STEP 1: Show a solid-colored window at a known place.
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.geometry("40x40+10+10")
+    root.configure(bg="#12ab34")
+    root.update()
+    root.after(200, root.quit)
+    root.mainloop()
+
+    # STEP 2: Read it back through our own display connection.
+    screen = X11Screen()
+    try:
+        assert screen.pixel(30, 30) == 0x12AB34
+        assert 0 <= screen.pixel(-5, 10**6) <= 0xFFFFFF  # clamped, no X error
+
+        # STEP 3: A region comes back row by row; off-screen ones move inside.
+        left, top, pixels = screen.region(20, 20, 11, 11)
+        assert (left, top) == (20, 20) and pixels == [0x12AB34] * 121
+        left, top, pixels = screen.region(-3, -3, 5, 5)
+        assert (left, top) == (0, 0) and len(pixels) == 25
+    finally:
+        screen.close()
+        root.destroy()